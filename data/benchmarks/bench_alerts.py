@@ -0,0 +1,271 @@
+# bench_alerts.py
+"""Avisos de emergencia contra servidores falsos: reintentos, espera, reinicio y duplicados.
+
+Levanta en local un endpoint HTTP con la forma de la API de Twilio y un SMTP mínimo que
+solo guarda lo que recibe, y pasa el despachador por cada caso: errores 5xx seguidos de
+éxito (número de intentos y espera exponencial entre ellos), conexión SMTP cortada y
+reutilizada, error 4xx permanente (HTTP) y 5xx (SMTP), proveedor (HTTP o SMTP) que no confirma, reinicio con un
+envío pendiente y caída a mitad de un envío. Cada caso comprueba cuántos mensajes llegan
+de verdad: ninguno repetido. Al final mide lo que tarda `enqueue` (lo que espera el botón).
+Usa un directorio temporal para el diario.
+
+Uso: python data/benchmarks/bench_alerts.py [--base-delay 0.1] [--enqueues 2000]
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conrumbo.alerts import AlertDispatcher, SmtpChannel, TwilioChannel  # noqa: E402
+from journeys import percentiles  # noqa: E402
+
+
+# =========================
+# Servidores falsos
+# =========================
+class FakeTwilio(ThreadingHTTPServer):
+    """Responde con los códigos de `script` en orden (el último se repite) y anota cada petición."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.requests = []  # (momento, cuerpo)
+        self.script, self.delay = [201], 0.0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(handler):
+                body = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+                self.requests.append((time.monotonic(), body))
+                status = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+                time.sleep(self.delay)
+                handler.send_response(status)
+                handler.send_header("Content-Length", "2")
+                handler.end_headers()
+                handler.wfile.write(b"{}")
+
+            def log_message(handler, *args):
+                pass
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def handle_error(self, request, client_address):
+        pass  # el cliente cortó por tiempo: es lo que se está probando
+
+    def reset(self, script, delay: float = 0.0):
+        self.requests.clear()
+        self.script, self.delay = list(script), delay
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeSmtp(socketserver.ThreadingTCPServer):
+    """SMTP sin TLS ni autenticación; corta las `drop` primeras conexiones antes del saludo.
+
+    Con `mute` guarda el siguiente mensaje y cierra sin contestar al final de DATA; con
+    `reject` (p. ej. b"RCPT") contesta a ese verbo con `reject_code`.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.messages, self.connections, self.drop, self.mute = [], 0, 0, False
+        self.reject, self.reject_code, self.rejected = None, 550, 0
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(handler):
+                self.connections += 1
+                if self.drop:
+                    self.drop -= 1
+                    return
+                reply = handler.wfile.write
+                reply(b"220 sink\r\n")
+                while line := handler.rfile.readline():
+                    verb = line[:4].upper()
+                    if verb == self.reject:
+                        self.rejected += 1
+                        reply(b"%d no\r\n" % self.reject_code)
+                    elif verb == b"DATA":
+                        reply(b"354 go\r\n")
+                        data = []
+                        while (line := handler.rfile.readline()) not in (b".\r\n", b""):
+                            data.append(line)
+                        self.messages.append(b"".join(data))
+                        if self.mute:
+                            self.mute = False
+                            return
+                        reply(b"250 queued\r\n")
+                    elif verb == b"QUIT":
+                        reply(b"221 bye\r\n")
+                        return
+                    else:  # EHLO, MAIL, RCPT, NOOP, RSET
+                        reply(b"250 ok\r\n")
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+# =========================
+# Casos
+# =========================
+def wait(dispatcher, ids, timeout: float = 10) -> dict:
+    """Estado de `ids` en cuanto ninguno está pendiente (o al agotar `timeout`)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = dispatcher.status(ids)
+        if all(s["status"] in ("sent", "failed", "unconfirmed") for s in status.values()) \
+                or time.monotonic() > deadline:
+            return status
+        time.sleep(0.01)
+
+
+def check(failures: list, name: str, ok: bool, detail: str) -> None:
+    print(f"  {'ok   ' if ok else 'ERROR'} {name}: {detail}")
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-delay", type=float, default=0.1, help="espera del primer reintento (s)")
+    parser.add_argument("--enqueues", type=int, default=2000)
+    args = parser.parse_args()
+
+    http, smtp = FakeTwilio(), FakeSmtp()
+    base = args.base_delay
+    failures = []
+
+    def twilio(timeout: float = 2.0):
+        return TwilioChannel("AC0", "token", "whatsapp:+34000", "whatsapp:+34111", base_url=http.url, timeout=timeout)
+
+    def start(spool, channels):
+        os.makedirs(spool, exist_ok=True)
+        return AlertDispatcher(channels, spool_dir=spool, base_delay=base, max_delay=base * 8)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Dos 503 y después 201: tres intentos, esperas ~base y ~2·base (±20 % de dispersión)
+        http.reset([503, 503, 201])
+        d = start(os.path.join(tmp, "retry"), [twilio()])
+        s = wait(d, d.enqueue("aviso", "retry"))["retry:whatsapp"]
+        d.close()
+        times = [t for t, _ in http.requests]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        expected = [base, 2 * base]
+        check(failures, "reintentos HTTP", s["status"] == "sent" and s["attempts"] == 3 and len(times) == 3,
+              f"{s['status']} en {s['attempts']} intentos, {len(times)} peticiones")
+        check(failures, "espera exponencial",
+              len(gaps) == 2 and all(0.8 * e - 0.02 <= g <= 1.2 * e + 0.1 for g, e in zip(gaps, expected)),
+              " · ".join(f"{g * 1000:.0f} ms (≈{e * 1000:.0f})" for g, e in zip(gaps, expected)))
+
+        # 2. SMTP: la primera conexión se corta; el reintento la rehace y el siguiente aviso la reutiliza
+        smtp.drop, smtp.connections = 1, 0
+        mail = SmtpChannel("127.0.0.1", smtp.server_address[1], "", "", "app@local", "contacto@local",
+                           starttls=False, timeout=2)
+        d = start(os.path.join(tmp, "smtp"), [mail])
+        first = wait(d, d.enqueue("aviso 1", "smtp-1"))["smtp-1:email"]
+        second = wait(d, d.enqueue("aviso 2", "smtp-2"))["smtp-2:email"]
+        d.close()
+        check(failures, "SMTP con corte", first["status"] == "sent" and first["attempts"] == 2
+              and second["status"] == "sent" and len(smtp.messages) == 2 and smtp.connections == 2,
+              f"{first['status']}/{second['status']}, {len(smtp.messages)} correos, {smtp.connections} conexiones")
+
+        # 2b. SMTP que recibe el cuerpo y corta sin confirmar: sin confirmar y sin reenviar
+        smtp.messages.clear()
+        smtp.mute = True
+        d = start(os.path.join(tmp, "smtp-mute"), [mail])
+        s = wait(d, d.enqueue("aviso", "smtp-mute"))["smtp-mute:email"]
+        time.sleep(base * 4)
+        d.close()
+        check(failures, "SMTP sin respuesta", s["status"] == "unconfirmed" and len(smtp.messages) == 1,
+              f"{s['status']} con {len(smtp.messages)} correo(s)")
+
+        # 2c. SMTP que rechaza con 5xx (remitente, destinatario): permanente, un solo intento
+        for verb in (b"MAIL", b"RCPT"):
+            smtp.messages.clear()
+            smtp.reject, smtp.rejected = verb, 0
+            d = start(os.path.join(tmp, f"smtp-{verb.decode().lower()}"), [mail])
+            s = wait(d, d.enqueue("aviso", f"smtp-{verb.decode()}"))[f"smtp-{verb.decode()}:email"]
+            d.close()
+            check(failures, f"SMTP {verb.decode()} 550", s["status"] == "failed" and smtp.rejected == 1,
+                  f"{s['status']} tras {smtp.rejected} rechazo(s)")
+        smtp.reject = None
+
+        # 3. 4xx: permanente, un solo intento
+        http.reset([400])
+        d = start(os.path.join(tmp, "permanent"), [twilio()])
+        s = wait(d, d.enqueue("aviso", "bad"))["bad:whatsapp"]
+        d.close()
+        check(failures, "error permanente", s["status"] == "failed" and len(http.requests) == 1,
+              f"{s['status']} tras {len(http.requests)} petición(es)")
+
+        # 4. El proveedor recibe pero no responde a tiempo: sin confirmar y sin reenviar
+        http.reset([201], delay=0.5)
+        d = start(os.path.join(tmp, "timeout"), [twilio(timeout=0.2)])
+        s = wait(d, d.enqueue("aviso", "slow"))["slow:whatsapp"]
+        time.sleep(base * 4)
+        d.close()
+        check(failures, "sin respuesta", s["status"] == "unconfirmed" and len(http.requests) == 1,
+              f"{s['status']} con {len(http.requests)} petición(es)")
+
+        # 5. Reinicio con el aviso pendiente: se entrega una vez y repetir la clave no reenvía
+        spool = os.path.join(tmp, "restart")
+        http.reset([503])
+        d = start(spool, [twilio()])
+        ids = d.enqueue("aviso", "restart")
+        while not http.requests:
+            time.sleep(0.01)
+        d.close()
+        http.reset([201])
+        d = start(spool, [twilio()])
+        s = wait(d, ids)["restart:whatsapp"]
+        again = d.enqueue("aviso", "restart")
+        time.sleep(base * 4)
+        d.close()
+        check(failures, "reinicio", s["status"] == "sent" and again == ids and len(http.requests) == 1,
+              f"{s['status']}, {len(http.requests)} petición(es) tras reiniciar, clave repetida → {again}")
+
+        # 6. Caída con el envío en marcha (última línea "sending"): pudo llegar, no se repite
+        spool = os.path.join(tmp, "crash")
+        os.makedirs(spool, exist_ok=True)
+        with open(os.path.join(spool, "queue.jsonl"), "w", encoding="utf-8") as f:
+            msg = {"channel": "whatsapp", "body": "aviso", "subject": "-", "key": "crash", "created": time.time()}
+            f.write(json.dumps({"op": "enqueue", "id": "crash:whatsapp", "msg": msg}) + "\n")
+            f.write(json.dumps({"op": "sending", "id": "crash:whatsapp"}) + "\n")
+        http.reset([201])
+        d = start(spool, [twilio()])
+        time.sleep(base * 4)
+        s = d.status(["crash:whatsapp"])["crash:whatsapp"]
+        d.close()
+        check(failures, "caída a mitad", s["status"] == "unconfirmed" and not http.requests,
+              f"{s['status']}, {len(http.requests)} petición(es)")
+
+        # Lo que espera el botón: solo escribe en el diario, sin red
+        http.reset([201])
+        d = start(os.path.join(tmp, "enqueue"), [twilio()])
+        lat = []
+        for i in range(args.enqueues):
+            t0 = time.perf_counter()
+            d.enqueue("aviso", f"k{i}")
+            lat.append((time.perf_counter() - t0) * 1000)
+        d.close(timeout=1)
+        p = percentiles(lat)
+        print(f"enqueue ({p['n']}): p50 {p['p50']:.3f} ms · p95 {p['p95']:.3f} ms · máx {p['max']:.2f} ms")
+
+    http.shutdown()
+    smtp.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
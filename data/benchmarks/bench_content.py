@@ -0,0 +1,140 @@
+# bench_content.py
+"""Paquete de contenidos: validación al recargar en caliente y coste de carga y recarga.
+
+Trabaja sobre una copia de data/content en un directorio temporal. Primero comprueba que
+una guía sin "id" se publica con el nombre de su fichero, que un cambio inválido (guía sin
+pasos, con un id que no es texto o repetido, chat.json sin prioridad o con una palabra
+clave vacía, pack.json roto) se descarta con un error en el registro y se sigue
+sirviendo la revisión anterior, y que en la carga inicial ese mismo error se lanza.
+Después mide la carga completa y la recarga de un solo fichero (lo que hace el vigilante).
+
+Uso: python data/benchmarks/bench_content.py [--runs 50]
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conrumbo.content import ContentStore  # noqa: E402
+from journeys import DATA_DIR, percentiles  # noqa: E402
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def write(path: Path, doc: dict) -> None:
+    """Escribe `doc` y adelanta el mtime: dos escrituras seguidas nunca parecen el mismo fichero."""
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+    ns = time.time_ns() + 10 ** 6
+    os.utime(path, ns=(ns, ns))
+
+
+def check(failures: list, name: str, ok: bool, detail: str) -> None:
+    print(f"  {'ok   ' if ok else 'ERROR'} {name}: {detail}")
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    failures = []
+    records = Records()
+    logging.getLogger("conrumbo.content").addHandler(records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "content"
+        shutil.copytree(DATA_DIR / "content", root)
+        store = ContentStore(root)
+        lang = store.default_lang
+        guide = root / lang / "kits" / "sin_id.json"
+
+        # 1. Guía sin "id": se publica con el nombre del fichero
+        write(guide, {"section": "kits", "order": 99, "title": "Kit sin id", "steps": ["Agua."]})
+        published = store.reload([guide])
+        check(failures, "id por defecto",
+              published and store.guide_id(lang, "Kit sin id") == "sin_id"
+              and store.entry(lang, "sin_id") is not None,
+              f"publicada={published}, id={store.guide_id(lang, 'Kit sin id')!r}")
+
+        # 2. Cambios inválidos en caliente: se descartan con error registrado y sigue la revisión anterior
+        chat_path, pack_path = root / lang / "chat.json", root / "pack.json"
+        chat, pack = json.loads(chat_path.read_text(encoding="utf-8")), json.loads(pack_path.read_text(encoding="utf-8"))
+        intent = next(iter(chat["intents"]))
+        other = next(p for p in (root / lang / "kits").glob("*.json") if p != guide)
+        other_id = json.loads(other.read_text(encoding="utf-8")).get("id", other.stem)
+        no_priority = {**chat, "intents": {**chat["intents"], intent: {
+            k: v for k, v in chat["intents"][intent].items() if k != "priority"}}}
+        empty_keyword = {**chat, "intents": {**chat["intents"], intent: {
+            **chat["intents"][intent], "keywords": ["¿?"]}}}
+        for name, path, doc in (
+                ("guía sin pasos", guide, {"section": "kits", "title": "Kit sin id", "steps": []}),
+                ("id que no es texto", guide, {"id": 7, "section": "kits", "title": "Kit sin id", "steps": ["Agua."]}),
+                ("id repetido", guide, {"id": other_id, "section": "kits", "title": "Kit sin id", "steps": ["Agua."]}),
+                ("chat sin prioridad", chat_path, no_priority),
+                ("palabra clave vacía", chat_path, empty_keyword),
+                ("pack sin idioma por defecto", pack_path, {**pack, "languages": ["xx"]})):
+            original = path.read_text(encoding="utf-8")
+            revision, records.records = store.revision, []
+            write(path, doc)
+            published = store.reload([path])
+            check(failures, f"recarga rechazada ({name})",
+                  not published and store.revision == revision and len(records.records) == 1
+                  and (store.entry(lang, "sin_id") or {}).get("steps") == ["Agua."]
+                  and store.chat(lang) == chat,
+                  f"publicada={published}, revisión {revision}→{store.revision}, "
+                  f"{len(records.records)} error(es) registrado(s)")
+            if path != guide:
+                write(path, json.loads(original))
+                store.reload([path])
+        write(guide, {"id": 7, "section": "kits", "title": "Kit sin id", "steps": ["Agua."]})
+
+        # 3. Carga inicial con el mismo error: sin revisión anterior que servir, se lanza
+        try:
+            ContentStore(root)
+            raised = None
+        except ValueError as exc:
+            raised = exc
+        check(failures, "carga inicial inválida", raised is not None, repr(raised))
+        guide.unlink()
+
+        # Coste: carga completa y recarga de un fichero
+        loads = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            ContentStore(root)
+            loads.append((time.perf_counter() - t0) * 1000)
+        store = ContentStore(root)
+        target = next((root / lang / "kits").glob("*.json"))
+        doc = json.loads(target.read_text(encoding="utf-8"))
+        reloads = []
+        for _ in range(args.runs):
+            write(target, doc)
+            t0 = time.perf_counter()
+            store.reload([target])
+            reloads.append((time.perf_counter() - t0) * 1000)
+        for label, samples in (("carga completa", loads), ("recarga de un fichero", reloads)):
+            p = percentiles(samples)
+            print(f"{label} ({p['n']}): p50 {p['p50']:.2f} ms · p95 {p['p95']:.2f} ms · máx {p['max']:.2f} ms")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
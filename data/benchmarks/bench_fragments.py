@@ -0,0 +1,154 @@
+# bench_fragments.py
+"""Avance de paso en «Emergencias inmediatas»: latencia y bytes enviados por clic, con y sin fragmentos.
+
+Arranca `streamlit run data/app.py` dos veces (CONRUMBO_FRAGMENTS=0 y 1) y habla con él
+por el websocket como lo haría el navegador: abre la guía de RCP con ?guide=, pulsa
+«Siguiente» hasta el último paso y mide, por clic, el tiempo hasta el fin del rerun
+y los bytes y elementos (deltas) que llegan. AppTest no sirve aquí: ejecuta el script
+entero aunque el botón esté dentro de un fragmento.
+
+Uso: python data/benchmarks/bench_fragments.py [--rounds 5] [--guide parada-cardiorrespiratoria]
+Requiere el paquete `websockets` (dependencia de Streamlit).
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from journeys import APP, REPO_ROOT, percentiles  # noqa: E402
+
+NEXT_LABEL = "Siguiente"
+USER_ID = "0" * 32  # siempre el mismo usuario anónimo: no crea filas de progreso nuevas
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app=APP, **env):
+    """`streamlit run app` en un puerto libre (TTS stub, sin XSRF); vuelve cuando responde /_stcore/health."""
+    port = free_port()
+    env = dict(os.environ, CONRUMBO_TTS_ENGINE="stub", **env)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(app), "--server.headless", "true",
+         "--server.port", str(port), "--server.enableXsrfProtection", "false",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("streamlit no arrancó")
+
+
+class Client:
+    """Cliente mínimo del protocolo de Streamlit (BackMsg / ForwardMsg en protobuf)."""
+
+    def __init__(self, ws, query: str, mark: str = None):
+        self.ws = ws
+        self.query = query
+        self.page_hash = ""
+        self.mark = mark        # texto a vigilar en los markdown que llegan
+        self.marked_at = None   # segundos desde el inicio del rerun hasta que apareció
+
+    def rerun(self, widget_id: str = None, fragment_id: str = ""):
+        """Pide un rerun (o el de un fragmento) y lee hasta el fin: (segundos, bytes, deltas, botones)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query
+        msg.rerun_script.page_script_hash = self.page_hash
+        if widget_id:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            state.trigger_value = True
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        t0 = time.perf_counter()
+        self.marked_at = None
+        self.ws.send(msg.SerializeToString())
+        size = deltas = 0
+        buttons = {}
+        while True:
+            raw = self.ws.recv()
+            size += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = fwd.new_session.page_script_hash
+            elif kind == "delta":
+                deltas += 1
+                el = fwd.delta.new_element
+                if fwd.delta.WhichOneof("type") == "new_element" and el.WhichOneof("type") == "button":
+                    buttons[el.button.label] = (el.button.id, fwd.delta.fragment_id, el.button.disabled)
+                elif self.mark and self.marked_at is None and el.WhichOneof("type") == "markdown" \
+                        and self.mark in el.markdown.body:
+                    self.marked_at = time.perf_counter() - t0
+            elif kind == "script_finished":
+                return time.perf_counter() - t0, size, deltas, buttons
+
+
+def step_through(port: int, guide: str) -> list:
+    """(segundos, bytes, deltas) de cada clic en «Siguiente» hasta el último paso."""
+    from websockets.sync.client import connect
+
+    with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        client = Client(ws, f"guide={guide}&u={USER_ID}")
+        _, _, _, buttons = client.rerun()
+        samples = []
+        while True:
+            label = next((k for k in buttons if k.startswith(NEXT_LABEL)), None)
+            if label is None or buttons[label][2]:
+                return samples
+            widget_id, fragment_id, _ = buttons[label]
+            secs, size, deltas, found = client.rerun(widget_id, fragment_id)
+            samples.append((secs, size, deltas))
+            # En un rerun de fragmento solo llegan los botones del panel: se conservan los demás
+            buttons.update(found)
+
+
+def measure(fragments: bool, rounds: int, guide: str) -> dict:
+    proc, port = start_server(CONRUMBO_FRAGMENTS="1" if fragments else "0")
+    try:
+        step_through(port, guide)  # calentamiento: cachés de proceso, TTS, índices
+        samples = [s for _ in range(rounds) for s in step_through(port, guide)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    result = percentiles([s[0] for s in samples])
+    result["bytes"] = sum(s[1] for s in samples) / len(samples)
+    result["deltas"] = sum(s[2] for s in samples) / len(samples)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--guide", default="parada-cardiorrespiratoria")
+    args = parser.parse_args()
+
+    results = {}
+    for label, fragments in (("página", False), ("fragmento", True)):
+        r = results[label] = measure(fragments, args.rounds, args.guide)
+        print(f"{label:>9}: p50 {r['p50'] * 1000:6.1f} ms  p95 {r['p95'] * 1000:6.1f} ms  "
+              f"{r['bytes'] / 1024:7.1f} KB/clic  {r['deltas']:5.1f} elementos/clic  (n={r['n']})")
+    before, after = results["página"], results["fragmento"]
+    print(f"fragmento vs página: latencia p50 x{before['p50'] / after['p50']:.1f}, "
+          f"bytes x{before['bytes'] / max(after['bytes'], 1):.1f}")
+
+
+if __name__ == "__main__":
+    main()
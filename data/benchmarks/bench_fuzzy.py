@@ -0,0 +1,108 @@
+# bench_fuzzy.py
+"""Acierto y latencia del router con índice difuso sobre un corpus de erratas y dictado.
+
+El acierto se mide en cada idioma con su corpus (CORPORA); cualquier fallo hace que el
+script termine con código 1.
+
+La latencia se da dos veces: con las memoizaciones calientes (el mismo mensaje otra vez) y
+en frío, vaciándolas antes de cada mensaje (lo que cuesta el índice de verdad).
+
+Uso: python data/benchmarks/bench_fuzzy.py [--vocab 5000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from conrumbo.fuzzy import FuzzyIndex, normalize  # noqa: E402
+from conrumbo.content import ContentStore  # noqa: E402
+from conrumbo.i18n import Routers  # noqa: E402
+
+ROUTERS = Routers(ContentStore(os.path.join(os.path.dirname(HERE), "content")))
+ROUTER = ROUTERS("es")
+# idioma -> corpus (mensaje, intención esperada); en inglés, palabras clave de palabra entera
+CORPORA = {"es": "misspellings.tsv", "en": "routing_en.tsv"}
+
+
+def load_corpus(path: str) -> list:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                msg, expected = line.rstrip("\n").split("\t")
+                rows.append((msg, None if expected == "-" else expected))
+    return rows
+
+
+def accuracy(rows: list, router=ROUTER, label: str = "es") -> int:
+    """Imprime el acierto del corpus y devuelve cuántos mensajes fallan."""
+    ok, misses = 0, []
+    for msg, expected in rows:
+        best = router.best(msg)
+        got = best.intent if best else None
+        if got == expected:
+            ok += 1
+        else:
+            misses.append((msg, expected, got))
+    print(f"acierto [{label}]: {ok}/{len(rows)} ({100 * ok / len(rows):.1f} %)")
+    for msg, expected, got in misses:
+        print(f"  fallo: {msg!r}: esperado {expected}, obtenido {got}")
+    return len(misses)
+
+
+def clear(index: FuzzyIndex) -> None:
+    """Vacía las memoizaciones (normalize, lookup y _search): la siguiente búsqueda paga el índice."""
+    normalize.cache_clear()
+    index.lookup.cache_clear()
+    index._search.cache_clear()
+
+
+def latency(rows: list, index: FuzzyIndex, label: str, repeat: int = 200, cold_repeat: int = 20) -> None:
+    """µs por mensaje con las cachés calientes (tráfico repetido) y en frío (mensaje nunca visto)."""
+    msgs = [msg for msg, _ in rows]
+    clear(index)
+    for msg in msgs:
+        index.search(normalize(msg))
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for msg in msgs:
+            index.search(normalize(msg))
+    cached = (time.perf_counter() - t0) / (repeat * len(msgs))
+    cold = 0.0
+    for _ in range(cold_repeat):
+        for msg in msgs:
+            clear(index)
+            t0 = time.perf_counter()
+            index.search(normalize(msg))
+            cold += time.perf_counter() - t0
+    cold /= cold_repeat * len(msgs)
+    print(f"{label}: {len(index):>6} términos, en caché {cached * 1e6:8.1f} µs/mensaje, "
+          f"en frío {cold * 1e6:8.1f} µs/mensaje")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vocab", type=int, default=5000, help="términos sintéticos añadidos al vocabulario")
+    args = parser.parse_args()
+
+    failures = sum(accuracy(load_corpus(os.path.join(HERE, name)), ROUTERS(lang), lang)
+                   for lang, name in CORPORA.items())
+    rows = load_corpus(os.path.join(HERE, CORPORA["es"]))
+    latency(rows, ROUTER.fuzzy, "vocabulario actual")
+
+    rng = random.Random(112)
+    vocabulary = {t: ROUTER.fuzzy._intents[i] for i, t in enumerate(ROUTER.fuzzy._terms)}
+    while len(vocabulary) < args.vocab:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14)))
+        vocabulary.setdefault(word, f"sintetico:{len(vocabulary)}")
+    latency(rows, FuzzyIndex(vocabulary), "vocabulario ampliado")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# bench_import.py
+"""Coste de arranque de la app: tiempo de importación (python -X importtime) y primer pintado en frío.
+
+Importación: en un proceso nuevo se importa streamlit solo y después streamlit más los
+módulos que usa data/app.py; la diferencia es lo que añade ConRumbo. Falla (código 1) si
+aparece algún módulo pesado que la app debe cargar solo bajo demanda (pandas, zipfile,
+Pillow, smtplib...) o si se pasa del presupuesto.
+
+Primer pintado: proceso nuevo que ejecuta el primer rerun de app.py con AppTest, desde
+el arranque del intérprete hasta que el script termina.
+
+Uso: python data/benchmarks/bench_import.py [--runs 5] [--budget-ms 150] [--no-paint]
+     [--modules conrumbo.content,conrumbo.router] [--out import.json] [--baseline import.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lo que data/app.py importa al arrancar
+APP_MODULES = ("conrumbo.ui.chat", "conrumbo.ui.emergency", "conrumbo.ui.layout", "conrumbo.ui.lite",
+               "conrumbo.ui.media", "conrumbo.ui.perf", "conrumbo.ui.resources", "conrumbo.ui.session",
+               "conrumbo.ui.tabs")
+# Solo se cargan dentro de la función que los usa
+LAZY = ("pandas", "numpy", "zipfile", "PIL", "qrcode", "smtplib", "ssl", "email.message", "requests",
+        "gtts", "vosk", "av", "streamlit_webrtc", "magic", "watchdog.observers", "sqlite3")
+
+PAINT = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+print(json.dumps({"paint": time.perf_counter() - t0, "exception": bool(at.exception)}))
+"""
+
+
+def importtime(modules: list, prelude: str = "") -> dict:
+    """{módulo: microsegundos acumulados} de un proceso nuevo que importa `modules`."""
+    code = prelude + "".join(f"import {m}\n" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=DATA_DIR,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1])
+    table = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.rstrip()
+        table[name.strip()] = (int(cumulative), len(name) - len(name.lstrip()))
+    return table
+
+
+def own_cost(table: dict) -> float:
+    """ms acumulados de las importaciones de primer nivel (las que no cuelgan de otra)."""
+    return sum(us for us, depth in table.values() if depth == 1) / 1000
+
+
+def measure_import(modules: list, runs: int, base_prelude: str) -> dict:
+    samples, heavy = [], set()
+    for _ in range(runs):
+        base = importtime([], base_prelude) if base_prelude else {}
+        full = importtime(modules, base_prelude)
+        added = {k: v for k, v in full.items() if k not in base}
+        samples.append(own_cost(added))
+        heavy |= {m for m in LAZY if m in added}
+    return {"import_ms": statistics.median(samples), "samples": samples, "heavy": sorted(heavy),
+            "modules": len(added)}
+
+
+def measure_paint(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", PAINT, os.path.join(DATA_DIR, "app.py")],
+                              cwd=os.path.dirname(DATA_DIR), capture_output=True, text=True,
+                              env=dict(os.environ, CONRUMBO_TTS_ENGINE="stub"))  # sin red al salir
+        wall = time.perf_counter() - t0
+        if proc.returncode != 0:
+            raise SystemExit(proc.stderr.strip().splitlines()[-1])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append({"process_ms": wall * 1000, "first_paint_ms": result["paint"] * 1000})
+    return {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150, help="máximo para lo que importa ConRumbo")
+    parser.add_argument("--modules", default=",".join(APP_MODULES))
+    parser.add_argument("--no-paint", action="store_true", help="sin AppTest (solo importación)")
+    parser.add_argument("--out")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    modules = [m for m in args.modules.split(",") if m]
+    prelude = "import streamlit\n" if any(m.startswith("conrumbo.ui") for m in modules) else ""
+    result = measure_import(modules, args.runs, prelude)
+    print(f"importación ConRumbo: {result['import_ms']:.1f} ms (mediana de {args.runs}, "
+          f"{result['modules']} módulos nuevos{' sobre streamlit' if prelude else ''})")
+    if not args.no_paint:
+        result.update(measure_paint(args.runs))
+        print(f"primer pintado: {result['first_paint_ms']:.0f} ms  (proceso completo {result['process_ms']:.0f} ms)")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+        for key in ("import_ms", "first_paint_ms", "process_ms"):
+            if key in base and key in result:
+                print(f"  {key}: {base[key]:.1f} -> {result[key]:.1f} ms ({result[key] / base[key] - 1:+.0%})")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if result["heavy"]:
+        print("ERROR: se importan al arrancar:", ", ".join(result["heavy"]))
+        failed = True
+    if result["import_ms"] > args.budget_ms:
+        print(f"ERROR: importación por encima del presupuesto ({args.budget_ms:.0f} ms)")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
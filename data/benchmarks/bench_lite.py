@@ -0,0 +1,144 @@
+# bench_lite.py
+"""Tiempo hasta la primera instrucción: app completa frente al modo emergencia ligero.
+
+Para cada variante (data/app.py, data/app.py?lite=1 y data/lite.py) abre la guía de un QR
+(?guide=) por el websocket, como el navegador, y mide hasta que llega el markdown con el
+paso 1:
+  - en frío: desde lanzar `streamlit run` (arranque + primera sesión), --cold veces;
+  - en caliente: sesiones nuevas contra el mismo servidor ya arrancado, --rounds veces,
+    con los bytes y elementos que recibe esa primera página.
+Además ejecuta cada variante una vez con AppTest en un proceso aparte y anota los módulos
+pesados que carga el rerun y los ficheros de medios que abre. Sale con código 1 si el modo
+ligero carga alguno (pandas, zipfile, Pillow...) o lee fotos o vídeos.
+
+Uso: python data/benchmarks/bench_lite.py [--rounds 20] [--cold 3] [--guide parada-cardiorrespiratoria]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_fragments import USER_ID, Client, start_server  # noqa: E402
+from bench_import import LAZY  # noqa: E402
+from journeys import APP, REPO_ROOT, percentiles  # noqa: E402
+
+LITE = APP.parent / "lite.py"
+
+# Lo que el rerun carga y abre, en un proceso nuevo con AppTest
+FOOTPRINT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+media = []
+sys.addaudithook(lambda event, args: event == "open" and isinstance(args[0], str)
+                 and args[0].lower().endswith(tuple(sys.argv[3].split(","))) and media.append(args[0]))
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+for pair in sys.argv[2].split("&"):
+    key, _, value = pair.partition("=")
+    at.query_params[key] = value
+before = set(sys.modules)
+at.run()
+print(json.dumps({"modules": sorted(set(sys.modules) - before), "media": sorted(set(media)),
+                  "exception": bool(at.exception)}))
+"""
+# La recarga en caliente de contenidos (watchdog) sí se usa en el modo ligero
+FORBIDDEN = tuple(m for m in LAZY if m != "watchdog.observers")
+MEDIA_EXT = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".webm", ".mov")
+
+
+def first_instruction(port: int, query: str, mark: str) -> tuple:
+    """Una sesión nueva: (segundos hasta el paso 1, segundos hasta el fin, bytes, deltas)."""
+    from websockets.sync.client import connect
+
+    t0 = time.perf_counter()
+    with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        handshake = time.perf_counter() - t0
+        client = Client(ws, query, mark)
+        secs, size, deltas, _ = client.rerun()
+        if client.marked_at is None:
+            raise SystemExit(f"no aparece el primer paso con ?{query}")
+        return handshake + client.marked_at, handshake + secs, size, deltas
+
+
+def cold(app, query: str, mark: str) -> float:
+    """Segundos desde lanzar el servidor hasta ver el primer paso."""
+    t0 = time.perf_counter()
+    proc, port = start_server(app)
+    try:
+        first_instruction(port, query, mark)
+        return time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def warm(app, query: str, mark: str, rounds: int) -> dict:
+    proc, port = start_server(app)
+    try:
+        first_instruction(port, query, mark)  # calentamiento: cachés de proceso, TTS, índices
+        samples = [first_instruction(port, query, mark) for _ in range(rounds)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    result = percentiles([s[0] for s in samples])
+    result["done_p50"] = percentiles([s[1] for s in samples])["p50"]
+    result["bytes"] = sum(s[2] for s in samples) / len(samples)
+    result["deltas"] = sum(s[3] for s in samples) / len(samples)
+    return result
+
+
+def footprint(app, query: str) -> dict:
+    proc = subprocess.run([sys.executable, "-c", FOOTPRINT, str(app), query, ",".join(MEDIA_EXT)],
+                          cwd=REPO_ROOT, capture_output=True, text=True,
+                          env=dict(os.environ, CONRUMBO_TTS_ENGINE="stub"))
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["heavy"] = [m for m in FORBIDDEN if m in result["modules"]]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--cold", type=int, default=3)
+    parser.add_argument("--guide", default="parada-cardiorrespiratoria")
+    args = parser.parse_args()
+
+    with open(APP.parent / "content" / "es" / "emergencias" / f"{args.guide}.json", encoding="utf-8") as f:
+        mark = json.load(f)["steps"][0]
+    variants = (
+        ("completa", APP, f"guide={args.guide}&u={USER_ID}"),
+        ("?lite=1", APP, f"lite=1&guide={args.guide}"),
+        ("lite.py", LITE, f"guide={args.guide}"),
+    )
+
+    results = {}
+    for label, app, query in variants:
+        r = results[label] = warm(app, query, mark, args.rounds)
+        r["cold"] = percentiles([cold(app, query, mark) for _ in range(args.cold)])["p50"]
+        r.update(footprint(app, query))
+        print(f"{label:>9}: primer paso p50 {r['p50'] * 1000:6.1f} ms  p95 {r['p95'] * 1000:6.1f} ms  "
+              f"(página completa {r['done_p50'] * 1000:6.1f} ms)  {r['bytes'] / 1024:6.1f} KB  "
+              f"{r['deltas']:5.1f} elementos  en frío {r['cold'] * 1000:6.0f} ms  "
+              f"medios abiertos {len(r['media'])}  pesados: {', '.join(r['heavy']) or '—'}")
+    full, lite = results["completa"], results["lite.py"]
+    print(f"lite.py vs completa: primer paso x{full['p50'] / lite['p50']:.1f} en caliente "
+          f"(página entera x{full['done_p50'] / lite['done_p50']:.1f}), x{full['cold'] / lite['cold']:.1f} en frío, "
+          f"bytes x{full['bytes'] / max(lite['bytes'], 1):.1f}")
+
+    failed = False
+    for label in ("?lite=1", "lite.py"):
+        r = results[label]
+        if r["heavy"] or r["media"] or r["exception"]:
+            print(f"ERROR: {label} carga {', '.join(r['heavy']) or '—'}, abre {len(r['media'])} medios"
+                  f"{' y falla' if r['exception'] else ''}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# bench_load.py
+"""Carga concurrente: N sesiones de data/app.py repartidas entre procesos, con recorridos guionizados.
+
+Cada proceso trabajador es como un pod: comparte cachés de proceso entre sus sesiones
+y las hace avanzar por turnos, así que todas siguen vivas (con su session_state)
+hasta el final. Por recorrido se mide la latencia de rerun; por proceso, el RSS pico
+y la memoria que añade cada sesión. El resultado se escribe en JSON para comparar
+entre commits (--baseline).
+
+Uso: python data/benchmarks/bench_load.py [--sessions 40] [--workers 4] [--out load.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from journeys import (REPO_ROOT, build_zip, export_progress, new_app, percentiles,  # noqa: E402
+                      send_chat, step_through)
+
+SCENARIO = "Parada cardiorrespiratoria"
+CHAT = ["mi padre no respira", "se ha cortado y sangra mucho", "¿dónde está el DEA más cercano?"]
+JOURNEYS = {
+    "emergency_steps": lambda at: step_through(at, SCENARIO),
+    "chat": lambda at: send_chat(at, CHAT),
+    "export_progress": export_progress,
+    "zip_bundle": build_zip,
+}
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def worker(sessions: int, rounds: int) -> dict:
+    # La primera sesión llena las cachés del proceso; la memoria por sesión se mide desde ahí.
+    warm = new_app()
+    base = rss_mb()
+    apps = [warm]
+    first_run = []
+    for _ in range(sessions - 1):
+        t = time.perf_counter()
+        apps.append(new_app())
+        first_run.append(time.perf_counter() - t)
+    after = rss_mb()
+
+    latencies = {name: [] for name in JOURNEYS}
+    errors = 0
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for name, journey in JOURNEYS.items():
+            for at in apps:
+                try:
+                    latencies[name] += journey(at)
+                except Exception:
+                    errors += 1
+                else:
+                    errors += bool(at.exception)
+    return {
+        "sessions": sessions,
+        "first_run": first_run,
+        "latencies": latencies,
+        "elapsed": time.perf_counter() - t0,
+        "errors": errors,
+        "rss_base_mb": base,
+        "rss_end_mb": rss_mb(),
+        "per_session_mb": (after - base) / max(1, sessions - 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize(results: list, args) -> dict:
+    journeys = {name: percentiles([s * 1000 for r in results for s in r["latencies"][name]]) for name in JOURNEYS}
+    all_reruns = [s * 1000 for r in results for v in r["latencies"].values() for s in v]
+    return {
+        "commit": git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": {"sessions": args.sessions, "workers": args.workers, "rounds": args.rounds},
+        "rerun_ms": percentiles(all_reruns),
+        "first_run_ms": percentiles([s * 1000 for r in results for s in r["first_run"]]),
+        "journeys_ms": journeys,
+        "reruns_per_s": len(all_reruns) / max(r["elapsed"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in results),
+        "per_session_mb": sum(r["per_session_mb"] for r in results) / len(results),
+        "workers": [{k: v for k, v in r.items() if k not in ("latencies", "first_run")} for r in results],
+    }
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        base = json.load(f)
+    print(f"\nvs {base.get('commit', baseline_path)}:")
+    for name, cur in report["journeys_ms"].items():
+        old = base.get("journeys_ms", {}).get(name)
+        if cur and old:
+            print(f"  {name:>16}: p95 {old['p95']:8.1f} → {cur['p95']:8.1f} ms ({cur['p95'] / old['p95'] - 1:+.0%})")
+    print(f"  {'per_session_mb':>16}: {base['per_session_mb']:8.2f} → {report['per_session_mb']:8.2f}")
+    print(f"  {'peak_rss_mb':>16}: {base['peak_rss_mb']:8.1f} → {report['peak_rss_mb']:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=40, help="sesiones en total")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="procesos (pods simulados)")
+    parser.add_argument("--rounds", type=int, default=2, help="veces que cada sesión repite los recorridos")
+    parser.add_argument("--out", default=None, help="JSON de salida (por defecto load-<commit>.json)")
+    parser.add_argument("--baseline", default=None, help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    workers = max(1, min(args.workers, args.sessions))
+    shares = [args.sessions // workers + (i < args.sessions % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(worker, shares, [args.rounds] * workers))
+
+    report = summarize(results, args)
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(__file__)), f"load-{report['commit']}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{args.sessions} sesiones en {workers} procesos · {report['reruns_per_s']:.1f} reruns/s · "
+          f"{report['errors']} errores")
+    for name, r in report["journeys_ms"].items():
+        if r:
+            print(f"  {name:>16}: p50 {r['p50']:7.1f} ms  p95 {r['p95']:7.1f} ms  p99 {r['p99']:7.1f} ms  (n={r['n']})")
+    print(f"  RSS pico {report['peak_rss_mb']:.0f} MB · {report['per_session_mb']:.2f} MB por sesión → {out}")
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# bench_media.py
+"""Carga del servidor de vídeos: muchos espectadores a la vez pidiendo tramos (Range) de un MP4.
+
+Arranca conrumbo.media_server en un proceso aparte sirviendo un fichero de --size-mb y
+primero comprueba el protocolo (200, 206, sufijos, 416, 304 con ETag e If-Modified-Since,
+If-Range caducado, HEAD). Luego lanza --viewers conexiones keep-alive concurrentes; cada una
+reproduce como un <video>: pide tramos de --chunk-kb seguidos desde el principio, salta
+una vez a un punto al azar y sigue (sin pausas de reproducción: es el peor caso). Mide la
+latencia por tramo y hasta el primer byte, el caudal total y el RSS y CPU del servidor,
+con sendfile y leyendo en Python.
+
+Uso: python data/benchmarks/bench_media.py [--viewers 200] [--chunks 8] [--chunk-kb 1024]
+     [--size-mb 64] [--modes sendfile,read] [--out media.json]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from journeys import APP, percentiles  # noqa: E402
+
+SERVER = """
+import asyncio, sys
+sys.path.insert(0, sys.argv[1])
+from conrumbo.media_server import MediaServer
+files = {sys.argv[2]: sys.argv[3]}
+server = MediaServer(lambda digest, name: files.get(digest) if name == "orig" else None,
+                     sendfile=sys.argv[5] == "1")
+asyncio.run(server.serve("127.0.0.1", int(sys.argv[4])))
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(path: str, digest: str, sendfile: bool):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-c", SERVER, str(APP.parent), digest, path, str(port),
+                             "1" if sendfile else "0"])
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc, port
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise SystemExit("el servidor de medios no arrancó")
+
+
+def proc_usage(pid: int) -> tuple:
+    """(RSS en MB, segundos de CPU) del proceso, de /proc."""
+    with open(f"/proc/{pid}/statm") as f:
+        rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return rss, (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+# =========================
+# Cliente HTTP mínimo (keep-alive)
+# =========================
+async def fetch(reader, writer, path: str, headers: dict = None, method: str = "GET", keep: bytes = None):
+    """(estado, cabeceras, bytes de cuerpo, segundos hasta el primer byte, cuerpo si keep)."""
+    lines = [f"{method} {path} HTTP/1.1", "Host: bench"] + [f"{k}: {v}" for k, v in (headers or {}).items()]
+    t0 = time.perf_counter()
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    ttfb = time.perf_counter() - t0
+    status_line, *rest = head.decode("latin-1").split("\r\n")
+    out = {}
+    for line in rest:
+        name, sep, value = line.partition(":")
+        if sep:
+            out[name.strip().lower()] = value.strip()
+    length = int(out.get("content-length", 0)) if method == "GET" else 0
+    body, got = [], 0
+    while got < length:
+        chunk = await reader.read(min(1 << 20, length - got))
+        if not chunk:
+            raise ConnectionError("respuesta incompleta")
+        got += len(chunk)
+        if keep:
+            body.append(chunk)
+    return int(status_line.split()[1]), out, got, ttfb, b"".join(body)
+
+
+async def check(port: int, digest: str, data: bytes) -> list:
+    """Comprobaciones del protocolo; devuelve los fallos."""
+    size, url = len(data), f"/media/{digest}/orig.mp4"
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    failures = []
+
+    async def expect(label, status, headers=None, method="GET", body=None, path=url):
+        got, out, _, _, content = await fetch(reader, writer, path, headers, method, keep=body is not None)
+        if got != status or (body is not None and content != body):
+            failures.append(f"{label}: {got} (esperado {status}{', cuerpo distinto' if got == status else ''})")
+        return out
+
+    full = await expect("GET", 200)
+    if full.get("content-length") != str(size) or full.get("accept-ranges") != "bytes":
+        failures.append("GET: faltan Content-Length o Accept-Ranges")
+    await expect("Range", 206, {"Range": "bytes=100-199"}, body=data[100:200])
+    await expect("Range abierto", 206, {"Range": f"bytes={size - 10}-"}, body=data[-10:])
+    await expect("Range sufijo", 206, {"Range": "bytes=-100"}, body=data[-100:])
+    await expect("Range fuera", 416, {"Range": f"bytes={size}-"})
+    await expect("If-None-Match", 304, {"If-None-Match": full["etag"]})
+    await expect("If-Modified-Since", 304, {"If-Modified-Since": full["last-modified"]})
+    await expect("If-Range caducado", 200, {"Range": "bytes=0-9", "If-Range": '"otro"'})
+    await expect("HEAD", 200, method="HEAD")
+    await expect("Desconocido", 404, path=f"/media/{'0' * 64}/orig.mp4")
+    await expect("Ruta fuera del manifiesto", 404, path="/media/../../etc/passwd")
+    writer.close()
+    return failures
+
+
+async def viewer(port: int, digest: str, size: int, chunks: int, chunk: int, rng: random.Random) -> dict:
+    """Un espectador: tramos seguidos, un salto al azar a mitad y más tramos."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    offset, lat, ttfb, sent = 0, [], [], 0
+    try:
+        for i in range(chunks):
+            if i == chunks // 2:
+                offset = rng.randrange(0, max(size - chunk, 1))
+            end = min(offset + chunk, size) - 1
+            t0 = time.perf_counter()
+            status, _, n, first, _ = await fetch(reader, writer, f"/media/{digest}/orig.mp4",
+                                                 {"Range": f"bytes={offset}-{end}"})
+            if status != 206:
+                raise ConnectionError(f"estado {status}")
+            lat.append(time.perf_counter() - t0)
+            ttfb.append(first)
+            sent += n
+            offset = end + 1 if end + 1 < size else 0
+        return {"lat": lat, "ttfb": ttfb, "bytes": sent, "error": None}
+    except (OSError, asyncio.IncompleteReadError) as exc:
+        return {"lat": lat, "ttfb": ttfb, "bytes": sent, "error": f"{type(exc).__name__}: {exc}"}
+    finally:
+        writer.close()
+
+
+async def load(port: int, pid: int, digest: str, size: int, args) -> dict:
+    idle_rss, cpu0 = proc_usage(pid)
+    peak = [idle_rss]
+
+    async def sample():
+        while True:
+            peak.append(proc_usage(pid)[0])
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.create_task(sample())
+    rng = random.Random(7)
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(viewer(port, digest, size, args.chunks, args.chunk_kb * 1024,
+                                            random.Random(rng.random())) for _ in range(args.viewers)))
+    wall = time.perf_counter() - t0
+    sampler.cancel()
+    cpu = proc_usage(pid)[1] - cpu0
+    total = sum(r["bytes"] for r in results)
+    return {
+        "viewers": args.viewers,
+        "requests": sum(len(r["lat"]) for r in results),
+        "errors": sum(r["error"] is not None for r in results),
+        "mb_per_s": total / 2**20 / wall,
+        "chunk_ms": {k: v * 1000 for k, v in percentiles([x for r in results for x in r["lat"]]).items() if k != "n"},
+        "ttfb_ms": {k: v * 1000 for k, v in percentiles([x for r in results for x in r["ttfb"]]).items() if k != "n"},
+        "idle_rss_mb": idle_rss,
+        "peak_rss_mb": max(peak),
+        "cpu_s_per_gb": cpu / (total / 2**30) if total else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=8, help="tramos por espectador")
+    parser.add_argument("--chunk-kb", type=int, default=1024)
+    parser.add_argument("--size-mb", type=int, default=64, help="tamaño del vídeo de prueba")
+    parser.add_argument("--modes", default="sendfile,read")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    data = random.Random(1).randbytes(args.size_mb * 2**20)
+    digest = hashlib.sha256(data).hexdigest()
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.mp4")
+        with open(path, "wb") as f:
+            f.write(data)
+        for mode in args.modes.split(","):
+            proc, port = start_server(path, digest, mode == "sendfile")
+            try:
+                failures = asyncio.run(check(port, digest, data))
+                r = report[mode] = asyncio.run(load(port, proc.pid, digest, len(data), args))
+                r["protocol_failures"] = failures
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+            print(f"{mode:>8}: {r['viewers']} espectadores · {r['requests']} tramos · {r['mb_per_s']:7.0f} MB/s · "
+                  f"tramo p50 {r['chunk_ms']['p50']:6.1f} ms p95 {r['chunk_ms']['p95']:6.1f} ms · "
+                  f"primer byte p95 {r['ttfb_ms']['p95']:6.1f} ms · RSS {r['idle_rss_mb']:.0f}→{r['peak_rss_mb']:.0f} MB · "
+                  f"{r['cpu_s_per_gb']:.2f} s CPU/GB · {r['errors']} errores")
+            for failure in failures:
+                print(f"          ERROR protocolo: {failure}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if any(r["protocol_failures"] or r["errors"] for r in report.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
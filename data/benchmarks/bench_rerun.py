@@ -0,0 +1,64 @@
+# bench_rerun.py
+"""Latencia de rerun de data/app.py con los medios en modo eager y lazy.
+
+Cada rerun ejecuta las siete pestañas; la diferencia entre modos es el coste de
+resolver y enviar los medios de los bloques que el usuario no ha abierto. También
+cuenta los ficheros abiertos y tocados (os.utime) por rerun, sin contar el propio app.py
+que relee Streamlit: en caliente (cabecera, descargas técnicas, audio de los pasos ya
+sintetizado) tiene que ser cero, y si no lo es sale con error y lista los ficheros.
+Con CONRUMBO_TTS_ENGINE=stub por defecto, para que el audio exista sin red.
+La misma condición de cero ficheros la comprueba tests/test_rerun_io.py con pytest.
+
+Uso: python data/benchmarks/bench_rerun.py [--reruns 30]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from journeys import APP, activate_emergency, count_opens, new_app, percentiles, timed  # noqa: E402
+
+os.environ.setdefault("CONRUMBO_TTS_ENGINE", "stub")
+
+
+def measure(lazy: bool, reruns: int) -> dict:
+    os.environ["CONRUMBO_LAZY_MEDIA"] = "1" if lazy else "0"
+    at = new_app()
+    activate_emergency(at, "Parada cardiorrespiratoria")
+    # En caliente: el audio pedido en segundo plano ya está sintetizado y en memoria
+    at.run()
+    time.sleep(1)
+    at.run()
+    with count_opens() as io:
+        samples = [timed(at.run) for _ in range(reruns)]
+    result = percentiles(samples)
+    files = Counter(p for p in io["paths"] if p != str(APP))
+    result["opens_per_rerun"] = sum(files.values()) / reruns
+    result["touches_per_rerun"] = io["touches"] / reruns
+    result["files"] = files
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=30)
+    args = parser.parse_args()
+
+    failed = False
+    for label, lazy in (("eager", False), ("lazy", True)):
+        r = measure(lazy, args.reruns)
+        print(f"{label:>5}: p50 {r['p50'] * 1000:7.1f} ms  p95 {r['p95'] * 1000:7.1f} ms  "
+              f"{r['opens_per_rerun']:.1f} ficheros abiertos/rerun  {r['touches_per_rerun']:.1f} tocados/rerun  "
+              f"(n={r['n']})")
+        if r["files"] or r["touches_per_rerun"]:
+            failed = True
+            for path, n in r["files"].most_common(10):
+                print(f"       ERROR: {path} abierto {n} veces")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
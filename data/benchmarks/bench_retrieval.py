@@ -0,0 +1,122 @@
+# bench_retrieval.py
+"""Búsqueda de pasos del chat: construcción del índice, apertura con mmap y latencia por consulta.
+
+Primero comprueba la calidad sobre el paquete real de contenidos (cada pregunta debe citar la
+guía esperada y los saludos no deben citar nada). Después construye un corpus sintético de
+--steps pasos (frases de las guías reales barajadas, más ruido) y mide cuánto tarda en
+construirse y en abrirse, lo que ocupa en disco y la latencia de consulta (p50/p95/p99), con
+el índice frío (primera consulta tras abrir) y caliente. Usa un CONRUMBO_CACHE_DIR temporal.
+
+Uso: python data/benchmarks/bench_retrieval.py [--steps 50000] [--queries 2000] [--budget-ms 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from journeys import percentiles  # noqa: E402
+
+CONTENT_DIR = Path(__file__).resolve().parents[1] / "content"
+
+# (idioma, pregunta, guía que debe citar; None = nada)
+CASES = [
+    ("es", "¿qué hago si se ha cortado con un cristal y sangra mucho?", "hemorragias"),
+    ("es", "mi padre no respira", "parada-cardiorrespiratoria"),
+    ("es", "mi madre se ahoga con un trozo de carne", "atragantamiento-adulto"),
+    ("es", "se ha quemado con aceite", "quemadura-termica"),
+    ("es", "mi abuelo se ha desmayado", "desmayo-sincope"),
+    ("es", "el niño se ha tragado unas pastillas", "intoxicaciones"),
+    ("es", "se ha torcido el tobillo", "traumatismos"),
+    ("es", "tiene convulsiones", "convulsiones"),
+    ("es", "qué llevo a la montaña", "montana"),
+    ("es", "hola", None),
+    ("es", "gracias", None),
+    ("en", "he cut himself with glass and is bleeding a lot", "hemorragias"),
+    ("en", "not breathing", "parada-cardiorrespiratoria"),
+    ("en", "he twisted his ankle", "traumatismos"),
+    ("en", "she swallowed bleach", "intoxicaciones"),
+    ("en", "hello", None),
+]
+
+
+def quality(retrieval) -> list:
+    """Fallos de CASES sobre el paquete real."""
+    from conrumbo.content import ContentStore
+
+    indexes = retrieval.Retrievers(ContentStore(CONTENT_DIR))
+    failures = []
+    for lang, question, expected in CASES:
+        hits = indexes(lang).search(question)
+        got = hits[0].guide_id if hits else None
+        if got != expected:
+            failures.append(f"[{lang}] {question!r}: {got} (esperado {expected})")
+    return failures
+
+
+def synthetic(n: int, seed: int = 1) -> tuple:
+    """(docs, preguntas): pasos hechos con palabras de las guías reales y consultas sobre ellos."""
+    from conrumbo.content import ContentStore
+    from conrumbo.retrieval import guide_docs
+
+    rng = random.Random(seed)
+    real = guide_docs(ContentStore(CONTENT_DIR), "es")
+    words = [w for _, _, text in real for w in text.split()]
+    docs = [(f"sint-{i // 8}", i % 8, " ".join(rng.choices(words, k=rng.randint(8, 24))) + f" ref{i}")
+            for i in range(n)]
+    queries = [" ".join(rng.choices(words, k=rng.randint(2, 10))) for _ in range(200)]
+    queries += [question for _, question, _ in CASES]
+    return docs, queries
+
+
+def disk_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.iterdir()) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=50_000, help="pasos del corpus sintético")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="p95 máximo aceptado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CONRUMBO_CACHE_DIR"] = tmp
+        from conrumbo import retrieval
+
+        failures = quality(retrieval)
+        print(f"calidad: {len(CASES) - len(failures)}/{len(CASES)} preguntas citan la guía esperada")
+        for failure in failures:
+            print(f"  ERROR {failure}")
+
+        docs, queries = synthetic(args.steps)
+        t0 = time.perf_counter()
+        path = retrieval.build(docs, Path(tmp) / "bench")
+        built = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = retrieval.StepIndex(path)
+        opened = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index.search(queries[0])
+        cold = time.perf_counter() - t0
+
+        lat = []
+        for i in range(args.queries):
+            t0 = time.perf_counter()
+            index.search(queries[i % len(queries)])
+            lat.append((time.perf_counter() - t0) * 1000)
+        p = percentiles(lat)
+        print(f"{len(index)} pasos: construcción {built:.1f} s · {disk_mb(path):.1f} MB en disco · "
+              f"apertura {opened * 1000:.1f} ms · primera consulta {cold * 1000:.1f} ms")
+        print(f"consulta ({p['n']}): p50 {p['p50']:.2f} ms · p95 {p['p95']:.2f} ms · p99 {p['p99']:.2f} ms · "
+              f"máx {p['max']:.2f} ms (presupuesto p95 {args.budget_ms:g} ms)")
+    sys.exit(1 if failures or p["p95"] > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bench_router.py
+"""Rendimiento del router del chat: bucle re.search por intención vs. expresión compilada,
+y con la caché LRU de respuestas sobre tráfico repetitivo (tasa de aciertos).
+
+Los mensajes repetidos aprovechan la normalización memoizada; la fila «únicos» repite la
+comparación con mensajes que nunca se repiten (el peor caso para el router compilado).
+
+Uso: python data/benchmarks/bench_router.py [--n 200000] [--cache-size 4096]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conrumbo.content import ContentStore  # noqa: E402
+from conrumbo.i18n import Routers  # noqa: E402
+from conrumbo.router import IntentRouter, ReplyCache  # noqa: E402
+
+STORE = ContentStore(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content"))
+CHAT = STORE.chat("es")
+INTENTS, FAQ, FALLBACK = CHAT["intents"], CHAT["faq"], CHAT["fallback"]
+ROUTER = Routers(STORE)("es")
+
+MESSAGES = [
+    "se está atragantando y no respira",
+    "hay una quemadura con aceite",
+    "se ha desmayado en la calle",
+    "se dio un golpe en la cabeza y no respira",
+    "tiene un corte profundo en la mano",
+    "creo que es una intoxicación por setas",
+    "¿dónde está el dea más cercano?",
+    "¿qué número es el 112?",
+    "mi abuelo tiene convulsiones",
+    "no sé qué hacer",
+]
+
+
+def legacy_route(msg: str) -> str:
+    """Réplica del route_message original, redefinido en cada rerun del chat."""
+    intents = {"|".join(spec["keywords"]): spec["reply"] for spec in INTENTS.values()}
+
+    def route_message(msg: str) -> str:
+        low = msg.lower()
+        for key, resp in intents.items():
+            if re.search(key, low):
+                return resp
+        for key, resp in FAQ.items():
+            if key in low:
+                return resp
+        return FALLBACK
+
+    return route_message(msg)
+
+
+def legacy_all(msg: str) -> list:
+    """Lo que costaría obtener todas las coincidencias con el bucle original."""
+    low = msg.lower()
+    found = [k for k, spec in INTENTS.items() if re.search("|".join(spec["keywords"]), low)]
+    return found + [k for k in FAQ if k in low]
+
+
+def run(fn, n: int, unique: bool = False) -> float:
+    msgs = [f"{MESSAGES[i % len(MESSAGES)]} {i}" for i in range(n)] if unique else None
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(msgs[i] if unique else MESSAGES[i % len(MESSAGES)])
+    return time.perf_counter() - t0
+
+
+def skewed_traffic(n: int, seed: int = 1) -> list:
+    """Mensajes con reparto tipo Zipf sobre MESSAGES más variantes de mayúsculas y signos,
+    y un 5 % de mensajes únicos (los que nunca acertarán)."""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(MESSAGES))]
+    out = []
+    for i in range(n):
+        if rng.random() < 0.05:
+            out.append(f"mensaje distinto número {i}")
+            continue
+        msg = rng.choices(MESSAGES, weights)[0]
+        out.append(rng.choice((msg, msg.upper(), f"¡{msg}!", f"  {msg} ")))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    exact = IntentRouter(INTENTS, FAQ, fuzzy=False)
+    cases = (("legacy", legacy_route), ("legacy-all", legacy_all), ("compiled", exact.matches),
+             ("+fuzzy", ROUTER.matches))
+    for name, fn in cases:
+        secs = run(fn, args.n)
+        print(f"{name:>10}: {args.n / secs:>12,.0f} msg/s  ({secs / args.n * 1e6:.2f} µs/msg)")
+    for name, fn in (("legacy", legacy_route), ("+fuzzy", ROUTER.matches), ("route_id", ROUTER.route_id)):
+        secs = run(fn, args.n, unique=True)
+        print(f"{name:>10}: {args.n / secs:>12,.0f} msg/s  ({secs / args.n * 1e6:.2f} µs/msg)  [únicos]")
+
+    traffic = skewed_traffic(args.n)
+    cache = ReplyCache(args.cache_size)
+    for name, fn in (("route_id", ROUTER.route_id), ("+cache", lambda m: cache.resolve(ROUTER, m, "es", 0))):
+        t0 = time.perf_counter()
+        for msg in traffic:
+            fn(msg)
+        secs = time.perf_counter() - t0
+        print(f"{name:>10}: {args.n / secs:>12,.0f} msg/s  ({secs / args.n * 1e6:.2f} µs/msg)  [tráfico sesgado]")
+    print("caché:", {k: round(v, 3) if isinstance(v, float) else v for k, v in cache.stats().items()})
+
+
+if __name__ == "__main__":
+    main()
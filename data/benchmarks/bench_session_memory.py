@@ -0,0 +1,79 @@
+# bench_session_memory.py
+"""Memoria por sesión del historial de chat y del progreso: lista + dict (antes) frente a ChatHistory + bits.
+
+Simula conversaciones de distinta longitud con mensajes del corpus de misspellings.tsv
+y mide con tracemalloc lo que queda asignado en la sesión. Antes la lista crecía sin
+límite; ahora solo se conservan los últimos MAX_TURNS turnos y el bot guarda el id de
+la respuesta. Con pocos turnos el buffer cuesta algo más que una lista pequeña.
+
+Uso: python data/benchmarks/bench_session_memory.py [--turns 10 100 1000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from conrumbo.chat import ChatHistory  # noqa: E402
+from conrumbo.progress import Module  # noqa: E402
+from conrumbo.content import ContentStore  # noqa: E402
+from conrumbo.i18n import Routers  # noqa: E402
+
+ROUTER = Routers(ContentStore(os.path.join(os.path.dirname(HERE), "content")))("es")
+
+
+def messages() -> list:
+    with open(os.path.join(HERE, "misspellings.tsv"), encoding="utf-8") as f:
+        return [row[0] for row in csv.reader(f, delimiter="\t") if row and not row[0].startswith("#")]
+
+
+def legacy_session(msgs: list, exchanges: int) -> dict:
+    history = []
+    for i in range(exchanges):
+        # El texto llega del widget: una cadena nueva por mensaje, como en la app.
+        msg = "".join(msgs[i % len(msgs)])
+        history.append(("user", msg))
+        history.append(("bot", ROUTER.route(msg)))
+    progress = {"Emergencias": True, "Primeros auxilios": True, "Kits de supervivencia": False,
+                "Mantén la calma (APA)": False, "Simulacro completado": False}
+    return {"chat_history": history, "progress": progress}
+
+
+def compact_session(msgs: list, exchanges: int) -> dict:
+    history = ChatHistory()
+    for i in range(exchanges):
+        msg = "".join(msgs[i % len(msgs)])
+        history.add_user(msg)
+        history.add_bot(ROUTER.route_id(msg))
+    return {"chat_history": history, "progress": Module.EMERGENCIAS | Module.PRIMEROS_AUX}
+
+
+def measure(build, msgs: list, exchanges: int) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    session = build(msgs, exchanges)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del session
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 1000], help="turnos de usuario")
+    args = parser.parse_args()
+
+    msgs = messages()
+    for build in (legacy_session, compact_session):  # calienta cachés del router fuera de la medida
+        build(msgs, 1)
+    print(f"{'turnos':>7} {'antes':>10} {'después':>10}")
+    for n in args.turns:
+        old, new = measure(legacy_session, msgs, n), measure(compact_session, msgs, n)
+        print(f"{n:>7} {old / 1024:>8.1f} KB {new / 1024:>8.1f} KB  ({new / old - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_stt.py
+"""Factor de tiempo real (RTF) del dictado Vosk y sesiones simultáneas por núcleo.
+
+Alimenta ficheros WAV por trozos, igual que llegan desde WebRTC, a reconocedores
+que comparten un único modelo. RTF = tiempo de proceso / duración del audio;
+con RTF < 1 la sesión va más rápido que el habla.
+
+Uso: python data/benchmarks/bench_stt.py audio1.wav [audio2.wav ...] [--sessions 1,2,4,8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conrumbo import stt  # noqa: E402
+
+
+def load_pcm(path: str):
+    """PCM int16 mono y su frecuencia de muestreo."""
+    import soundfile as sf
+
+    data, rate = sf.read(path, dtype="int16", always_2d=True)
+    return data.mean(axis=1).astype("int16").tobytes(), rate
+
+
+def decode(pcm: bytes, rate: int, frame_ms: int = 20) -> str:
+    dictation = stt.Dictation(sample_rate=rate)
+    step = rate * frame_ms // 1000 * 2
+    for i in range(0, len(pcm), step):
+        dictation.feed(pcm[i:i + step])
+    return dictation.flush()
+
+
+def run_sessions(clips: list, sessions: int) -> float:
+    """Descodifica `sessions` clips a la vez; devuelve el tiempo total."""
+    threads = [threading.Thread(target=decode, args=clips[i % len(clips)]) for i in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", nargs="+")
+    parser.add_argument("--sessions", default="1,2,4,8")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    stt.get_model()
+    print(f"modelo cargado en {time.perf_counter() - t0:.1f} s ({stt.MODEL_DIR})")
+
+    clips = [load_pcm(p) for p in args.wav]
+    for (pcm, rate), path in zip(clips, args.wav):
+        secs = len(pcm) / 2 / rate
+        t0 = time.perf_counter()
+        text = decode(pcm, rate)
+        rtf = (time.perf_counter() - t0) / secs
+        print(f"{os.path.basename(path)}: {secs:.1f} s de audio, RTF {rtf:.3f}  «{text[:60]}»")
+
+    cores = os.cpu_count() or 1
+    audio_secs = sum(len(pcm) / 2 / rate for pcm, rate in clips) / len(clips)
+    for n in (int(x) for x in args.sessions.split(",")):
+        wall = run_sessions(clips, n)
+        rtf = wall / audio_secs
+        # Sesiones que aguantarían en tiempo real con esta carga, repartidas entre los núcleos usados
+        capacity = n / rtf
+        print(f"{n:>3} sesiones: RTF conjunto {rtf:.3f} -> ~{capacity:.1f} sesiones en tiempo real, "
+              f"{capacity / min(n, cores):.1f} por núcleo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_uploads.py
+"""Subidas concurrentes al almacén por contenido: disco, memoria y tiempo por subida.
+
+--users hilos suben a la vez el mismo vídeo de --size-mb (como diez usuarios con el mismo
+fichero) y después cada uno sube uno distinto. Mide lo que ocupa el almacén en disco, la memoria
+que reserva Python durante las subidas (tracemalloc, sin contar el fichero de origen, que en
+la app ya tiene Streamlit) y la latencia por subida. Usa un CONRUMBO_CACHE_DIR temporal.
+
+Uso: python data/benchmarks/bench_uploads.py [--users 10] [--size-mb 50]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MP4_HEAD = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+
+def fake_video(size_mb: int, seed: int) -> bytes:
+    return MP4_HEAD + os.urandom(8) + seed.to_bytes(4, "big") + b"\0" * (size_mb * 2**20 - len(MP4_HEAD) - 12)
+
+
+def disk_mb(root: str) -> float:
+    total = 0
+    for dirpath, _, files in os.walk(root):
+        total += sum(os.path.getsize(os.path.join(dirpath, f)) for f in files)
+    return total / 2**20
+
+
+def run(store, payloads: list) -> dict:
+    def upload(data):
+        t0 = time.perf_counter()
+        store.put(io.BytesIO(data), "demo.mp4")
+        return time.perf_counter() - t0
+
+    tracemalloc.start()
+    with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+        secs = list(pool.map(upload, payloads))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_alloc_mb": peak / 2**20, "max_s": max(secs), "mean_s": sum(secs) / len(secs)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--size-mb", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CONRUMBO_CACHE_DIR"] = tmp
+        from conrumbo.uploads import UploadStore
+        store = UploadStore(os.path.join(tmp, "uploads"))
+
+        same = fake_video(args.size_mb, 0)
+        r = run(store, [same] * args.users)
+        stats = store.stats()
+        print(f"mismo vídeo x{args.users}: {disk_mb(store.root):6.1f} MB en disco · "
+              f"{r['peak_alloc_mb']:5.1f} MB reservados en pico · {r['mean_s'] * 1000:6.0f} ms de media por subida · "
+              f"{stats['stored']} guardado, {stats['deduplicated']} duplicados")
+        distinct = [fake_video(args.size_mb, i + 1) for i in range(args.users)]
+        r = run(store, distinct)
+        print(f"vídeos distintos x{args.users}: {disk_mb(store.root):6.1f} MB en disco · "
+              f"{r['peak_alloc_mb']:5.1f} MB reservados en pico · {r['mean_s'] * 1000:6.0f} ms de media por subida")
+        leftovers = os.listdir(store.spool)
+        if leftovers:
+            print(f"ERROR: quedan {len(leftovers)} temporales en el spool")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# journeys.py
+"""Utilidades comunes para conducir data/app.py sin navegador con streamlit.testing (AppTest)."""
+import contextlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+APP = DATA_DIR / "app.py"
+REPO_ROOT = DATA_DIR.parent  # las rutas de assets/ del manifiesto son relativas a la raíz
+
+
+def new_app(timeout: float = 60):
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(REPO_ROOT)
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    at.run()
+    return at
+
+
+def button(at, prefix: str):
+    return next(b for b in at.button if b.label.startswith(prefix))
+
+
+def selectbox(at, prefix: str):
+    return next(s for s in at.selectbox if s.label.startswith(prefix))
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def activate_emergency(at, scenario: str) -> None:
+    if not at.session_state["emergency_mode"]:
+        button(at, "🆘 ACTIVAR").click().run()
+    selectbox(at, "Selecciona el tipo de emergencia").select(scenario).run()
+
+
+def percentiles(samples: list) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    return {"n": len(samples), "mean": statistics.fmean(samples),
+            "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
+
+
+_io_counters = []  # contadores activos; el hook de auditoría no se puede quitar una vez puesto
+IO_EVENTS = ("open", "os.utime")
+
+
+def _io_hook(event: str, args) -> None:
+    if _io_counters and event in IO_EVENTS:
+        for counter in _io_counters:
+            counter["opens" if event == "open" else "touches"] += 1
+            if event == "open" and isinstance(args[0], (str, bytes, os.PathLike)):
+                counter["paths"].append(os.fsdecode(args[0]))
+
+
+@contextlib.contextmanager
+def count_opens():
+    """Cuenta la E/S de ficheros mientras dura el bloque.
+
+    Usa el evento de auditoría "open" (io.open, os.open, Path.read_bytes...; también lo que abran
+    las extensiones en C) más los os.utime; parchear builtins.open no ve casi nada de eso.
+    """
+    global _io_hooked
+    if not _io_hooked:
+        sys.addaudithook(_io_hook)
+        _io_hooked = True
+    counter = {"opens": 0, "touches": 0, "paths": []}
+    _io_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _io_counters.remove(counter)
+
+
+_io_hooked = False
+
+
+# =========================
+# Recorridos de usuario (cada uno devuelve las latencias de sus reruns, en segundos)
+# =========================
+def step_through(at, scenario: str) -> list:
+    """Activa el modo emergencia en `scenario` y avanza con «Siguiente» hasta el último paso."""
+    samples = [timed(lambda: activate_emergency(at, scenario))]
+    while not button(at, "Siguiente").disabled:
+        samples.append(timed(lambda: button(at, "Siguiente").click().run()))
+    samples.append(timed(lambda: button(at, "⟲ Reiniciar").click().run()))
+    return samples
+
+
+def send_chat(at, messages) -> list:
+    samples = []
+    for msg in messages:
+        at.text_input(key="chat_input").input(msg)
+        samples.append(timed(lambda: button(at, "Enviar").click().run()))
+    return samples
+
+
+def export_progress(at) -> list:
+    """Marca un módulo en «Tu progreso» y genera la exportación CSV/JSON."""
+    box = next(c for c in at.checkbox if c.label == "Simulacro completado")
+    return [timed(lambda: (box.uncheck() if box.value else box.check()).run()),
+            timed(lambda: button(at, "⬇️ Preparar exportación").click().run())]
+
+
+def build_zip(at) -> list:
+    return [timed(lambda: button(at, "📦 Preparar material").click().run())]
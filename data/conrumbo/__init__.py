@@ -0,0 +1 @@
+"""ConRumbo: subsistemas reutilizables por la app de Streamlit (data/app.py)."""
@@ -0,0 +1,379 @@
+# alerts.py
+"""Avisos de emergencia (WhatsApp/SMS por Twilio y correo) enviados en segundo plano.
+
+El botón solo encola: escribe una línea en el diario de disco y vuelve. Un hilo
+planificador reparte los envíos a un pequeño pool, reutiliza las conexiones SMTP y
+HTTP, reintenta con espera exponencial y deja el estado de cada mensaje consultable.
+
+Ni Twilio ni SMTP deduplican: los envíos no son idempotentes. Lo hace el diario: cada
+intento queda anotado antes de salir, y un envío que pudo llegar (caída a mitad o sin
+respuesta del proveedor) no se repite, se marca como sin confirmar.
+"""
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from conrumbo.cache import cache_dir
+
+QUEUED, SENDING, RETRYING, SENT, FAILED = "queued", "sending", "retrying", "sent", "failed"
+UNCONFIRMED = "unconfirmed"  # pudo llegar o no: no se reenvía para no duplicar
+DONE = (SENT, FAILED, UNCONFIRMED)
+KEEP_SECONDS = 24 * 3600  # los terminados siguen en el diario: repetir la clave no reenvía tras reiniciar
+COMPACT_RECORDS = 1000    # líneas añadidas al diario antes de reescribirlo solo con lo vigente
+
+
+class PermanentError(Exception):
+    """Error que no se arregla reintentando (credenciales, número inválido...)."""
+
+
+class DeliveryUnknown(Exception):
+    """El proveedor pudo recibir el mensaje pero no respondió: reintentar podría duplicarlo."""
+
+
+# =========================
+# Canales
+# =========================
+class SmtpChannel:
+    name = "email"
+
+    def __init__(self, host: str, port: int, user: str, password: str, sender: str, to: str,
+                 starttls: bool = True, timeout: float = 10):
+        self.host, self.port, self.user, self.password = host, port, user, password
+        self.sender, self.to, self.starttls, self.timeout = sender, to, starttls, timeout
+        self._conn = None
+        self._lock = threading.Lock()  # smtplib no es seguro entre hilos: una conexión, envíos en serie
+
+    def _connection(self):
+        import smtplib
+        import ssl
+
+        if self._conn is not None:
+            try:
+                if self._conn.noop()[0] == 250:
+                    return self._conn
+            except smtplib.SMTPException:
+                pass
+            self._close()
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            conn.starttls(context=ssl.create_default_context())
+        if self.user:
+            conn.login(self.user, self.password)
+        self._conn = conn
+        return conn
+
+    def _close(self):
+        try:
+            self._conn.quit()
+        except Exception:
+            pass
+        self._conn = None
+
+    def send(self, body: str, subject: str, key: str) -> None:
+        import smtplib  # smtplib/ssl/email cuestan ~50 ms de importación: solo si hay SMTP configurado
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["From"], msg["To"], msg["Subject"] = self.sender, self.to, subject
+        msg["Message-ID"] = f"<{key}@conrumbo>"
+        msg.set_content(body)
+        with self._lock:
+            try:
+                conn = self._connection()
+                code, resp = conn.mail(self.sender)
+                if code != 250:
+                    raise smtplib.SMTPSenderRefused(code, resp, self.sender)
+                code, resp = conn.rcpt(self.to)
+                if code not in (250, 251):
+                    raise smtplib.SMTPRecipientsRefused({self.to: (code, resp)})
+                try:
+                    code, resp = conn.data(msg.as_bytes())
+                except smtplib.SMTPResponseException:
+                    raise  # el servidor contestó que no: no se entregó
+                except OSError as exc:
+                    # Corte o tiempo agotado tras DATA: si ya tenía el cuerpo, pudo aceptarlo sin decirlo
+                    self._close()
+                    raise DeliveryUnknown(f"{type(exc).__name__}: {exc}") from exc
+                if code != 250:
+                    raise smtplib.SMTPDataError(code, resp)
+            except smtplib.SMTPResponseException as exc:
+                # 5xx (remitente o destinatario rechazado, DATA denegado, credenciales): reintentar
+                # solo retrasa el siguiente canal. 4xx es temporal y se reintenta.
+                self._close()
+                if exc.smtp_code >= 500:
+                    raise PermanentError(str(exc)) from exc
+                raise
+            except smtplib.SMTPRecipientsRefused as exc:
+                self._close()
+                if all(code >= 500 for code, _ in exc.recipients.values()):
+                    raise PermanentError(str(exc)) from exc
+                raise
+            except (smtplib.SMTPException, OSError):
+                self._close()
+                raise
+
+
+class TwilioChannel:
+    name = "whatsapp"
+
+    def __init__(self, sid: str, token: str, sender: str, to: str,
+                 base_url: str = "https://api.twilio.com", timeout: float = 10):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = f"{base_url.rstrip('/')}/2010-04-01/Accounts/{sid}/Messages.json"
+        self.sender, self.to, self.timeout = sender, to, timeout
+        self._session = requests.Session()  # keep-alive: reutiliza la conexión TLS entre avisos
+        self._session.auth = (sid, token)
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+    def send(self, body: str, subject: str, key: str) -> None:
+        import requests
+
+        try:
+            resp = self._session.post(self.url, data={"From": self.sender, "To": self.to, "Body": body},
+                                      timeout=self.timeout)
+        except requests.exceptions.ReadTimeout as exc:
+            # La petición salió entera y Twilio no admite claves de idempotencia
+            raise DeliveryUnknown(str(exc)) from exc
+        except requests.exceptions.ConnectionError as exc:
+            if isinstance(exc, requests.exceptions.ConnectTimeout) or _not_connected(exc):
+                raise  # no llegó a conectar: Twilio no recibió nada y se puede reintentar
+            # Conexión cortada con la petición ya enviada (p. ej. sin respuesta): pudo crearse el mensaje
+            raise DeliveryUnknown(str(exc)) from exc
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise RuntimeError(f"HTTP {resp.status_code}")
+        if resp.status_code >= 400:
+            raise PermanentError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+
+
+def _not_connected(exc) -> bool:
+    """True si el ConnectionError de requests ocurrió al abrir la conexión (DNS, rechazo), antes de enviar."""
+    from urllib3.exceptions import NewConnectionError
+
+    reason = getattr(exc.args[0] if exc.args else None, "reason", None)
+    return isinstance(reason, NewConnectionError)
+
+
+def channels_from_env(env=os.environ) -> list:
+    """Canales configurados en el entorno (ver env.example); lista vacía si no hay ninguno."""
+    channels = []
+    if env.get("TWILIO_ACCOUNT_SID") and env.get("TWILIO_AUTH_TOKEN") and env.get("EMERGENCY_TO"):
+        channels.append(TwilioChannel(env["TWILIO_ACCOUNT_SID"], env["TWILIO_AUTH_TOKEN"],
+                                      env.get("TWILIO_FROM", ""), env["EMERGENCY_TO"],
+                                      base_url=env.get("TWILIO_API_BASE", "https://api.twilio.com")))
+    if env.get("SMTP_HOST") and env.get("EMERGENCY_EMAIL_TO"):
+        channels.append(SmtpChannel(env["SMTP_HOST"], int(env.get("SMTP_PORT", 587)),
+                                    env.get("SMTP_USER", ""), env.get("SMTP_PASS", ""),
+                                    env.get("SMTP_FROM") or env.get("SMTP_USER", ""), env["EMERGENCY_EMAIL_TO"],
+                                    starttls=env.get("SMTP_STARTTLS", "1") != "0"))
+    return channels
+
+
+# =========================
+# Despachador
+# =========================
+class AlertDispatcher:
+    """Cola en memoria respaldada por un diario JSONL; sobrevive a reinicios del proceso.
+
+    Cada aviso genera un mensaje por canal con id `<clave>:<canal>`. Encolar dos veces
+    la misma clave devuelve los mismos ids sin volver a enviar, también después de un
+    reinicio (durante KEEP_SECONDS): la deduplicación es nuestra, no del proveedor.
+    """
+
+    def __init__(self, channels: list, spool_dir: Path = None, max_attempts: int = 6,
+                 base_delay: float = 1.0, max_delay: float = 60.0, workers: int = 4,
+                 compact_every: int = COMPACT_RECORDS):
+        self.channels = {c.name: c for c in channels}
+        self.max_attempts, self.base_delay, self.max_delay = max_attempts, base_delay, max_delay
+        self._messages = {}  # id -> dict con canal, cuerpo, asunto, estado, intentos, error
+        self._heap = []      # (momento, secuencia, id)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="alerts")
+        self._journal_path = Path(spool_dir or cache_dir("alerts")) / "queue.jsonl"
+        self._journal = None
+        self.compact_every, self._records = compact_every, 0
+        self._compact_due = False
+        self._tail = None  # líneas anotadas mientras se compacta: se añaden al diario nuevo
+        self._recover()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="alerts-scheduler", daemon=True)
+        self._thread.start()
+
+    # ---------- diario ----------
+    def _recover(self) -> None:
+        """Reencola lo que quedó pendiente y compacta el diario."""
+        if not self._journal_path.exists():
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+            return
+        with open(self._journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # última línea cortada por una caída
+                if rec["op"] == "enqueue":
+                    self._messages[rec["id"]] = {**rec["msg"], "status": QUEUED, "attempts": 0, "error": ""}
+                elif rec["id"] in self._messages:
+                    self._messages[rec["id"]]["status"] = rec["op"]
+        for m in self._messages.values():
+            if m["status"] == SENDING:
+                # El proceso cayó con el envío en marcha: pudo salir, así que no se repite
+                m["status"], m["attempts"], m["error"] = UNCONFIRMED, 1, "interrumpido durante el envío"
+        self._compact()
+        for msg_id, m in self._messages.items():
+            if m["status"] not in DONE:
+                m["status"] = QUEUED
+                self._push(msg_id, time.time())
+
+    def _compact(self) -> None:
+        """Reescribe el diario con lo vigente: pendientes y terminados de las últimas KEEP_SECONDS.
+
+        Se llama al arrancar y, desde el hilo planificador, cada `compact_every` líneas; así el
+        diario y `_messages` no crecen con los días aunque el proceso no se reinicie. El fichero
+        nuevo se escribe sin `_cond`: enqueue() no espera a disco, y lo que anote mientras tanto
+        (`_tail`) se copia al final justo antes de sustituir el diario.
+        """
+        cutoff = time.time() - KEEP_SECONDS
+        with self._cond:
+            self._compact_due, self._records = False, 0
+            snapshot = list(self._messages.items())
+            self._tail = []
+        # Un terminado ya no cambia, así que se puede elegir sin cerrojo; un estado leído ahora es
+        # igual o más nuevo que la instantánea y, si es más nuevo, su línea también está en `_tail`.
+        expired = [i for i, m in snapshot if m["status"] in DONE and m["created"] <= cutoff]
+        with self._cond:
+            for msg_id in expired:
+                del self._messages[msg_id]
+        expired = set(expired)
+        tmp = self._journal_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for msg_id, m in snapshot:
+                if msg_id in expired:
+                    continue
+                status = m["status"]
+                f.write(json.dumps({"op": "enqueue", "id": msg_id, "msg": self._stored(m)}, ensure_ascii=False) + "\n")
+                if status in DONE or status == SENDING:
+                    f.write(json.dumps({"op": status, "id": msg_id}) + "\n")
+            with self._cond:
+                f.writelines(self._tail)
+                f.close()
+                if self._journal is not None:
+                    self._journal.close()
+                os.replace(tmp, self._journal_path)
+                self._journal = open(self._journal_path, "a", encoding="utf-8")
+                self._tail = None
+
+    @staticmethod
+    def _stored(m: dict) -> dict:
+        return {k: m[k] for k in ("channel", "body", "subject", "key", "created")}
+
+    def _log(self, op: str, msg_id: str, msg: dict = None) -> None:
+        rec = {"op": op, "id": msg_id}
+        if msg is not None:
+            rec["msg"] = self._stored(msg)
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        self._journal.write(line)
+        self._journal.flush()  # sin fsync: sobrevive a la caída del proceso sin añadir milisegundos
+        if self._tail is not None:
+            self._tail.append(line)
+        self._records += 1
+        if self._records >= self.compact_every and not self._compact_due:
+            self._compact_due = True  # la compacta el planificador, no quien anota (p. ej. enqueue)
+            self._cond.notify()
+
+    # ---------- API ----------
+    def enqueue(self, body: str, key: str, subject: str = "ConRumbo – aviso de emergencia") -> list:
+        """Encola el aviso en todos los canales y devuelve los ids de mensaje. No hace red."""
+        ids = []
+        now = time.time()
+        with self._cond:
+            for name in self.channels:
+                msg_id = f"{key}:{name}"
+                ids.append(msg_id)
+                if msg_id in self._messages:
+                    continue
+                msg = {"channel": name, "body": body, "subject": subject, "key": key, "created": now,
+                       "status": QUEUED, "attempts": 0, "error": ""}
+                self._messages[msg_id] = msg
+                self._log("enqueue", msg_id, msg)
+                self._push(msg_id, now)
+            self._cond.notify()
+        return ids
+
+    def status(self, ids) -> dict:
+        """{id: {"channel", "status", "attempts", "error"}} para mostrar en la sesión."""
+        out = {}
+        for msg_id in ids:
+            m = self._messages.get(msg_id)
+            if m is not None:
+                out[msg_id] = {"channel": m["channel"], "status": m["status"],
+                               "attempts": m["attempts"], "error": m["error"]}
+        return out
+
+    def close(self, timeout: float = 5) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=True)
+        self._journal.close()
+
+    # ---------- planificación y envío ----------
+    def _push(self, msg_id: str, due: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, msg_id))
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._compact_due \
+                        and (not self._heap or self._heap[0][0] > time.time()):
+                    self._cond.wait(timeout=self._heap[0][0] - time.time() if self._heap else None)
+                if self._closed:
+                    return
+                compact = self._compact_due
+                if not compact:
+                    _, _, msg_id = heapq.heappop(self._heap)
+                    self._messages[msg_id]["status"] = SENDING
+                    self._log(SENDING, msg_id)  # antes de que salga: tras una caída se sabe que pudo llegar
+            if compact:
+                self._compact()
+            else:
+                self._pool.submit(self._deliver, msg_id)
+
+    def _deliver(self, msg_id: str) -> None:
+        m = self._messages[msg_id]
+        channel = self.channels.get(m["channel"])
+        try:
+            if channel is None:
+                raise PermanentError(f"canal {m['channel']} no configurado")
+            channel.send(m["body"], m["subject"], m["key"])
+        except Exception as exc:
+            with self._cond:
+                m["attempts"] += 1
+                m["error"] = f"{type(exc).__name__}: {exc}"
+                if isinstance(exc, DeliveryUnknown):
+                    m["status"] = UNCONFIRMED
+                    self._log(UNCONFIRMED, msg_id)
+                elif isinstance(exc, PermanentError) or m["attempts"] >= self.max_attempts:
+                    m["status"] = FAILED
+                    self._log(FAILED, msg_id)
+                else:
+                    m["status"] = RETRYING
+                    self._log(RETRYING, msg_id)
+                    delay = min(self.max_delay, self.base_delay * 2 ** (m["attempts"] - 1))
+                    self._push(msg_id, time.time() + delay * random.uniform(0.8, 1.2))
+                    self._cond.notify()
+            return
+        with self._cond:
+            m["attempts"] += 1
+            m["status"], m["error"] = SENT, ""
+            self._log(SENT, msg_id)
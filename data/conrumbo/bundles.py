@@ -0,0 +1,67 @@
+# bundles.py
+"""ZIP de material por escenario, construidos una vez por versión de contenido y servidos desde disco."""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import unicodedata
+from pathlib import Path
+
+from conrumbo.cache import cache_dir
+from conrumbo.video import MEDIA_URL
+
+# Formatos ya comprimidos: deflate solo gasta CPU sin reducir tamaño.
+STORED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".mp4", ".mov", ".webm", ".mp3", ".zip"}
+
+
+def slugify(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def guide_markdown(title: str, steps: list) -> str:
+    return f"# {title}\n\n" + "\n".join([f"- {s}" for s in steps])
+
+
+def bundle_path(scenario: str, steps: list, files: list, root: Path = None):
+    """Ruta del ZIP para este manifiesto (exista o no), o None si no hay material local.
+
+    `files` es `MediaEntry.local_files()`: (nombre en el ZIP, ruta, tamaño, mtime_ns).
+    """
+    if not files:
+        return None
+    manifest = json.dumps([scenario, steps, files], ensure_ascii=False, sort_keys=True)
+    key = hashlib.sha256(manifest.encode("utf-8")).hexdigest()[:16]
+    return (root or cache_dir("bundles")) / f"{slugify(scenario)}-{key}.zip"
+
+
+def build_bundle(scenario: str, steps: list, files: list, root: Path = None):
+    """Devuelve la ruta del ZIP del escenario, construyéndolo solo si su manifiesto cambió."""
+    path = bundle_path(scenario, steps, files, root)
+    if path is None or path.exists():
+        return path
+    import zipfile  # solo al construir un ZIP; la app no lo carga al arrancar
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w") as z:
+            z.writestr("guia.md", guide_markdown(scenario, steps), compress_type=zipfile.ZIP_DEFLATED)
+            for arcname, p, _, _ in files:
+                stored = os.path.splitext(p)[1].lower() in STORED_EXTENSIONS
+                z.write(p, arcname=arcname, compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    # Las versiones anteriores del mismo escenario ya no se sirven.
+    for old in path.parent.glob(f"{slugify(scenario)}-*.zip"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return path
+
+
+def bundle_url(path: Path) -> str:
+    """Dirección del ZIP en media_server.py (solo con CONRUMBO_MEDIA_URL)."""
+    return f"{MEDIA_URL}/bundles/{path.name}"
@@ -0,0 +1,57 @@
+# cache.py
+"""Ubicación de los artefactos derivados (audio, miniaturas, ZIP...) en disco."""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_ROOT = Path(os.environ.get("CONRUMBO_CACHE_DIR") or Path(__file__).resolve().parent.parent / ".cache")
+
+
+def cache_dir(name: str) -> Path:
+    path = CACHE_ROOT / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+HASH_ENTRIES = 4096  # rutas recordadas por proceso; las menos usadas se olvidan
+_hashes = OrderedDict()  # ruta -> (tamaño, mtime_ns, sha256 del contenido): solo la última versión
+_hash_lock = threading.Lock()
+
+
+def file_hash(path) -> str:
+    """sha256 del contenido; solo se recalcula si cambian tamaño o fecha del fichero."""
+    st = os.stat(path)
+    key, sig = str(path), (st.st_size, st.st_mtime_ns)
+    with _hash_lock:
+        entry = _hashes.get(key)
+        if entry is not None and entry[:2] == sig:
+            _hashes.move_to_end(key)
+            return entry[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _hash_lock:
+        # Una versión nueva del fichero sustituye a la anterior en vez de sumarse
+        _hashes[key] = (*sig, digest)
+        _hashes.move_to_end(key)
+        if len(_hashes) > HASH_ENTRIES:
+            _hashes.popitem(last=False)
+    return digest
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Escribe en un temporal y renombra: otro proceso nunca lee un fichero a medias."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
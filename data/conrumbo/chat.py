@@ -0,0 +1,75 @@
+# chat.py
+"""Historial de chat acotado: los turnos del bot guardan el id de la respuesta (y los pasos citados), no su texto."""
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+USER, BOT = 0, 1
+MAX_TURNS = 40  # turnos en memoria por sesión
+WINDOW = 10     # turnos que se pintan de una vez; «Cargar anteriores» añade otros tantos
+
+
+class Turn:
+    __slots__ = ("role", "text", "reply_id", "sources")
+
+    def __init__(self, role: int, text: str = None, reply_id: str = None, sources: tuple = ()):
+        self.role = role
+        self.text = text
+        self.reply_id = reply_id
+        self.sources = sources  # ((id de guía, índice de paso), ...)
+
+    def to_json(self) -> str:
+        return json.dumps([self.role, self.text, self.reply_id, self.sources], ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "Turn":
+        role, text, reply_id, *rest = json.loads(line)  # los volcados antiguos no traen fuentes
+        return cls(role, text, reply_id, tuple(map(tuple, rest[0])) if rest else ())
+
+
+class ChatHistory:
+    """Buffer circular de turnos; con `spill_path`, los que salen del buffer se añaden a disco."""
+
+    def __init__(self, max_turns: int = MAX_TURNS, spill_path: Path = None):
+        self._turns = deque(maxlen=max_turns)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spilled = 0  # turnos que ya no están en memoria
+
+    def __len__(self) -> int:
+        """Turnos disponibles (en memoria y, si hay volcado, en disco)."""
+        return len(self._turns) + (self.spilled if self.spill_path else 0)
+
+    def _append(self, turn: Turn) -> None:
+        if len(self._turns) == self._turns.maxlen:
+            old = self._turns[0]
+            self.spilled += 1
+            if self.spill_path:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.write(old.to_json() + "\n")
+        self._turns.append(turn)
+
+    def add_user(self, text: str) -> None:
+        self._append(Turn(USER, text=text))
+
+    def add_bot(self, reply_id: str, sources: tuple = ()) -> None:
+        self._append(Turn(BOT, reply_id=reply_id, sources=sources))
+
+    def last(self, k: int) -> list:
+        """Los últimos `k` turnos en orden; si hace falta, completa con los volcados a disco."""
+        in_memory = list(self._turns)[-k:] if k < len(self._turns) else list(self._turns)
+        missing = k - len(in_memory)
+        if missing <= 0 or not self.spill_path or not self.spill_path.exists():
+            return in_memory
+        with open(self.spill_path, encoding="utf-8") as f:
+            older = deque(f, maxlen=missing)
+        return [Turn.from_json(line) for line in older] + in_memory
+
+    def clear(self) -> None:
+        self._turns.clear()
+        self.spilled = 0
+        if self.spill_path:
+            try:
+                os.unlink(self.spill_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,306 @@
+# content.py
+"""Paquete de contenidos en disco (data/content) cargado una vez e indexado por idioma."""
+import json
+import logging
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+from conrumbo.fuzzy import normalize
+
+SECTIONS = ("emergencias", "primeros_aux", "kits")
+
+log = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """Carga el paquete de contenidos y mantiene índices listos para consultar en cada rerun.
+
+    Estructura del paquete:
+        pack.json                      versión, idioma por defecto e idiomas
+        media.json                     fotos y vídeos por id de guía (comunes a todos los idiomas)
+        <idioma>/texts.json            textos de la interfaz
+        <idioma>/apa.json              rutina APA
+        <idioma>/chat.json             intenciones, FAQ y respuesta por defecto del chat
+        <idioma>/<sección>/<id>.json   una guía: id (por defecto, el nombre del fichero), sección,
+                                       orden, título, pasos y palabras clave opcionales (chat)
+
+    Si a un idioma le falta una guía o un fichero se usa el del idioma por defecto.
+    Las vistas devueltas son compartidas entre sesiones: no deben modificarse.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.revision = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._docs = {}  # ruta relativa -> (mtime_ns, documento)
+        self._observer = None
+        self.reload()
+
+    # ---------- carga ----------
+    def reload(self, paths=None) -> bool:
+        """Relee solo los ficheros nuevos, modificados o borrados y reconstruye los índices.
+
+        `paths` limita la comprobación a esas rutas (las que notifica el vigilante).
+        Devuelve True si se publicó una revisión nueva. Si el paquete resultante no es válido
+        (guía sin pasos, sección desconocida...) se registra el error y se sigue sirviendo la
+        revisión anterior; en la carga inicial, sin revisión anterior, se lanza la excepción.
+        """
+        with self._lock:
+            docs = dict(self._docs)
+            if paths is None:
+                current = {p.relative_to(self.root).as_posix(): p for p in self.root.rglob("*.json")}
+                candidates = set(current) | set(docs)
+            else:
+                candidates = set()
+                for p in paths:
+                    p = Path(p).resolve()
+                    if p.suffix == ".json" and self.root in p.parents:
+                        candidates.add(p.relative_to(self.root).as_posix())
+            changed = False
+            for rel in candidates:
+                path = self.root / rel
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    changed |= docs.pop(rel, None) is not None
+                    continue
+                if rel in docs and docs[rel][0] == mtime:
+                    continue
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        docs[rel] = (mtime, json.load(f))
+                except ValueError:
+                    # Fichero a medio escribir o con errores: se conserva la versión anterior.
+                    continue
+                changed = True
+            if not (changed or not self._docs):
+                return False
+            try:
+                indexes = self._build({rel: doc for rel, (_, doc) in docs.items()})
+            except Exception:
+                if not self._docs:
+                    raise
+                # Suele llegar desde el hilo del vigilante: nadie más vería la excepción
+                log.exception("Contenido: cambio descartado, se mantiene la revisión %d", self.revision)
+                return False
+            # Solo ahora, con todo validado y construido, se sustituyen la instantánea y los índices
+            self._docs = docs
+            for name, value in indexes.items():
+                setattr(self, name, value)
+            self.revision += 1
+            return changed
+
+    @staticmethod
+    def _check_guide(rel: str, doc) -> None:
+        if not isinstance(doc, dict):
+            raise ValueError(f"{rel}: se esperaba un objeto")
+        if doc.get("section") not in SECTIONS:
+            raise ValueError(f"{rel}: sección {doc.get('section')!r} desconocida")
+        if "id" in doc and (not isinstance(doc["id"], str) or not doc["id"]):
+            raise ValueError(f"{rel}: el id debe ser un texto no vacío")
+        if not isinstance(doc.get("title"), str) or not doc["title"]:
+            raise ValueError(f"{rel}: falta el título")
+        steps = doc.get("steps")
+        if not isinstance(steps, list) or not steps or not all(isinstance(x, str) for x in steps):
+            raise ValueError(f"{rel}: los pasos deben ser una lista de textos no vacía")
+
+    @staticmethod
+    def _check_pack(rel: str, doc) -> None:
+        if not isinstance(doc, dict):
+            raise ValueError(f"{rel}: se esperaba un objeto")
+        default = doc.get("default_lang", "es")
+        languages = doc.get("languages", [default])
+        if not isinstance(default, str) or not default:
+            raise ValueError(f"{rel}: default_lang debe ser un texto no vacío")
+        if not isinstance(languages, list) or not all(isinstance(x, str) and x for x in languages):
+            raise ValueError(f"{rel}: languages debe ser una lista de códigos")
+        if default not in languages:
+            raise ValueError(f"{rel}: el idioma por defecto {default!r} no está en languages")
+
+    @staticmethod
+    def _check_mapping(rel: str, doc) -> None:
+        """texts.json, apa.json: {clave: texto}."""
+        if not isinstance(doc, dict) or not all(isinstance(v, str) for v in doc.values()):
+            raise ValueError(f"{rel}: se esperaba un objeto de textos")
+
+    @staticmethod
+    def _check_media(rel: str, doc) -> None:
+        if not isinstance(doc, dict) or not all(isinstance(v, dict) for v in doc.values()):
+            raise ValueError(f"{rel}: se esperaba {{id de guía: {{images, videos}}}}")
+
+    @staticmethod
+    def _check_chat(rel: str, doc) -> None:
+        """Lo que IntentRouter necesita para compilar: si falta algo, fallaría en cada rerun."""
+        if not isinstance(doc, dict) or not isinstance(doc.get("intents"), dict):
+            raise ValueError(f"{rel}: falta el objeto intents")
+        for intent_id, spec in doc["intents"].items():
+            where = f"{rel}: intención {intent_id!r}"
+            if not isinstance(spec, dict):
+                raise ValueError(f"{where}: se esperaba un objeto")
+            keywords = spec.get("keywords")
+            # Una palabra clave vacía (o solo signos) coincidiría con cualquier mensaje
+            if not isinstance(keywords, list) or not keywords or \
+                    not all(isinstance(k, str) and normalize(k) for k in keywords):
+                raise ValueError(f"{where}: keywords debe ser una lista de textos no vacía")
+            terms = spec.get("terms", [])
+            if not isinstance(terms, list) or not all(isinstance(t, str) for t in terms):
+                raise ValueError(f"{where}: terms debe ser una lista de textos")
+            if not isinstance(spec.get("priority"), int) or isinstance(spec["priority"], bool):
+                raise ValueError(f"{where}: priority debe ser un entero")
+            if not isinstance(spec.get("reply"), str) or not spec["reply"]:
+                raise ValueError(f"{where}: falta la respuesta")
+        faq = doc.get("faq", {})
+        if not isinstance(faq, dict) or not all(isinstance(k, str) and normalize(k) and isinstance(v, str)
+                                                for k, v in faq.items()):
+            raise ValueError(f"{rel}: faq debe ser {{pregunta no vacía: respuesta}}")
+        if not isinstance(doc.get("fallback", ""), str):
+            raise ValueError(f"{rel}: fallback debe ser un texto")
+
+    def _build(self, docs: dict) -> dict:
+        """Índices del paquete `docs` ({ruta relativa: documento}) sin tocar el estado actual.
+
+        Valida todos los ficheros por el camino y lanza ValueError si algo no encaja. Los
+        documentos de `docs` no se modifican: son la instantánea que se conserva si falla.
+        """
+        checks = (
+            {"pack.json": self._check_pack, "media.json": self._check_media},  # en la raíz
+            {"texts.json": self._check_mapping, "apa.json": self._check_mapping, "chat.json": self._check_chat},
+        )
+        for rel, doc in docs.items():
+            parts = rel.split("/")
+            check = checks[len(parts) - 1].get(parts[-1]) if len(parts) <= 2 else None
+            if check is not None:
+                check(rel, doc)
+
+        pack = docs.get("pack.json", {})
+        default = pack.get("default_lang", "es")
+        languages = list(pack.get("languages", [default]))
+
+        entries = {}  # (idioma, id) -> guía
+        for rel, doc in docs.items():
+            parts = rel.split("/")
+            if len(parts) == 3 and parts[1] in SECTIONS:
+                self._check_guide(rel, doc)
+                # Sin "id" la guía se llama como su fichero; los índices de abajo leen d["id"].
+                # Copia: el documento leído sigue tal cual en la instantánea.
+                doc = {**doc, "id": doc.get("id", Path(parts[2]).stem)}
+                other = entries.get((parts[0], doc["id"]))
+                if other is not None:
+                    raise ValueError(f"{rel}: el id {doc['id']!r} ya lo usa otra guía ({other['title']!r})")
+                entries[(parts[0], doc["id"])] = doc
+
+        default_texts = docs.get(f"{default}/texts.json", {})
+        sections, titles, texts, apa, chat = {}, {}, {}, {}, {}
+        for lang in languages:
+            ids = {i for (l, i) in entries if l in (lang, default)}
+            guides = [entries.get((lang, i)) or entries[(default, i)] for i in ids]
+            guides.sort(key=lambda d: (SECTIONS.index(d["section"]), d.get("order", 0), d["title"]))
+            for section in SECTIONS:
+                sections[(lang, section)] = {d["title"]: d["steps"] for d in guides if d["section"] == section}
+            for d in guides:
+                if (lang, d["title"]) in titles:
+                    raise ValueError(f"{lang}: el título {d['title']!r} se repite en varias guías")
+                titles[(lang, d["title"])] = d["id"]
+                entries.setdefault((lang, d["id"]), d)
+            # Catálogo compilado una vez por idioma: las claves sin traducir caen al idioma por defecto.
+            texts[lang] = MappingProxyType({**default_texts, **docs.get(f"{lang}/texts.json", {})})
+            apa[lang] = docs.get(f"{lang}/apa.json") or docs.get(f"{default}/apa.json", {})
+            chat[lang] = docs.get(f"{lang}/chat.json") or docs.get(f"{default}/chat.json")
+
+        media = docs.get("media.json", {})
+        media_by_title = {
+            lang: {title: media[gid] for (l, title), gid in titles.items() if l == lang and gid in media}
+            for lang in languages
+        }
+
+        # Cada índice se sustituye entero: un rerun concurrente nunca ve uno a medio construir.
+        return {"version": pack.get("version", "0"), "default_lang": default, "languages": languages,
+                "_entries": entries, "_sections": sections, "_titles": titles, "_texts": texts,
+                "_apa": apa, "_media": media_by_title, "_chat": chat, "_media_by_id": media}
+
+    # ---------- consultas ----------
+    def _lang(self, lang: str) -> str:
+        return lang if lang in self._texts else self.default_lang
+
+    def section(self, lang: str, section: str) -> dict:
+        """Guías de una sección como {título: [pasos]} en orden de presentación."""
+        return self._sections.get((self._lang(lang), section), {})
+
+    def entry(self, lang: str, guide_id: str):
+        return self._entries.get((self._lang(lang), guide_id))
+
+    def guide_id(self, lang: str, title: str):
+        return self._titles.get((self._lang(lang), title))
+
+    def step(self, lang: str, guide_id: str, idx: int):
+        doc = self.entry(lang, guide_id)
+        if doc is None or not 0 <= idx < len(doc["steps"]):
+            return None
+        return doc["steps"][idx]
+
+    def texts(self, lang: str):
+        """Textos de la interfaz (mapeo de solo lectura, compartido por todas las sesiones)."""
+        return self._texts.get(self._lang(lang), MappingProxyType({}))
+
+    def chat(self, lang: str):
+        """Definición del chat (`<idioma>/chat.json` o la del idioma por defecto); None si no hay ninguna."""
+        return self._chat.get(self._lang(lang))
+
+    def apa(self, lang: str) -> dict:
+        return self._apa.get(self._lang(lang), {})
+
+    def media(self, lang: str) -> dict:
+        """Manifiesto de medios como {título: {"images": [...], "videos": [...]}}."""
+        return self._media.get(self._lang(lang), {})
+
+    def media_manifest(self) -> dict:
+        """Manifiesto de medios tal cual está en media.json: {id de guía: {...}}."""
+        return self._media_by_id
+
+    def add_media(self, guide_id: str, group: str, item: dict) -> bool:
+        """Añade un medio a media.json (escritura atómica) y recarga; False si ya estaba."""
+        from conrumbo.cache import atomic_write
+
+        path = self.root / "media.json"
+        with self._write_lock:
+            manifest = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+            items = manifest.setdefault(guide_id, {}).setdefault(group, [])
+            if any(i.get("path") == item["path"] for i in items):
+                return False
+            items.append(item)
+            atomic_write(path, (json.dumps(manifest, ensure_ascii=False, indent=2) + "\n").encode("utf-8"))
+        self.reload([path])
+        return True
+
+    # ---------- recarga en caliente ----------
+    def watch(self) -> bool:
+        """Vigila el paquete con watchdog y recarga solo los ficheros que cambian."""
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        store = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                store.reload([event.src_path, getattr(event, "dest_path", "") or event.src_path])
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.root), recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        return True
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
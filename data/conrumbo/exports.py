@@ -0,0 +1,210 @@
+# exports.py
+"""Guías descargables en Markdown, PDF y tarjeta PNG con QR, generadas una vez y servidas desde disco."""
+import functools
+import hashlib
+import json
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import NamedTuple
+
+from conrumbo.bundles import guide_markdown
+from conrumbo.cache import atomic_write, cache_dir
+from conrumbo.content import SECTIONS
+from conrumbo.tts import speech_text
+
+PUBLIC_URL = os.environ.get("CONRUMBO_PUBLIC_URL", "http://localhost:8501")
+FORMATS = {"md": "text/markdown", "pdf": "application/pdf", "png": "image/png"}
+APA_ID = "apa"
+
+# Lienzos: A4 a 150 ppp para el PDF, tarjeta cuadrada para compartir
+PAGE_SIZE, PAGE_MARGIN = (1240, 1754), 110
+CARD_SIZE, CARD_MARGIN = (1080, 1350), 70
+INK, ACCENT, PAPER = (33, 33, 33), (211, 47, 47), (255, 255, 255)
+
+
+class Guide(NamedTuple):
+    id: str
+    lang: str
+    section: str
+    title: str
+    lines: tuple
+    heading: str      # título del documento (textos del idioma: kit_heading, apa_title)
+    footer: str = ""  # pie junto al QR (export_footer)
+    link: str = "Abrir en ConRumbo"  # texto del enlace en Markdown (export_open)
+
+    @property
+    def url(self) -> str:
+        return f"{PUBLIC_URL.rstrip('/')}/?guide={self.id}&lang={self.lang}"
+
+    def filename(self, fmt: str) -> str:
+        if self.section == "apa":
+            return f"ConRumbo_APA.{fmt}"
+        prefix = "ConRumbo_Kit_" if self.section == "kits" else "ConRumbo_"
+        return f"{prefix}{self.title.replace(' ', '_')}.{fmt}"
+
+
+def guides(store, lang: str) -> list:
+    """Todas las guías exportables de un idioma (secciones + rutina APA), con los textos de ese idioma."""
+    texts = store.texts(lang)
+    extra = {"footer": texts.get("export_footer", ""), "link": texts.get("export_open", Guide._field_defaults["link"])}
+    kit = texts.get("kit_heading", "{title}")
+    out = [Guide(store.guide_id(lang, title), lang, section, title, tuple(steps),
+                 kit.format(title=title) if section == "kits" else title, **extra)
+           for section in SECTIONS for title, steps in store.section(lang, section).items()]
+    apa = store.apa(lang).get("text", "")
+    if apa:
+        title = texts.get("apa_title", "APA")
+        out.append(Guide(APA_ID, lang, "apa", title, tuple(apa.splitlines()), title, **extra))
+    return out
+
+
+# =========================
+# Renderizado
+# =========================
+def render_markdown(guide: Guide) -> bytes:
+    if guide.section == "apa":
+        text = f"# {guide.heading}\n\n" + "\n".join(guide.lines)
+    else:
+        text = guide_markdown(guide.heading, list(guide.lines))
+    return (text + f"\n\n[{guide.link}]({guide.url})\n").encode("utf-8")
+
+
+@functools.lru_cache(maxsize=8)
+def _font(size: int, bold: bool = False):
+    from PIL import ImageFont
+
+    names = ("DejaVuSans-Bold.ttf", "Arial Bold.ttf") if bold else ("DejaVuSans.ttf", "Arial.ttf")
+    dirs = ("", "/usr/share/fonts/truetype/dejavu/", "/Library/Fonts/", "C:/Windows/Fonts/")
+    for name in names:
+        for d in dirs:
+            try:
+                return ImageFont.truetype(d + name, size)
+            except OSError:
+                continue
+    try:
+        return ImageFont.load_default(size=size)  # Pillow >= 10.1
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _wrap(draw, text: str, font, width: int) -> list:
+    words, lines, line = text.split(), [], ""
+    for word in words:
+        candidate = f"{line} {word}".strip()
+        if draw.textlength(candidate, font=font) <= width or not line:
+            line = candidate
+        else:
+            lines.append(line)
+            line = word
+    return lines + ([line] if line else [])
+
+
+def _qr(url: str, size: int):
+    import qrcode
+    from PIL import Image
+
+    img = qrcode.make(url, border=1).get_image().convert("RGB")
+    return img.resize((size, size), Image.NEAREST)  # sin suavizado: los módulos siguen nítidos al escanear
+
+
+def _items(guide: Guide) -> list:
+    plain = [speech_text(line) for line in guide.lines if line.strip()]
+    return plain if guide.section == "apa" else [f"{i}. {line}" for i, line in enumerate(plain, 1)]
+
+
+def _pages(guide: Guide, size: tuple, margin: int, body_size: int, title_size: int, qr_size: int) -> list:
+    """Páginas con título, pasos ajustados al ancho y QR al pie de la última."""
+    from PIL import Image, ImageDraw
+
+    body, title_font, small = _font(body_size), _font(title_size, bold=True), _font(body_size * 2 // 3)
+    width = size[0] - 2 * margin
+    bottom = size[1] - margin - qr_size - 30
+    pages = []
+
+    def new_page():
+        page = Image.new("RGB", size, PAPER)
+        draw = ImageDraw.Draw(page)
+        draw.rectangle([0, 0, size[0], 18], fill=ACCENT)
+        return page, draw, margin
+
+    page, draw, y = new_page()
+    for line in _wrap(draw, guide.heading, title_font, width):
+        draw.text((margin, y), line, font=title_font, fill=ACCENT)
+        y += int(title_size * 1.25)
+    y += title_size // 2
+    for item in _items(guide):
+        wrapped = _wrap(draw, item, body, width)
+        needed = len(wrapped) * int(body_size * 1.35) + body_size // 2
+        if y + needed > bottom:
+            pages.append(page)
+            page, draw, y = new_page()
+        for line in wrapped:
+            draw.text((margin, y), line, font=body, fill=INK)
+            y += int(body_size * 1.35)
+        y += body_size // 2
+
+    qr_y = size[1] - margin - qr_size
+    page.paste(_qr(guide.url, qr_size), (size[0] - margin - qr_size, qr_y))
+    draw.text((margin, qr_y + qr_size // 3), guide.footer, font=small, fill=INK)
+    draw.text((margin, qr_y + qr_size // 3 + body_size), guide.url, font=small, fill=(110, 110, 110))
+    pages.append(page)
+    return pages
+
+
+def render_pdf(guide: Guide) -> bytes:
+    pages = _pages(guide, PAGE_SIZE, PAGE_MARGIN, body_size=34, title_size=56, qr_size=220)
+    out = BytesIO()
+    pages[0].save(out, format="PDF", resolution=150, save_all=True, append_images=pages[1:],
+                  title=guide.heading, author="ConRumbo")
+    return out.getvalue()
+
+
+def render_png(guide: Guide) -> bytes:
+    """Tarjeta para compartir: una sola imagen. Si no cabe, se usa una letra más pequeña y,
+    si aun así no cabe, una tarjeta más alta: nunca se pierde un paso."""
+    card = functools.partial(_pages, guide, margin=CARD_MARGIN, qr_size=240)
+    for body_size in (38, 32, 26, 22):
+        pages = card(CARD_SIZE, body_size=body_size, title_size=body_size * 3 // 2)
+        if len(pages) == 1:
+            break
+    height = CARD_SIZE[1]
+    while len(pages) > 1:
+        height += CARD_SIZE[1] // 4
+        pages = card((CARD_SIZE[0], height), body_size=body_size, title_size=body_size * 3 // 2)
+    out = BytesIO()
+    pages[0].save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+RENDERERS = {"md": render_markdown, "pdf": render_pdf, "png": render_png}
+
+
+# =========================
+# Caché en disco
+# =========================
+def export_path(guide: Guide, fmt: str, version: str, root: Path = None) -> Path:
+    """`<raíz>/<idioma>/<id>-<huella>.<fmt>`; la huella cubre versión del paquete, textos y enlace."""
+    manifest = json.dumps([version, guide.heading, guide.lines, guide.url, guide.footer, guide.link],
+                          ensure_ascii=False)
+    digest = hashlib.sha256(manifest.encode("utf-8")).hexdigest()[:12]
+    return (root or cache_dir("exports")) / guide.lang / f"{guide.id}-{digest}.{fmt}"
+
+
+def build(guide: Guide, fmt: str, version: str, root: Path = None):
+    """(ruta, ya estaba) del fichero exportado, renderizándolo solo si falta."""
+    path = export_path(guide, fmt, version, root)
+    if path.exists():
+        return path, True
+    atomic_write(path, RENDERERS[fmt](guide))
+    # Las versiones anteriores de la misma guía y formato ya no se sirven.
+    for old in path.parent.glob(f"{guide.id}-{'?' * 12}.{fmt}"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return path, False
+
+
+def cached(guide: Guide, fmt: str, version: str, root: Path = None):
+    """Ruta si ya está generado, None si no (sin renderizar nada)."""
+    path = export_path(guide, fmt, version, root)
+    return path if path.exists() else None
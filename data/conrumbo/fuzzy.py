@@ -0,0 +1,188 @@
+# fuzzy.py
+"""Normalización de texto e índice difuso (trigramas + distancia de edición) para el chat."""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+_NON_WORD = re.compile(r"[^0-9a-zñ]+")
+_TOKEN = re.compile(r"[0-9a-zñ]+")
+_CLEAN = re.compile(r"[0-9a-zñ]+(?: [0-9a-zñ]+)*")  # ya normalizado: minúsculas y espacios simples
+# Atajo para las letras y signos más habituales en español; el resto pasa por NFKD.
+# Solo se visitan los caracteres no ASCII: str.translate recorre el texto entero y cuesta más.
+_FOLD = dict(zip("áéíóúüàèìòùâêîôûäëïö¿¡«»“”‘’–—…", "aeiouuaeiouaeiouaeio" + " " * 11))
+_NON_ASCII = re.compile(r"[^\x00-\x7fñ]")
+
+
+def _fold(m) -> str:
+    c = m.group()
+    return _FOLD.get(c, c)
+
+
+@lru_cache(maxsize=8192)
+def normalize(text: str) -> str:
+    """Minúsculas, sin tildes ni signos y con espacios simples ("¿Atragantó?" -> "atraganto").
+
+    La ñ se conserva: "año" y "ano" no son la misma palabra. Memoizada: el chat repite
+    mucho los mismos mensajes y el router y la caché de respuestas normalizan los dos.
+    """
+    if text.isascii():
+        text = text.lower()  # lo más habitual (dictado, teclado sin tildes): ni casefold ni NFKD
+    else:
+        text = _NON_ASCII.sub(_fold, text.casefold())
+        if not text.replace("ñ", "").isascii():
+            text = text.replace("ñ", "\0")
+            text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+            text = text.replace("\0", "ñ")
+    # Sin signos ni espacios dobles ya está: comprobarlo es más barato que sustituir
+    return text if _CLEAN.fullmatch(text) else _NON_WORD.sub(" ", text).strip()
+
+
+def trigrams(term: str) -> set:
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_distance(query: str, term: str, limit: int = 3) -> int:
+    """Distancia de Levenshtein entre `query` y el prefijo de `term` que mejor encaja.
+
+    Así "atragantad" casa con "atragantamiento" y "quemadra" con "quemadura". Solo se
+    calcula la banda diagonal de ancho `limit` y, si toda una fila la supera, se corta
+    y se devuelve `limit + 1`.
+    """
+    term = term[:len(query) + limit]
+    n = len(term)
+    over = limit + 1
+    prev = [j if j <= limit else over for j in range(n + 1)]
+    before = None
+    for i in range(1, len(query) + 1):
+        qc = query[i - 1]
+        lo, hi = max(1, i - limit), min(n, i + limit)
+        row = [over] * (n + 1)
+        row[0] = i if i <= limit else over
+        best = row[0]
+        for j in range(lo, hi + 1):
+            tc = term[j - 1]
+            d = prev[j - 1] if qc == tc else prev[j - 1] + 1
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if row[j - 1] + 1 < d:
+                d = row[j - 1] + 1
+            # Transposición de letras contiguas ("respria" -> "respira").
+            if before is not None and j > 1 and qc == term[j - 2] and query[i - 2] == tc and before[j - 2] + 1 < d:
+                d = before[j - 2] + 1
+            row[j] = d if d < over else over
+            if d < best:
+                best = d
+        if best > limit:
+            return over
+        before, prev = prev, row
+    return min(prev)
+
+
+def max_distance(length: int) -> int:
+    """Errores tolerados según la longitud de la palabra consultada."""
+    if length >= 12:
+        return 3
+    if length >= 8:
+        return 2
+    return 1
+
+
+class FuzzyHit(NamedTuple):
+    intent: str
+    start: int
+    term: str
+    distance: int
+
+
+class FuzzyIndex:
+    """Índice de trigramas sobre el vocabulario de intenciones.
+
+    Los trigramas preseleccionan unos pocos candidatos y solo a esos se les calcula
+    la distancia de edición, de modo que el coste por mensaje apenas crece con el
+    tamaño del vocabulario. Los términos de varias palabras se indexan sin espacios
+    para que el dictado partido ("ata ganta") también encaje.
+    """
+
+    def __init__(self, vocabulary: dict, min_len: int = 6, max_candidates: int = 8):
+        self.min_len = min_len
+        self.max_candidates = max_candidates
+        self._terms = []    # término normalizado, sin espacios
+        self._intents = []  # intención de cada término
+        self._postings = {}  # trigrama -> índices de términos
+        seen = set()
+        # Las palabras y frases de los mensajes se repiten mucho: cada una se busca una vez por índice
+        self.lookup = lru_cache(maxsize=8192)(self.lookup)
+        self._search = lru_cache(maxsize=4096)(self._search)
+        for term, intent in vocabulary.items():
+            key = normalize(term).replace(" ", "")
+            if len(key) < min_len or key in seen:
+                continue
+            seen.add(key)
+            idx = len(self._terms)
+            self._terms.append(key)
+            self._intents.append(intent)
+            for g in trigrams(key):
+                self._postings.setdefault(g, []).append(idx)
+        # Un candidato más largo que el término más largo más 3 errores no puede casar con nada
+        self.max_len = max(map(len, self._terms), default=0) + 3
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def lookup(self, word: str):
+        """Mejor término para una palabra normalizada: (término, intención, distancia) o None."""
+        if len(word) < self.min_len - 1:
+            return None
+        grams = trigrams(word)
+        counts = {}
+        for g in grams:
+            for idx in self._postings.get(g, ()):
+                counts[idx] = counts.get(idx, 0) + 1
+        # Con k errores se pierden como mucho 3·k trigramas; por debajo no merece la pena medir.
+        limit = max_distance(len(word))
+        floor = max(1, len(grams) - 3 * limit - 2)
+        ranked = sorted((idx for idx, n in counts.items() if n >= floor), key=counts.get, reverse=True)
+        best = None
+        for idx in ranked[:self.max_candidates]:
+            term = self._terms[idx]
+            # Un prefijo demasiado corto no basta: "norte" no debe casar con "norespira".
+            if len(term) < len(word) - limit or len(word) < 0.6 * len(term):
+                continue
+            dist = prefix_distance(word, term, limit)
+            if dist <= limit and (best is None or dist < best[2]):
+                best = (term, self._intents[idx], dist)
+                if dist == 0:
+                    break
+        return best
+
+    def search(self, normalized: str) -> list:
+        """Coincidencias en un texto ya normalizado; prueba palabras sueltas y grupos de 2 y 3."""
+        # Los números ("112", la hora dictada) no son parte de ningún término: fuera de la
+        # clave, así "no sé qué hacer 14 35" reutiliza lo calculado para "no sé qué hacer".
+        tokens = [m for m in _TOKEN.finditer(normalized) if not m.group().isdigit()]
+        return [FuzzyHit(intent, tokens[i].start(), term, dist)
+                for intent, i, term, dist in self._search(tuple(m.group() for m in tokens))]
+
+    def _search(self, words: tuple) -> tuple:
+        """(intención, índice de la primera palabra, término, distancia) por intención."""
+        shortest, longest = self.min_len - 1, self.max_len
+        hits = {}
+        for i, word in enumerate(words):
+            for j in range(i, min(i + 3, len(words))):
+                if j > i:
+                    word += words[j]
+                elif len(word) < shortest:
+                    continue  # una palabra corta suelta no, pero sí unida a la siguiente
+                if len(word) > longest:
+                    break
+                if len(word) < shortest:
+                    continue
+                found = self.lookup(word)
+                if found is None:
+                    continue
+                term, intent, dist = found
+                if intent not in hits or dist < hits[intent][3]:
+                    hits[intent] = (intent, i, term, dist)
+        return tuple(hits.values())
@@ -0,0 +1,56 @@
+# i18n.py
+"""Idiomas: códigos de voz por locale y un router de chat por idioma, construido al primer uso.
+
+Los textos de la interfaz los compila `ContentStore` (un dict inmutable por idioma,
+con las claves que falten tomadas del idioma por defecto). Todo lo de aquí es por
+proceso: una sesión solo guarda su código de idioma.
+"""
+import threading
+from typing import NamedTuple
+
+from conrumbo.router import IntentRouter
+
+
+class Locale(NamedTuple):
+    code: str
+    bcp47: str        # Web Speech API del navegador (lectura y dictado)
+    gtts_lang: str    # gTTS en servidor
+    gtts_tld: str     # acento de gTTS
+    vosk_model: str   # carpeta del modelo Vosk bajo models/
+
+
+LOCALES = {
+    "es": Locale("es", "es-ES", "es", "es", "vosk-es"),
+    "en": Locale("en", "en-GB", "en", "co.uk", "vosk-en"),
+}
+
+
+def locale(code: str) -> Locale:
+    """Datos de voz del idioma; uno no listado usa su código tal cual."""
+    return LOCALES.get(code) or Locale(code, code, code, "com", f"vosk-{code}")
+
+
+class Routers:
+    """Un IntentRouter por idioma a partir de `<idioma>/chat.json`, creado la primera vez que se pide.
+
+    Cambiar de idioma reutiliza el ya construido; solo se rehace si cambia el paquete.
+    Un idioma sin chat.json usa el del idioma por defecto, como el resto del contenido.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._routers = {}  # idioma -> (revisión, IntentRouter)
+
+    def __call__(self, lang: str) -> IntentRouter:
+        cached = self._routers.get(lang)
+        if cached is not None and cached[0] == self.store.revision:
+            return cached[1]
+        with self._lock:
+            cached = self._routers.get(lang)
+            revision = self.store.revision
+            if cached is None or cached[0] != revision:
+                spec = self.store.chat(lang) or {"intents": {}}
+                router = IntentRouter(spec["intents"], spec.get("faq", {}), fallback=spec.get("fallback", ""))
+                cached = self._routers[lang] = (revision, router)
+            return cached[1]
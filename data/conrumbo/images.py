@@ -0,0 +1,75 @@
+# images.py
+"""Miniaturas y anchos responsivos de las imágenes de las guías, cacheados en disco."""
+from io import BytesIO
+from pathlib import Path
+
+from conrumbo.cache import atomic_write, cache_dir, file_hash
+
+WIDTHS = (320, 640, 1280)
+DEFAULT_WIDTH = 640  # columnas de la guía en móvil y escritorio (con pantallas 2x)
+
+_format = None
+
+
+def output_format() -> str:
+    """WebP si Pillow sabe escribirlo; si no, JPEG."""
+    global _format
+    if _format is None:
+        from PIL import features
+        _format = "webp" if features.check("webp") else "jpeg"
+    return _format
+
+
+def pick_width(display_px: int) -> int:
+    """El ancho más pequeño que cubre `display_px` (o el mayor disponible)."""
+    for w in WIDTHS:
+        if w >= display_px:
+            return w
+    return WIDTHS[-1]
+
+
+def variant_path(digest: str, width: int, fmt: str = None) -> Path:
+    fmt = fmt or output_format()
+    return cache_dir("images") / digest[:2] / f"{digest}-{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+
+def render_variant(data, width: int, fmt: str = None) -> bytes:
+    """Redimensiona (sin ampliar) una imagen dada como ruta o bytes."""
+    from PIL import Image, ImageOps
+
+    fmt = fmt or output_format()
+    with Image.open(BytesIO(data) if isinstance(data, bytes) else data) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        if fmt == "jpeg" and im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        out = BytesIO()
+        if fmt == "webp":
+            im.save(out, format="WEBP", quality=80, method=4)
+        else:
+            im.save(out, format="JPEG", quality=80, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def derivative(path, width: int = DEFAULT_WIDTH, digest: str = None):
+    """Ruta de la variante de `path` a `width` px, generándola al primer uso; None si no se puede."""
+    try:
+        target = variant_path(digest or file_hash(path), width)
+        if not target.exists():
+            atomic_write(target, render_variant(path, width))
+        return target
+    except Exception:
+        return None  # sin Pillow, formato no soportado o fichero ilegible: se usa el original
+
+
+def build_variants(path) -> bool:
+    """Genera todos los anchos de una imagen; True si ya estaban todos en caché."""
+    digest = file_hash(path)
+    hit = True
+    for width in WIDTHS:
+        target = variant_path(digest, width)
+        if not target.exists():
+            hit = False
+            atomic_write(target, render_variant(path, width))
+    return hit
@@ -0,0 +1,199 @@
+# media.py
+"""Índice de medios: cada entrada del manifiesto resuelta una vez a un registro tipado."""
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from conrumbo.cache import file_hash
+
+KINDS = {"images": "image", "videos": "video"}
+
+
+class MediaRecord(NamedTuple):
+    title: str
+    kind: str             # "image" | "video"
+    source: str           # "local" | "remote" | "missing"
+    path: str = ""
+    url: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+    mime: str = ""
+    sha256: str = ""
+    problem: str = ""     # descripción legible si algo no cuadra (extensión, tipo, fichero...)
+
+
+class MediaEntry(NamedTuple):
+    images: tuple
+    videos: tuple
+
+    @property
+    def images_ok(self) -> int:
+        return sum(r.source != "missing" for r in self.images)
+
+    @property
+    def videos_ok(self) -> int:
+        return sum(r.source != "missing" for r in self.videos)
+
+    @property
+    def complete(self) -> bool:
+        return self.images_ok == len(self.images) and self.videos_ok == len(self.videos)
+
+    def local_files(self) -> list:
+        """(nombre en el ZIP, ruta, tamaño, mtime_ns) de los ficheros locales, para los ZIP."""
+        return [(f"{kind}/{os.path.basename(r.path)}", r.path, r.size, r.mtime_ns)
+                for kind, records in (("images", self.images), ("videos", self.videos))
+                for r in records if r.source == "local"]
+
+
+EMPTY = MediaEntry((), ())
+
+
+def sniff_mime(path: str) -> str:
+    """Tipo MIME por contenido (python-magic); si no está disponible, por extensión."""
+    try:
+        import magic
+        return magic.from_file(path, mime=True)
+    except Exception:
+        return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def resolve(item: dict, kind: str) -> MediaRecord:
+    title = item.get("title", "")
+    url, path = item.get("url") or "", item.get("path") or ""
+    if url:
+        return MediaRecord(title, kind, "remote", path=path, url=url)
+    if not path:
+        return MediaRecord(title, kind, "missing", problem="sin ruta ni URL")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return MediaRecord(title, kind, "missing", path=path, problem=f"no existe {path}")
+    mime = sniff_mime(path)
+    expected = mimetypes.guess_type(path)[0] or ""
+    problem = ""
+    if not mime.startswith(kind + "/"):
+        problem = f"{path} es {mime}, no un {kind}"
+    elif expected and expected != mime:
+        problem = f"la extensión de {path} indica {expected} pero el contenido es {mime}"
+    return MediaRecord(title, kind, "local", path=path, size=st.st_size, mtime_ns=st.st_mtime_ns,
+                       mime=mime, sha256=file_hash(path), problem=problem)
+
+
+def _by_digest(entries: dict) -> dict:
+    """{sha256: registro local} para `MediaIndex.find`; ante duplicados, el primero."""
+    out = {}
+    for e in entries.values():
+        for r in (*e.images, *e.videos):
+            if r.source == "local":
+                out.setdefault(r.sha256, r)
+    return out
+
+
+class MediaIndex:
+    """Manifiesto de medios resuelto por id de guía y consultable por título en cada rerun.
+
+    Se reconstruye entero solo cuando cambia la revisión del paquete de contenidos; los
+    cambios en los ficheros (vigilados con watchdog) re-resuelven únicamente esas rutas.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._revision = None
+        self._entries = {}   # id de guía -> MediaEntry
+        self._by_path = {}   # ruta -> ids de guía que la usan
+        self._by_digest = {}  # sha256 -> MediaRecord local (lo que pide el servidor de medios)
+        self._observer = None
+        self._sync()
+
+    def _sync(self) -> None:
+        if self.store.revision == self._revision:
+            return
+        with self._lock:
+            if self.store.revision == self._revision:
+                return
+            revision = self.store.revision
+            entries, by_path = {}, {}
+            for gid, media in self.store.media_manifest().items():
+                entries[gid] = MediaEntry(*(
+                    tuple(resolve(item, KINDS[group]) for item in media.get(group, []))
+                    for group in ("images", "videos")))
+                for group in ("images", "videos"):
+                    for item in media.get(group, []):
+                        if item.get("path"):
+                            by_path.setdefault(os.path.normpath(item["path"]), set()).add(gid)
+            self._entries, self._by_path, self._by_digest = entries, by_path, _by_digest(entries)
+            self._revision = revision
+
+    # ---------- consultas ----------
+    def entry(self, lang: str, title: str) -> MediaEntry:
+        self._sync()
+        return self._entries.get(self.store.guide_id(lang, title), EMPTY)
+
+    def entries(self, lang: str) -> dict:
+        """{título: MediaEntry} en el orden del manifiesto del idioma."""
+        self._sync()
+        return {title: self.entry(lang, title) for title in self.store.media(lang)}
+
+    def find(self, digest: str):
+        """Registro local con ese sha256 (el del servidor de medios) o None."""
+        self._sync()
+        return self._by_digest.get(digest)
+
+    def problems(self) -> list:
+        self._sync()
+        return [r for e in self._entries.values() for r in (*e.images, *e.videos) if r.problem]
+
+    # ---------- actualización incremental ----------
+    def refresh(self, paths) -> bool:
+        """Re-resuelve solo las entradas que usan alguna de esas rutas."""
+        self._sync()
+        cwd = Path.cwd()
+        gids = set()
+        for p in paths:
+            p = Path(p)
+            rel = os.path.normpath(p.relative_to(cwd) if p.is_absolute() and cwd in p.parents else p)
+            gids |= self._by_path.get(rel, set())
+        if not gids:
+            return False
+        manifest = self.store.media_manifest()
+        with self._lock:
+            entries = dict(self._entries)
+            for gid in gids:
+                media = manifest.get(gid, {})
+                entries[gid] = MediaEntry(*(
+                    tuple(resolve(item, KINDS[group]) for item in media.get(group, []))
+                    for group in ("images", "videos")))
+            self._entries, self._by_digest = entries, _by_digest(entries)
+        return True
+
+    def watch(self) -> bool:
+        """Vigila las carpetas raíz de los medios locales (p. ej. assets/)."""
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+        roots = {Path(p).parts[0] for p in self._by_path if not os.path.isabs(p)}
+        roots = sorted(r for r in roots if os.path.isdir(r))
+        if not roots:
+            return False
+
+        index = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    index.refresh([event.src_path, getattr(event, "dest_path", "") or event.src_path])
+
+        observer = Observer()
+        for root in roots:
+            observer.schedule(_Handler(), root, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        return True
@@ -0,0 +1,226 @@
+# media_server.py
+"""Servidor de vídeos de las guías: peticiones Range, ETag/Last-Modified y envío con sendfile.
+
+st.video(ruta) lee el fichero entero y lo reparte por el gestor de medios de Streamlit. Este
+servidor (asyncio, sin dependencias) deja que el navegador pida solo los tramos que reproduce
+o a los que salta, responde 304 a lo que ya tiene y copia del fichero al socket en el núcleo
+(os.sendfile), sin pasar los bytes por Python ni guardarlos en memoria.
+
+Las URL llevan el sha256 del original: /media/<sha256>/<orig|360p|720p>.mp4
+Los ZIP de material por escenario (bundles.py) se descargan de /bundles/<nombre>.zip.
+"""
+import asyncio
+import hmac
+import json
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from conrumbo.video import RENDITIONS, rendition_path
+
+MAX_HEADER = 16 * 1024
+KEEPALIVE = 15            # segundos de espera a la siguiente petición de una conexión
+CHUNK = 256 * 1024        # solo sin sendfile
+ROUTE = re.compile(r"^/media/([0-9a-f]{64})/(\w+)(?:\.\w+)?$")
+BUNDLE_ROUTE = re.compile(r"^/bundles/([a-z0-9-]+-[0-9a-f]{16})\.zip$")
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+REASONS = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable"}
+
+
+def byte_range(value: str, size: int):
+    """(inicio, fin) inclusivos de un Range de un solo tramo.
+
+    None si no hay cabecera o no se entiende (se sirve el fichero entero, como permite la
+    RFC 9110; también con varios tramos) y False si el tramo cae fuera del fichero (416).
+    """
+    m = RANGE.match(value or "")
+    if not m or m.groups() == ("", ""):
+        return None
+    first, last = m.groups()
+    if not first:  # sufijo: los últimos N bytes
+        n = int(last)
+        return (max(size - n, 0), size - 1) if n and size else False
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _http_date(value: str):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def not_modified(headers: dict, etag: str, mtime: float) -> bool:
+    """If-None-Match manda sobre If-Modified-Since (comparación débil de ETag)."""
+    if "if-none-match" in headers:
+        tags = [t.strip().removeprefix("W/") for t in headers["if-none-match"].split(",")]
+        return "*" in tags or etag in tags
+    since = _http_date(headers.get("if-modified-since"))
+    return since is not None and int(mtime) <= since
+
+
+def range_applies(headers: dict, etag: str, mtime: float) -> bool:
+    """If-Range: el tramo solo vale si el cliente tiene la misma versión (ETag fuerte o fecha)."""
+    value = headers.get("if-range")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == etag
+    since = _http_date(value)
+    return since is not None and int(mtime) <= since
+
+
+class MediaServer:
+    """HTTP/1.1 mínimo (GET/HEAD con keep-alive) sobre asyncio.
+
+    `resolve(sha256, variante)` devuelve la ruta del fichero o None; así el servidor solo
+    entrega lo que está en el manifiesto de medios y nunca una ruta que venga en la URL.
+    `bundles` es la carpeta de los ZIP por escenario; solo se sirven nombres con la forma que
+    les da bundle_path(), nunca rutas arbitrarias. Sin carpeta, /bundles da 404.
+    /stats solo responde con `Authorization: Bearer <stats_token>`; sin token, 404 para todos.
+    """
+
+    def __init__(self, resolve, sendfile: bool = True, stats_token: str = "", bundles=None):
+        self.resolve = resolve
+        self.bundles = bundles
+        self.sendfile = sendfile
+        self.stats_token = stats_token
+        self.stats = {"connections": 0, "active": 0, "requests": 0, "bytes": 0, "status": {}}
+
+    # ---------- respuesta ----------
+    def respond(self, method: str, path: str, headers: dict) -> tuple:
+        """(estado, cabeceras, cuerpo); el cuerpo son bytes o (ruta, desplazamiento, longitud)."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        if path == "/health":
+            return 200, {"Content-Type": "text/plain"}, b"ok"
+        if path == "/stats" and self._authorized(headers):
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.stats).encode()
+        m = ROUTE.match(path)
+        b = BUNDLE_ROUTE.match(path) if self.bundles is not None else None
+        if m:
+            file, tag = self.resolve(*m.groups()), f"{m.group(1)[:16]}-{m.group(2)}"
+        elif b:
+            file, tag = self.bundles / f"{b.group(1)}.zip", b.group(1)
+        else:
+            file = None
+        try:
+            st = os.stat(file) if file else None
+        except OSError:
+            st = None
+        if st is None:
+            return 404, {"Content-Type": "text/plain"}, b"no encontrado"
+
+        size = st.st_size
+        etag = f'"{tag}-{st.st_mtime_ns:x}-{size:x}"'
+        headers_out = {
+            "ETag": etag,
+            "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "public, max-age=86400",
+        }
+        if b:
+            headers_out["Content-Disposition"] = f'attachment; filename="{b.group(1)}.zip"'
+        if not_modified(headers, etag, st.st_mtime):
+            return 304, headers_out, b""
+        headers_out["Content-Type"] = mimetypes.guess_type(str(file))[0] or "application/octet-stream"
+        span = byte_range(headers.get("range"), size) if range_applies(headers, etag, st.st_mtime) else None
+        if span is False:
+            return 416, {**headers_out, "Content-Range": f"bytes */{size}"}, b""
+        if span is None:
+            return 200, headers_out, (file, 0, size)
+        start, end = span
+        return 206, {**headers_out, "Content-Range": f"bytes {start}-{end}/{size}"}, (file, start, end - start + 1)
+
+    def _authorized(self, headers: dict) -> bool:
+        if not self.stats_token:
+            return False
+        given = headers.get("authorization", "").encode("latin-1")
+        return hmac.compare_digest(given, f"Bearer {self.stats_token}".encode("latin-1"))
+
+    # ---------- conexión ----------
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        self.stats["active"] += 1
+        try:
+            while await self._request(reader, writer):
+                pass
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            # Cliente que se va a mitad de un vídeo, cabeceras enormes o conexión ociosa
+            pass
+        finally:
+            self.stats["active"] -= 1
+            writer.close()
+
+    async def _request(self, reader, writer) -> bool:
+        """Atiende una petición; False si hay que cerrar la conexión."""
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE)
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3:
+            await self._send(writer, "GET", 400, {"Connection": "close"}, b"")
+            return False
+        method, target, version = parts
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        self.stats["requests"] += 1
+        status, out, body = self.respond(method, target.split("?", 1)[0], headers)
+        out["Connection"] = "keep-alive" if keep else "close"
+        await self._send(writer, method, status, out, body)
+        return keep
+
+    async def _send(self, writer, method: str, status: int, headers: dict, body) -> None:
+        length = body[2] if isinstance(body, tuple) else len(body)
+        if status != 304:
+            headers["Content-Length"] = str(length)
+        head = f"HTTP/1.1 {status} {REASONS[status]}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n")
+        self.stats["status"][status] = self.stats["status"].get(status, 0) + 1
+        if method == "HEAD" or status == 304 or not length:
+            await writer.drain()
+            return
+        if not isinstance(body, tuple):
+            writer.write(body)
+        else:
+            file, offset, count = body
+            await writer.drain()
+            with open(file, "rb") as f:
+                if self.sendfile:
+                    # Del page cache al socket sin copiar a Python (con TLS o sin sendfile, asyncio lee y escribe)
+                    await asyncio.get_running_loop().sendfile(writer.transport, f, offset, count)
+                else:
+                    f.seek(offset)
+                    while count > 0 and (chunk := f.read(min(CHUNK, count))):
+                        writer.write(chunk)
+                        count -= len(chunk)
+                        await writer.drain()
+        await writer.drain()
+        self.stats["bytes"] += length
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8502) -> None:
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+
+def index_resolver(index, uploads=None):
+    """resolve() sobre el índice de medios (y el almacén de subidas): original o versión generada."""
+    def resolve(digest: str, name: str):
+        rec = index.find(digest) or (uploads.get(digest) if uploads is not None else None)
+        if rec is None:
+            return None
+        if name == "orig":
+            return rec.path
+        return rendition_path(digest, name) if name in RENDITIONS else None
+    return resolve
@@ -0,0 +1,237 @@
+# profiling.py
+"""Medición de reruns: tiempos por sección, percentiles móviles y contadores de E/S y bytes enviados.
+
+Se activa con CONRUMBO_PROFILE=1. Desactivado, `section` devuelve un contexto vacío
+compartido, `timed` deja la función intacta y `count` vuelve en la primera línea.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from conrumbo.cache import atomic_write
+
+ENABLED = os.environ.get("CONRUMBO_PROFILE", "0") == "1"
+DUMP_PATH = os.environ.get("CONRUMBO_PROFILE_DUMP", "")  # JSON del proceso, reescrito cada DUMP_EVERY reruns
+DUMP_EVERY = 20
+WINDOW = 512  # muestras por histograma: los percentiles reflejan los últimos reruns, no toda la vida del proceso
+
+
+class Histogram:
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self, window: int = WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, ms: float) -> None:
+        self.samples.append(ms)
+        self.count += 1
+        self.total += ms
+
+    def summary(self) -> dict:
+        data = sorted(self.samples)
+        if not data:
+            return {"n": 0}
+        pick = lambda q: data[min(len(data) - 1, int(q * len(data)))]
+        return {"n": self.count, "mean": round(self.total / self.count, 3), "p50": round(pick(0.50), 3),
+                "p95": round(pick(0.95), 3), "p99": round(pick(0.99), 3), "max": round(data[-1], 3)}
+
+
+class Stats:
+    """Histogramas por sección y contadores; hay uno por proceso y uno por sesión."""
+
+    def __init__(self):
+        self.sections = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float) -> None:
+        with self._lock:
+            hist = self.sections.get(name)
+            if hist is None:
+                hist = self.sections[name] = Histogram()
+            hist.add(ms)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"sections": {k: h.summary() for k, h in sorted(self.sections.items())},
+                    "counters": dict(sorted(self.counters.items()))}
+
+
+PROCESS = Stats()
+_local = threading.local()  # Stats de la sesión cuyo script corre en este hilo
+_reruns = 0
+
+
+def current():
+    return getattr(_local, "stats", None)
+
+
+def record(name: str, ms: float) -> None:
+    PROCESS.record(name, ms)
+    stats = current()
+    if stats is not None:
+        stats.record(name, ms)
+
+
+def count(name: str, n: int = 1) -> None:
+    if not ENABLED:
+        return
+    PROCESS.count(name, n)
+    stats = current()
+    if stats is not None:
+        stats.count(name, n)
+
+
+# =========================
+# Secciones y funciones
+# =========================
+class _Section:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+_NULL = contextlib.nullcontext()
+
+
+def section(name: str):
+    """`with section("tab.chat"):` mide el bloque en ms."""
+    return _Section(name) if ENABLED else _NULL
+
+
+def timed(name: str = None):
+    """Decorador equivalente a `section`; desactivado devuelve la función sin envolver."""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Section(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# =========================
+# Rerun completo
+# =========================
+def _proc_io():
+    """(bytes leídos, bytes escritos) del proceso según /proc; None fuera de Linux."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# ScriptRunContext._enqueue y MediaFileManager.add son internos de Streamlit: solo se envuelven
+# en las versiones en las que se han comprobado y si siguen ahí. En otra versión faltan los
+# contadores frontend_* y media_bytes; el resto de la medición no cambia.
+FRONTEND_HOOK_VERSIONS = ((1, 30), (2, 0))  # [desde, hasta)
+
+
+def _frontend_hookable() -> bool:
+    import streamlit
+
+    try:
+        version = tuple(int(p) for p in streamlit.__version__.split(".")[:2])
+    except (AttributeError, ValueError):
+        return False
+    low, high = FRONTEND_HOOK_VERSIONS
+    return low <= version < high
+
+
+def _hook_frontend() -> None:
+    """Cuenta los ForwardMsg y los medios (imágenes, audio, descargas) que salen hacia el navegador."""
+    if not _frontend_hookable():
+        return
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        media = get_instance().media_file_mgr
+    except Exception:
+        return
+    enqueue = getattr(ctx, "_enqueue", None)
+    if callable(enqueue) and not getattr(enqueue, "_counted", False):
+        def counted_enqueue(msg):
+            count("frontend_msgs")
+            count("frontend_bytes", msg.ByteSize())
+            return enqueue(msg)
+        counted_enqueue._counted = True
+        ctx._enqueue = counted_enqueue
+    add = getattr(media, "add", None)
+    if callable(add) and not getattr(add, "_counted", False):
+        def counted_add(path_or_data, *args, **kwargs):
+            if isinstance(path_or_data, (bytes, bytearray)):
+                count("media_bytes", len(path_or_data))
+            elif isinstance(path_or_data, str) and os.path.isfile(path_or_data):
+                count("media_bytes", os.path.getsize(path_or_data))
+            return add(path_or_data, *args, **kwargs)
+        counted_add._counted = True
+        media.add = counted_add
+
+
+def begin_rerun(state) -> None:
+    """Al principio del script: asocia las mediciones de este hilo a la sesión."""
+    if not ENABLED:
+        return
+    if "_profile" not in state:
+        state["_profile"] = Stats()
+    _local.stats = state["_profile"]
+    _local.io = _proc_io()
+    _hook_frontend()
+    _local.t0 = time.perf_counter()
+
+
+def end_rerun() -> None:
+    """Al final del script: tiempo total, E/S del proceso durante el rerun y volcado periódico."""
+    global _reruns
+    if not ENABLED or getattr(_local, "t0", None) is None:
+        return
+    record("rerun", (time.perf_counter() - _local.t0) * 1000)
+    count("reruns")
+    io = _proc_io()
+    if io and _local.io:
+        # Incluye lo que hicieron otras sesiones a la vez: es una cota superior.
+        count("proc_read_bytes", io[0] - _local.io[0])
+        count("proc_write_bytes", io[1] - _local.io[1])
+    _local.t0 = None
+    _reruns += 1
+    if DUMP_PATH and _reruns % DUMP_EVERY == 0:
+        dump(DUMP_PATH)
+
+
+def report(state=None) -> dict:
+    out = {"pid": os.getpid(), "time": time.time(), "process": PROCESS.snapshot()}
+    if state is not None and "_profile" in state:
+        out["session"] = state["_profile"].snapshot()
+    return out
+
+
+def dump(path) -> None:
+    atomic_write(Path(path), json.dumps(report(), indent=2).encode("utf-8"))
@@ -0,0 +1,263 @@
+# progress.py
+"""Progreso por módulos: bits de un entero en la sesión y SQLite para que sobreviva a recargas."""
+import atexit
+import csv
+import enum
+import io
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+
+class Module(enum.IntFlag):
+    EMERGENCIAS = 1
+    PRIMEROS_AUX = 2
+    KITS = 4
+    APA = 8
+    SIMULACRO = 16
+
+
+ALL = (Module.EMERGENCIAS, Module.PRIMEROS_AUX, Module.KITS, Module.APA, Module.SIMULACRO)
+# Sin textos de la interfaz (exportaciones por defecto) cada módulo se nombra por su id
+IDS = {m: m.name.lower() for m in ALL}
+
+
+def labels(texts) -> dict:
+    """{módulo: nombre} en el idioma de `texts` (claves `module_<id>` de texts.json)."""
+    return {m: texts.get(f"module_{IDS[m]}", IDS[m]) for m in ALL}
+
+
+def done(bits: int) -> list:
+    return [m for m in ALL if bits & m]
+
+
+# =========================
+# Persistencia (SQLite en WAL con escritura diferida)
+# =========================
+DB_PATH = Path(os.environ.get("CONRUMBO_PROGRESS_DB") or Path(__file__).resolve().parent.parent / ".state" / "progress.sqlite3")
+FLUSH_SECONDS = 1.0
+FLUSH_ROWS = 500
+_USER_ID = re.compile(r"[0-9a-f]{32}")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user_id    TEXT    NOT NULL,
+    module     INTEGER NOT NULL,
+    done       INTEGER NOT NULL,
+    updated_at REAL    NOT NULL,
+    PRIMARY KEY (user_id, module)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS progress_module ON progress (module, done);
+"""
+UPSERT = ("INSERT INTO progress (user_id, module, done, updated_at) VALUES (?, ?, ?, ?) "
+          "ON CONFLICT (user_id, module) DO UPDATE SET done = excluded.done, updated_at = excluded.updated_at")
+
+
+def new_user_id() -> str:
+    """Id anónimo: no deriva de nada del usuario, solo identifica su progreso."""
+    return uuid.uuid4().hex
+
+
+def valid_user_id(value) -> bool:
+    return isinstance(value, str) and _USER_ID.fullmatch(value) is not None
+
+
+def _fmt(ts) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts else ""
+
+
+class ProgressStore:
+    """Progreso de todos los usuarios. Los cambios se acumulan en memoria y un hilo los
+    escribe en lote (una transacción) cada FLUSH_SECONDS o al llegar a FLUSH_ROWS filas.
+
+    Las lecturas combinan disco y cambios pendientes, así que nunca ven datos atrasados.
+    """
+
+    def __init__(self, path: Path = DB_PATH, flush_seconds: float = FLUSH_SECONDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._connect()  # solo escribe, y siempre con _flush_lock
+        self._conn.executescript(SCHEMA)
+        self._reader = self._connect()  # lecturas con _lock; en WAL no esperan al escritor
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}  # (user_id, módulo) -> (hecho, momento)
+        self._inflight = {}  # lote que flush() está confirmando: ya no pendiente, aún no en disco
+        self._wake = threading.Event()
+        self._closed = False
+        self.flush_seconds = flush_seconds
+        self._thread = threading.Thread(target=self._writer, name="progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        import sqlite3  # solo con el almacén: Module, labels y los ids se importan al arrancar sin él
+
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # en WAL basta para no corromper; se puede perder el último lote
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # ---------- escritura ----------
+    def update(self, user_id: str, old: int, new: int) -> None:
+        """Registra los módulos que cambiaron entre `old` y `new`; no toca disco."""
+        now = time.time()
+        changed = [m for m in ALL if (old ^ new) & m]
+        if not changed:
+            return
+        with self._lock:
+            for m in changed:
+                self._pending[(user_id, int(m))] = (int(bool(new & m)), now)
+            full = len(self._pending) >= FLUSH_ROWS
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Escribe los cambios pendientes en una transacción.
+
+        Con el cerrojo solo se pasa el lote de `_pending` a `_inflight` (que los lectores también
+        consultan); la transacción va fuera, así que update() y bits() no esperan a SQLite. Si
+        falla, el lote vuelve a pendientes sin pisar cambios más recientes.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+            rows = [(u, m, d, ts) for (u, m), (d, ts) in batch.items()]
+            try:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(UPSERT, rows)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            except BaseException:
+                with self._lock:
+                    for key, v in batch.items():
+                        self._pending.setdefault(key, v)
+                    self._inflight = {}
+                raise
+            with self._lock:
+                self._inflight = {}
+        return len(rows)
+
+    def _writer(self) -> None:
+        import sqlite3
+
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # se reintenta en la siguiente vuelta: los cambios siguen pendientes
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self._conn.close()
+        self._reader.close()
+
+    # ---------- lectura ----------
+    def _rows(self, user_id: str) -> dict:
+        """{módulo: (hecho, momento)} del usuario, con el lote en curso y los pendientes por encima."""
+        with self._lock:
+            rows = {m: (d, ts) for m, d, ts in self._reader.execute(
+                "SELECT module, done, updated_at FROM progress WHERE user_id = ?", (user_id,))}
+            for changes in (self._inflight, self._pending):
+                rows.update({m: v for (u, m), v in changes.items() if u == user_id})
+        return rows
+
+    def bits(self, user_id: str) -> int:
+        return sum(m for m, (d, _) in self._rows(user_id).items() if d)
+
+    # ---------- exportación ----------
+    def _iter_rows(self, chunk_rows: int = 1000):
+        """Todas las filas en orden estable, por bloques y con una conexión propia (no bloquea al escritor)."""
+        self.flush()
+        conn = self._connect()
+        try:
+            cur = conn.execute("SELECT user_id, module, done, updated_at FROM progress ORDER BY user_id, module")
+            while rows := cur.fetchmany(chunk_rows):
+                yield rows
+        finally:
+            conn.close()
+
+    def iter_csv(self, user_id: str = None, chunk_rows: int = 1000, labels: dict = IDS):
+        """CSV por trozos de bytes; sin `user_id` exporta todos los usuarios (con su id).
+
+        `labels` da el nombre de cada módulo (p. ej. en el idioma del usuario).
+        """
+        header = ["Módulo", "Completado", "Fecha"] if user_id else ["Usuario", "Módulo", "Completado", "Fecha"]
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(header)
+        if user_id:
+            # Todos los módulos, también los que nunca se tocaron
+            rows = self._rows(user_id)
+            for m in ALL:
+                d, ts = rows.get(int(m), (0, None))
+                writer.writerow([labels[m], bool(d), _fmt(ts) if d else ""])
+            yield buf.getvalue().encode("utf-8")
+            return
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        for rows in self._iter_rows(chunk_rows):
+            for u, m, d, ts in rows:
+                writer.writerow([u, labels.get(Module(m), m), bool(d), _fmt(ts) if d else ""])
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+
+    def iter_json(self, user_id: str = None, chunk_rows: int = 1000, labels: dict = IDS):
+        """Array JSON por trozos de bytes, con la misma selección que `iter_csv`."""
+        yield b"["
+        first = True
+        if user_id:
+            rows = self._rows(user_id)
+            batches = [[(user_id, int(m), *rows.get(int(m), (0, None))) for m in ALL]]
+        else:
+            batches = self._iter_rows(chunk_rows)
+        for rows in batches:
+            parts = []
+            for u, m, d, ts in rows:
+                item = {"module": labels.get(Module(m), m), "done": bool(d), "completed_at": _fmt(ts) if d else None}
+                if not user_id:
+                    item = {"user": u, **item}
+                parts.append(("" if first else ",") + json.dumps(item, ensure_ascii=False))
+                first = False
+            yield "".join(parts).encode("utf-8")
+        yield b"]"
+
+    def summary(self, labels: dict = IDS) -> dict:
+        """Agregados para analítica, calculados en SQLite: usuarios y tasa de finalización por módulo."""
+        self.flush()
+        conn = self._connect()
+        try:
+            users = conn.execute("SELECT COUNT(DISTINCT user_id) FROM progress").fetchone()[0]
+            per_module = {labels.get(Module(m), m): {"completed": c, "rate": c / users if users else 0.0}
+                          for m, c in conn.execute(
+                              "SELECT module, SUM(done) FROM progress GROUP BY module ORDER BY module")}
+            full = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT user_id FROM progress WHERE done = 1 "
+                "GROUP BY user_id HAVING COUNT(*) = ?)", (len(ALL),)).fetchone()[0]
+            per_day = dict(conn.execute(
+                "SELECT date(updated_at, 'unixepoch', 'localtime') AS day, COUNT(*) FROM progress "
+                "WHERE done = 1 GROUP BY day ORDER BY day"))
+        finally:
+            conn.close()
+        return {"users": users, "all_modules": full, "modules": per_module, "completions_per_day": per_day}
@@ -0,0 +1,201 @@
+# retrieval.py
+"""Búsqueda en los pasos de todas las guías y kits para las preguntas libres del chat.
+
+Cada paso es un documento representado por n-gramas de caracteres (3 y 4, dentro de cada
+palabra) y palabras enteras, con TF-IDF y norma euclídea 1, hasheados en DIM columnas con crc32
+(estable entre procesos). La matriz se guarda por columnas (formato CSC: `indptr`, `rows`,
+`weights`) en ficheros .npy que se abren con mmap: varios procesos comparten las mismas
+páginas y arrancar no lee nada hasta la primera consulta.
+
+Una consulta copia las listas de sus columnas (tramos contiguos) y suma por fila con
+np.bincount: una pasada vectorizada, sin bucles por documento, que lee como mucho
+MAX_POSTINGS entradas empezando por las columnas más raras. numpy se importa al usarse.
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from conrumbo.cache import cache_dir
+from conrumbo.fuzzy import normalize
+
+DIM = 1 << 18
+NGRAMS = (3, 4)
+TOP_K = 3
+MIN_SCORE = 0.22     # por debajo, el paso no responde a la pregunta (coseno)
+MAX_DF = 0.5         # columnas presentes en más de esta fracción de pasos no se consultan
+MAX_POSTINGS = 1 << 16  # entradas leídas como mucho por consulta (acota la latencia con índices grandes)
+SECTIONS = ("emergencias", "primeros_aux", "kits")
+FORMAT = 1           # súbelo si cambian las características: invalida los índices en disco
+
+
+class Hit(NamedTuple):
+    guide_id: str
+    step: int        # índice del paso (0..n-1)
+    score: float
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_columns(word: str) -> tuple:
+    """La palabra entera y sus n-gramas; el vocabulario se repite mucho entre pasos."""
+    padded = f" {word} ".encode()
+    return (zlib.crc32(b"w:" + word.encode()) % DIM,
+            *(zlib.crc32(padded[i:i + n]) % DIM for n in NGRAMS for i in range(len(padded) - n + 1)))
+
+
+def features(text: str) -> Counter:
+    """Columnas hasheadas de un texto y su frecuencia."""
+    counts = Counter()
+    for word in normalize(text).split():
+        counts.update(_word_columns(word))
+    return counts
+
+
+def _weights(counts: Counter, idf) -> tuple:
+    """(columnas, pesos) TF-IDF sublineal con norma euclídea 1."""
+    cols = sorted(counts)
+    w = [(1 + math.log(counts[c])) * float(idf[c]) for c in cols]
+    norm = math.sqrt(sum(x * x for x in w)) or 1.0
+    return cols, [x / norm for x in w]
+
+
+def build(docs: list, path: Path) -> Path:
+    """Escribe el índice de `docs` [(id de guía, paso, texto)] en la carpeta `path`."""
+    import numpy as np
+
+    # Pares (fila, columna, frecuencia) de todos los pasos; el resto son operaciones sobre arrays
+    rows, cols, tf = [], [], []
+    for row, (_, _, text) in enumerate(docs):
+        counts = features(text)
+        rows.extend([row] * len(counts))
+        cols.extend(counts)
+        tf.extend(counts.values())
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int64)
+    df = np.bincount(cols, minlength=DIM)
+    idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+    weights = (1 + np.log(np.asarray(tf, dtype=np.float32))) * idf[cols]
+    weights /= np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(docs)))[rows].astype(np.float32)
+
+    # Filas ordenadas por columna: CSC con indptr de DIM + 1
+    order = np.argsort(cols, kind="stable")
+    indptr = np.zeros(DIM + 1, dtype=np.int64)
+    np.cumsum(df, out=indptr[1:])
+
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+    try:
+        np.save(tmp / "indptr.npy", indptr)
+        np.save(tmp / "rows.npy", rows[order])
+        np.save(tmp / "weights.npy", weights[order])
+        np.save(tmp / "idf.npy", idf)
+        np.save(tmp / "df.npy", df.astype(np.int32))
+        (tmp / "docs.json").write_text(json.dumps([[gid, step] for gid, step, _ in docs]), encoding="utf-8")
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            pass  # otro proceso lo escribió antes: vale el suyo
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return path
+
+
+class StepIndex:
+    """Índice abierto con mmap; `search` es seguro entre hilos (solo lee)."""
+
+    def __init__(self, path: Path):
+        import numpy as np
+
+        self.np = np
+        # Vista ndarray sobre el mmap: mismas páginas, sin el coste de np.memmap en cada indexado
+        load = lambda name: np.asarray(np.load(path / f"{name}.npy", mmap_mode="r"))  # noqa: E731
+        self.indptr, self.rows, self.weights = load("indptr"), load("rows"), load("weights")
+        self.idf, self.df = load("idf"), load("df")
+        self.docs = [tuple(d) for d in json.loads((path / "docs.json").read_text(encoding="utf-8"))]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def scores(self, text: str):
+        """Coseno de la consulta con todos los pasos (vector de len(self))."""
+        np = self.np
+        counts = features(text)
+        cols = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        df = self.df[cols]  # = longitud de la lista de cada columna
+        keep = (df > 0) & (df <= max(MAX_DF * len(self.docs), 1))
+        cols, df = cols[keep], df[keep]
+        # Presupuesto de trabajo: primero las columnas más raras (las que más discriminan)
+        order = np.argsort(df, kind="stable")
+        within = np.cumsum(df[order]) <= MAX_POSTINGS
+        within[:1] = True  # la más rara siempre entra
+        cols = cols[order][within]
+        if not len(cols):
+            return np.zeros(len(self.docs), dtype=np.float32)
+        cols, qw = _weights(Counter({int(c): counts[int(c)] for c in cols}), self.idf)
+        spans = [(self.indptr[c], self.indptr[c + 1]) for c in cols]
+        # Cada lista es un tramo contiguo del mmap: se copian por tramos y se suman por fila
+        rows = np.concatenate([self.rows[a:b] for a, b in spans])
+        contrib = np.concatenate([self.weights[a:b] for a, b in spans])
+        contrib *= np.repeat(np.asarray(qw, dtype=np.float32), [b - a for a, b in spans])
+        return np.bincount(rows, weights=contrib, minlength=len(self.docs))
+
+    def search(self, text: str, k: int = TOP_K, min_score: float = MIN_SCORE) -> list:
+        np = self.np
+        scores = self.scores(text)
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [Hit(*self.docs[i], float(scores[i])) for i in top if scores[i] >= min_score]
+
+
+def guide_docs(store, lang: str) -> list:
+    """(id de guía, paso, texto) de todas las guías y kits del idioma.
+
+    El título y las palabras clave de la guía ("keywords": cómo lo dice alguien asustado,
+    «sangra», «se ha cortado») van en cada paso; el texto del paso decide cuál de ellos.
+    """
+    docs = []
+    for section in SECTIONS:
+        for title, steps in store.section(lang, section).items():
+            gid = store.guide_id(lang, title)
+            keywords = ", ".join(store.entry(lang, gid).get("keywords", ()))
+            docs.extend((gid, i, f"{title}. {keywords}. {step}") for i, step in enumerate(steps))
+    return docs
+
+
+def open_index(docs: list) -> StepIndex:
+    """Índice de `docs` desde la caché de disco; se construye si no existe."""
+    digest = hashlib.sha256(json.dumps([FORMAT, DIM, NGRAMS, docs], ensure_ascii=False).encode()).hexdigest()
+    path = cache_dir("retrieval") / digest[:24]
+    if not (path / "docs.json").exists():
+        build(docs, path)
+    return StepIndex(path)
+
+
+class Retrievers:
+    """Un StepIndex por idioma, abierto la primera vez que se pide y rehecho si cambia el paquete."""
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._indexes = {}  # idioma -> (revisión, StepIndex)
+
+    def __call__(self, lang: str) -> StepIndex:
+        cached = self._indexes.get(lang)
+        if cached is not None and cached[0] == self.store.revision:
+            return cached[1]
+        with self._lock:
+            cached = self._indexes.get(lang)
+            revision = self.store.revision
+            if cached is None or cached[0] != revision:
+                cached = self._indexes[lang] = (revision, open_index(guide_docs(self.store, lang)))
+            return cached[1]
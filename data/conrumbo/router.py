@@ -0,0 +1,198 @@
+# router.py
+"""Enrutado del chat: todas las intenciones compiladas en una sola expresión regular."""
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from conrumbo.fuzzy import FuzzyIndex, normalize
+
+# =========================
+# Intenciones y FAQ
+# =========================
+# El catálogo de cada idioma está en content/<idioma>/chat.json (ver i18n.Routers):
+# "keywords" se buscan tal cual (sin tildes) al principio de una palabra del mensaje, y las que
+# terminan en espacio ("cut ") solo como palabra entera ("cut" sí, "cute" no); "terms"
+# solo alimentan el índice difuso para tolerar erratas y dictado. "priority" ordena las
+# coincidencias cuando un mensaje activa varias intenciones: primero lo que amenaza la vida
+# (no respira, vía aérea, sangrado), después el resto. Las FAQ se buscan como texto literal
+# y siempre pierden frente a una intención.
+FAQ_PRIORITY = 10
+FALLBACK_ID = "fallback"
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    priority: int
+    start: int
+    reply: str
+    distance: int = 0  # 0 = coincidencia exacta; >0 = errores tolerados por el índice difuso
+
+
+class IntentRouter:
+    """Compila intenciones y FAQ una sola vez y devuelve todas las coincidencias puntuadas."""
+
+    def __init__(self, intents: dict, faq: dict, faq_priority: int = FAQ_PRIORITY, fallback: str = "",
+                 fuzzy: bool = True):
+        self.fallback = fallback
+        self._entries = {}  # nombre de grupo -> (id, prioridad, respuesta)
+        self._by_intent = {}  # id -> (prioridad, respuesta)
+        groups = []
+        table = [(i, s["keywords"], s["priority"], s["reply"]) for i, s in intents.items()]
+        table += [(f"faq:{k}", [k], faq_priority, r) for k, r in faq.items()]
+        for intent_id, keywords, priority, reply in table:
+            name = f"g{len(groups)}"
+            keywords = sorted({(normalize(k), k.endswith(" ")) for k in keywords}, key=lambda k: len(k[0]), reverse=True)
+            # Palabra entera: detrás no puede venir nada más que un espacio o el final del mensaje
+            alternatives = (re.escape(k) + ("(?![^ ])" if whole else "") for k, whole in keywords)
+            groups.append(f"(?P<{name}>{'|'.join(alternatives)})")
+            self._entries[name] = (intent_id, priority, reply)
+            self._by_intent[intent_id] = (priority, reply)
+        # Solo se prueba en inicios de palabra ("dea" no salta con "idea") y la clase de primeras
+        # letras descarta cada posición sin probar todas las ramas.
+        firsts = "".join(sorted({normalize(k)[0] for _, kws, _, _ in table for k in kws}))
+        self._regex = re.compile(f"(?<![^ ])(?=[{re.escape(firsts)}])(?:{'|'.join(groups)})") if groups else None
+
+        vocabulary = {}
+        if fuzzy:
+            for intent_id, spec in intents.items():
+                for term in (*spec["keywords"], *spec.get("terms", ())):
+                    vocabulary.setdefault(term, intent_id)
+            for key in faq:
+                vocabulary.setdefault(key, f"faq:{key}")
+        self.fuzzy = FuzzyIndex(vocabulary) if vocabulary else None
+
+    def matches(self, msg: str) -> list:
+        """Una coincidencia por intención, ordenadas por prioridad y después por posición.
+
+        Solo si ninguna palabra clave aparece tal cual se consulta el índice difuso.
+        """
+        if self._regex is None:
+            return []
+        text = normalize(msg)
+        found = {}
+        for m in self._regex.finditer(text):
+            name = m.lastgroup
+            if name not in found:
+                intent_id, priority, reply = self._entries[name]
+                found[name] = IntentMatch(intent_id, priority, m.start(), reply)
+        if not found and self.fuzzy is not None:
+            for hit in self.fuzzy.search(text):
+                priority, reply = self._by_intent[hit.intent]
+                found[hit.intent] = IntentMatch(hit.intent, priority, hit.start, reply, hit.distance)
+        if len(found) < 2:
+            return list(found.values())
+        return sorted(found.values(), key=lambda x: (-x.priority, x.start))
+
+    def best(self, msg: str):
+        """La primera de matches() sin construir ni ordenar las demás (es lo que usa route)."""
+        if self._regex is None:
+            return None
+        text = normalize(msg)
+        top = None
+        # finditer avanza por posición: a igual prioridad gana la primera
+        for m in self._regex.finditer(text):
+            entry = self._entries[m.lastgroup]
+            if top is None or entry[1] > top[0][1]:
+                top = (entry, m.start())
+        if top is not None:
+            (intent_id, priority, reply), start = top
+            return IntentMatch(intent_id, priority, start, reply)
+        if self.fuzzy is None:
+            return None
+        top = None
+        for hit in self.fuzzy.search(text):
+            priority, reply = self._by_intent[hit.intent]
+            if top is None or (-priority, hit.start) < (-top.priority, top.start):
+                top = IntentMatch(hit.intent, priority, hit.start, reply, hit.distance)
+        return top
+
+    def route(self, msg: str) -> str:
+        match = self.best(msg)
+        return match.reply if match else self.fallback
+
+    def route_id(self, msg: str) -> str:
+        """Id de la respuesta (intención, `faq:<clave>` o FALLBACK_ID): lo que guarda el historial."""
+        match = self.best(msg)
+        return match.intent if match else FALLBACK_ID
+
+    def reply(self, reply_id: str) -> str:
+        entry = self._by_intent.get(reply_id)
+        return entry[1] if entry else self.fallback
+
+
+# =========================
+# Memoización de respuestas
+# =========================
+CACHE_SIZE = 4096  # mensajes distintos recordados por proceso (todas las sesiones e idiomas)
+
+
+class Reply(NamedTuple):
+    reply_id: str
+    text: str
+    sources: tuple = ()  # (id de guía, índice de paso) que respaldan la respuesta, de retrieval
+
+
+class ReplyCache:
+    """LRU acotada por proceso: (idioma, mensaje normalizado) -> Reply, más el audio de cada respuesta.
+
+    Casi todo el tráfico repite unos pocos mensajes ("no respira", "atragantamiento"...), así que
+    la mayoría de consultas se resuelven con un acceso a diccionario. El audio se guarda por
+    respuesta, no por mensaje: los MP3 no se duplican por cada forma de preguntar lo mismo.
+    Si cambia `version` (revisión del paquete de contenidos, que incluye los chat.json) se vacía.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._audio = {}  # (idioma, id de respuesta) -> MP3
+        self._version = None
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def _check(self, version) -> None:
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._audio.clear()
+            self._version = version
+
+    def resolve(self, router: IntentRouter, msg: str, lang: str, version=None, retriever=None) -> Reply:
+        """Respuesta del mensaje; con `retriever` (StepIndex del idioma) cita los pasos que más se parecen."""
+        key = (lang, normalize(msg))
+        with self._lock:
+            self._check(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        reply_id = router.route_id(msg)  # fuera del cerrojo: otras sesiones siguen acertando
+        sources = tuple((h.guide_id, h.step) for h in retriever.search(msg)) if retriever is not None else ()
+        entry = Reply(reply_id, router.reply(reply_id), sources)
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry
+
+    def audio(self, lang: str, reply_id: str, version=None):
+        with self._lock:
+            self._check(version)
+            return self._audio.get((lang, reply_id))
+
+    def set_audio(self, lang: str, reply_id: str, data: bytes, version=None) -> None:
+        with self._lock:
+            self._check(version)
+            self._audio[(lang, reply_id)] = data
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._entries), "audio": len(self._audio), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "invalidations": self.invalidations,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
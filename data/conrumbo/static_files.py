@@ -0,0 +1,118 @@
+# static_files.py
+"""Ficheros estáticos de la interfaz (icono, logo, descargas técnicas) leídos una vez por proceso."""
+import base64
+import os
+import threading
+from typing import NamedTuple
+
+from conrumbo import profiling
+
+
+class StaticFile(NamedTuple):
+    path: str
+    data: bytes
+    mtime_ns: int
+
+
+class StaticFiles:
+    """Guarda en memoria los ficheros pedidos y solo vuelve a leerlos si cambia su mtime.
+
+    Tras la primera lectura, `get` no toca disco: los cambios llegan por watchdog
+    (`watch`) o por una llamada explícita a `refresh`. `stats` cuenta las lecturas
+    reales para comprobar que un rerun no hace E/S.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = {}   # ruta absoluta -> StaticFile o None si no existe
+        self._b64 = {}     # ruta absoluta -> data URI
+        self._observer = None
+        self._watched = set()
+        self.stats = {"reads": 0, "bytes": 0}
+
+    def _load(self, key: str):
+        try:
+            mtime = os.stat(key).st_mtime_ns
+            with open(key, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self.stats["reads"] += 1
+        self.stats["bytes"] += len(data)
+        profiling.count("file_reads")
+        profiling.count("file_read_bytes", len(data))
+        return StaticFile(key, data, mtime)
+
+    def get(self, path):
+        """Contenido del fichero (o None si no existe), leído de disco solo la primera vez."""
+        key = os.path.abspath(path)
+        try:
+            return self._files[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._files:
+                self._files[key] = self._load(key)
+                if self._observer is not None:
+                    self._schedule(os.path.dirname(key))
+            return self._files[key]
+
+    def data_uri(self, path, mime: str):
+        """`data:` URI en base64 para incrustar en HTML, codificado una sola vez."""
+        key = os.path.abspath(path)
+        uri = self._b64.get(key)
+        if uri is None:
+            item = self.get(key)
+            if item is None:
+                return None
+            uri = f"data:{mime};base64,{base64.b64encode(item.data).decode('ascii')}"
+            self._b64[key] = uri
+        return uri
+
+    def refresh(self, paths) -> None:
+        """Relee las rutas ya conocidas cuyo mtime (o existencia) haya cambiado."""
+        with self._lock:
+            for p in paths:
+                key = os.path.abspath(p)
+                if key not in self._files:
+                    continue
+                old = self._files[key]
+                try:
+                    mtime = os.stat(key).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if (old.mtime_ns if old else None) != mtime:
+                    self._files[key] = self._load(key)
+                    self._b64.pop(key, None)
+
+    # ---------- vigilancia ----------
+    def _schedule(self, directory: str) -> None:
+        if directory in self._watched or not os.path.isdir(directory):
+            return
+        self._observer.schedule(self._handler, directory, recursive=False)
+        self._watched.add(directory)
+
+    def watch(self) -> bool:
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        files = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    files.refresh([event.src_path, getattr(event, "dest_path", "") or event.src_path])
+
+        self._handler = _Handler()
+        self._observer = Observer()
+        self._observer.daemon = True
+        with self._lock:
+            for key in self._files:
+                self._schedule(os.path.dirname(key))
+        self._observer.start()
+        return True
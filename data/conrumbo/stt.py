@@ -0,0 +1,149 @@
+# stt.py
+"""Dictado en servidor con Vosk: un modelo por proceso y un reconocedor ligero por sesión."""
+import json
+import os
+import threading
+from pathlib import Path
+
+# Mismo sitio que indica el README: models/vosk-<idioma>/ en la raíz del proyecto
+MODELS_ROOT = Path(__file__).resolve().parents[2] / "models"
+MODEL_DIR = Path(os.environ.get("CONRUMBO_VOSK_MODEL") or MODELS_ROOT / "vosk-es")
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 0.2  # audio acumulado antes de pasárselo al reconocedor
+
+_models = {}  # idioma -> modelo Vosk
+_model_lock = threading.Lock()
+
+
+def model_dir(lang: str = "es") -> Path:
+    """Carpeta del modelo de un idioma: CONRUMBO_VOSK_MODEL_<IDIOMA>, o models/vosk-<idioma>."""
+    env = os.environ.get(f"CONRUMBO_VOSK_MODEL_{lang.upper()}")
+    if env:
+        return Path(env)
+    if lang == "es":
+        return MODEL_DIR
+    from conrumbo.i18n import locale
+
+    return MODELS_ROOT / locale(lang).vosk_model
+
+
+def available(lang: str = "es") -> bool:
+    """True si están instaladas las dependencias de requirements-voice.txt y hay modelo del idioma."""
+    try:
+        import av  # noqa: F401
+        import streamlit_webrtc  # noqa: F401
+        import vosk  # noqa: F401
+    except ImportError:
+        return False
+    return model_dir(lang).is_dir()
+
+
+def get_model(lang: str = "es"):
+    """Modelo Vosk del idioma, compartido por todas las sesiones (se carga una vez; son cientos de MB).
+
+    Cada idioma solo ocupa memoria cuando alguien dicta en él por primera vez.
+    """
+    model = _models.get(lang)
+    if model is None:
+        with _model_lock:
+            model = _models.get(lang)
+            if model is None:
+                import vosk
+                vosk.SetLogLevel(-1)
+                model = _models[lang] = vosk.Model(str(model_dir(lang)))
+    return model
+
+
+class Dictation:
+    """Reconocedor de una sesión: recibe PCM int16 mono y va dejando el texto parcial y final."""
+
+    def __init__(self, model=None, sample_rate: int = SAMPLE_RATE, lang: str = "es"):
+        from vosk import KaldiRecognizer
+
+        self.lang = lang
+        self._rec = KaldiRecognizer(model or get_model(lang), sample_rate)
+        self._chunk_bytes = int(sample_rate * CHUNK_SECONDS) * 2
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+        self.final = []
+        self.partial = ""
+        self.revision = 0  # sube cada vez que cambia el texto
+        self.resampler = None  # FrameResampler de la conexión WebRTC, se conserva entre reruns
+
+    def feed(self, pcm: bytes) -> None:
+        with self._lock:
+            self._buf += pcm
+            if len(self._buf) < self._chunk_bytes:
+                return
+            chunk, self._buf = bytes(self._buf), bytearray()
+            self._accept(chunk)
+
+    def _accept(self, chunk: bytes) -> None:
+        before = self.text()
+        if self._rec.AcceptWaveform(chunk):
+            text = json.loads(self._rec.Result()).get("text", "")
+            if text:
+                self.final.append(text)
+            self.partial = ""
+        else:
+            self.partial = json.loads(self._rec.PartialResult()).get("partial", "")
+        if self.text() != before:
+            self.revision += 1
+
+    def flush(self) -> str:
+        """Procesa lo pendiente y cierra la frase en curso."""
+        with self._lock:
+            if self._buf:
+                self._accept(bytes(self._buf))
+                self._buf = bytearray()
+            text = json.loads(self._rec.FinalResult()).get("text", "")
+            if text:
+                self.final.append(text)
+            self.partial = ""
+            self.revision += 1
+        return self.text()
+
+    def text(self) -> str:
+        return " ".join([*self.final, self.partial]).strip()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rec.Reset()
+            self._buf = bytearray()
+            self.final, self.partial = [], ""
+            self.revision += 1
+
+
+class FrameResampler:
+    """Convierte los av.AudioFrame de WebRTC (48 kHz, estéreo...) a PCM int16 mono a 16 kHz."""
+
+    def __init__(self, rate: int = SAMPLE_RATE):
+        import av
+
+        self._resampler = av.AudioResampler(format="s16", layout="mono", rate=rate)
+
+    def __call__(self, frame) -> bytes:
+        out = self._resampler.resample(frame)
+        frames = out if isinstance(out, list) else [out]
+        return b"".join(f.to_ndarray().tobytes() for f in frames if f is not None)
+
+
+def webrtc_dictation(key: str, dictation: Dictation):
+    """Micrófono del navegador por WebRTC; el audio se reconoce en un hilo del servidor."""
+    from streamlit_webrtc import WebRtcMode, webrtc_streamer
+
+    if dictation.resampler is None:
+        dictation.resampler = FrameResampler()
+    resampler = dictation.resampler
+
+    def on_audio(frame):
+        dictation.feed(resampler(frame))
+        return frame
+
+    return webrtc_streamer(
+        key=key,
+        mode=WebRtcMode.SENDRECV,
+        audio_frame_callback=on_audio,
+        sendback_audio=False,
+        media_stream_constraints={"video": False, "audio": True},
+    )
@@ -0,0 +1,242 @@
+# tts.py
+"""Síntesis de voz en servidor con caché de MP3 direccionada por contenido."""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from conrumbo import profiling
+from conrumbo.cache import atomic_write, cache_dir
+from conrumbo.i18n import LOCALES, locale
+
+log = logging.getLogger(__name__)
+
+# Idioma de la app -> (idioma gTTS, voz/acento gTTS, código BCP-47 para el navegador)
+VOICES = {code: (l.gtts_lang, l.gtts_tld, l.bcp47) for code, l in LOCALES.items()}
+
+
+def speech_text(text: str) -> str:
+    """Texto tal y como se lee en voz alta: sin marcas de Markdown."""
+    return re.sub(r"[*_`#>]+", "", text).strip()
+
+
+# =========================
+# Motores de síntesis
+# =========================
+class GTTSEngine:
+    name = "gtts"
+
+    def synthesize(self, text: str, lang: str, voice: str) -> bytes:
+        from gtts import gTTS
+
+        buf = BytesIO()
+        gTTS(text=text, lang=lang, tld=voice).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class StubEngine:
+    """Motor sin red para pruebas: devuelve una trama MPEG silenciosa y determinista."""
+    name = "stub"
+
+    def synthesize(self, text: str, lang: str, voice: str) -> bytes:
+        frame = b"\xff\xf3\x14\xc4" + b"\x00" * 20
+        return frame * max(1, len(text) // 8)
+
+
+ENGINES = {"gtts": GTTSEngine, "stub": StubEngine}
+
+
+def get_engine(name: str = None):
+    return ENGINES[name or os.environ.get("CONRUMBO_TTS_ENGINE", "gtts")]()
+
+
+# =========================
+# Caché en disco con expulsión LRU
+# =========================
+class AudioCache:
+    """MP3 en `<raíz>/<2 hex>/<sha256>.mp3`; el mtime hace de marca de último uso."""
+
+    def __init__(self, root: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self.root.glob("*/*.mp3"))
+
+    @staticmethod
+    def key(text: str, lang: str, voice: str, engine: str) -> str:
+        return hashlib.sha256("\0".join((engine, lang, voice, text)).encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp3"
+
+    def get(self, key: str):
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        profiling.count("file_reads")
+        profiling.count("file_read_bytes", len(data))
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.path(key)
+        existed = path.exists()
+        atomic_write(path, data)
+        with self._lock:
+            if not existed:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self.root.glob("*/*.mp3"), key=lambda p: p.stat().st_mtime)
+        self._size = sum(p.stat().st_size for p in files)
+        target = self.max_bytes * 0.9
+        for p in files:
+            if self._size <= target:
+                break
+            size = p.stat().st_size
+            p.unlink(missing_ok=True)
+            self._size -= size
+
+
+# =========================
+# Servicio
+# =========================
+MEMORY_BYTES = 32 * 1024 * 1024  # MP3 recientes en memoria: un rerun en caliente no toca el disco
+RETRY_SECONDS = 300              # tras un fallo de síntesis (sin red, cuota de gTTS) no se reintenta antes
+
+
+class TTSService:
+    """Devuelve MP3 desde memoria o caché y sintetiza lo que falte, en primer plano o en segundo plano."""
+
+    def __init__(self, cache: AudioCache = None, engine=None, workers: int = 2, memory_bytes: int = MEMORY_BYTES):
+        self.cache = cache or AudioCache(cache_dir("tts"))
+        self.engine = engine or get_engine()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # clave -> MP3, en orden de uso
+        self._memory_bytes = 0
+        self.memory_limit = memory_bytes
+        self._failed = {}  # (texto, idioma) -> instante a partir del cual se puede reintentar
+        self.failures = 0
+
+    def _recall(self, key: str):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def _remember(self, key: str, data: bytes) -> None:
+        with self._lock:
+            if key in self._memory or len(data) > self.memory_limit:
+                return
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit:
+                self._memory_bytes -= len(self._memory.popitem(last=False)[1])
+
+    def _get(self, key: str):
+        """Memoria y, si no está, disco (que pasa a memoria)."""
+        data = self._recall(key)
+        if data is None:
+            data = self.cache.get(key)
+            if data is not None:
+                self._remember(key, data)
+        return data
+
+    def _key(self, text: str, lang: str):
+        l = locale(lang)
+        tts_lang, voice = l.gtts_lang, l.gtts_tld
+        return self.cache.key(text, tts_lang, voice, self.engine.name), tts_lang, voice
+
+    def cached(self, text: str, lang: str) -> bool:
+        return self.cache.path(self._key(speech_text(text), lang)[0]).exists()
+
+    def render(self, text: str, lang: str) -> bytes:
+        """Audio del texto; lo sintetiza y guarda si no está en caché."""
+        text = speech_text(text)
+        key, tts_lang, voice = self._key(text, lang)
+        data = self._get(key)
+        if data is None:
+            data = self.engine.synthesize(text, tts_lang, voice)
+            self.cache.put(key, data)
+            self._remember(key, data)
+        return data
+
+    def failed_recently(self, text: str, lang: str) -> bool:
+        with self._lock:
+            retry_at = self._failed.get((text, lang))
+            if retry_at is not None and retry_at <= time.monotonic():
+                del self._failed[(text, lang)]
+                return False
+            return retry_at is not None
+
+    def audio(self, text: str, lang: str, wait: bool = False):
+        """Audio en caché o None; si falta y `wait` es False, se encarga en segundo plano.
+
+        Un texto cuya síntesis falló hace menos de RETRY_SECONDS devuelve None sin mirar el disco
+        ni encargarlo otra vez (el navegador lo lee con Web Speech).
+        """
+        text = speech_text(text)
+        if not wait and self.failed_recently(text, lang):
+            return None
+        key, _, _ = self._key(text, lang)
+        data = self._get(key)
+        if data is not None or wait:
+            return data if data is not None else self.render(text, lang)
+        self.schedule([text], lang)
+        return None
+
+    def schedule(self, texts, lang: str) -> None:
+        for text in texts:
+            job = (speech_text(text), lang)
+            if self.failed_recently(*job):
+                continue
+            with self._lock:
+                if job in self._pending:
+                    continue
+                self._pending.add(job)
+            self._pool.submit(self._background, *job)
+
+    def _background(self, text: str, lang: str) -> None:
+        try:
+            self.render(text, lang)
+        except Exception as exc:
+            # Sin red o sin gTTS: el navegador sigue leyendo con Web Speech y no se reintenta en un rato
+            with self._lock:
+                self._failed[(text, lang)] = time.monotonic() + RETRY_SECONDS
+                self.failures += 1
+            log.warning("TTS (%s, %s): falló la síntesis de %r: %s", self.engine.name, lang, text[:60], exc)
+        finally:
+            with self._lock:
+                self._pending.discard((text, lang))
+
+
+def iter_speech_texts(store, lang: str):
+    """Todo lo que la app puede leer en voz alta en un idioma: pasos, respuestas del chat y APA."""
+    for scenario, steps in store.section(lang, "emergencias").items():
+        for step in steps:
+            yield f"{scenario}. {step}"
+    chat = store.chat(lang) or {}
+    for spec in chat.get("intents", {}).values():
+        yield spec["reply"]
+    yield from chat.get("faq", {}).values()
+    if chat.get("fallback"):
+        yield chat["fallback"]
+    routine = store.apa(lang).get("routine")
+    if routine:
+        yield routine
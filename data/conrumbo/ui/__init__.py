@@ -0,0 +1,8 @@
+# ui/__init__.py
+"""Interfaz Streamlit de ConRumbo.
+
+`data/app.py` solo compone la página; cada módulo de aquí pinta una parte y los
+servicios compartidos viven en `resources` (uno por proceso). Lo pesado (Pillow,
+zipfile, pandas, smtplib, Vosk...) se importa dentro de la función que lo usa, así
+que importar este paquete no lo carga.
+"""
@@ -0,0 +1,61 @@
+# alerts.py
+"""Aviso al contacto de emergencia: solo encola (sin red) y muestra el estado de entrega."""
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from conrumbo.ui.resources import get_alerts
+
+ALERT_WINDOW = 30  # segundos: pulsaciones repetidas dentro de la ventana son el mismo aviso
+
+
+def send_alert(T, scenario, step):
+    """Solo encola (sin red): la clave es sesión + primera pulsación de la ventana.
+
+    La ventana empieza en la primera pulsación, no en múltiplos fijos de ALERT_WINDOW:
+    dos pulsaciones seguidas a ambos lados de un múltiplo siguen siendo un solo aviso.
+    """
+    now = time.time()
+    if now - st.session_state.alert_first > ALERT_WINDOW:
+        st.session_state.alert_first = now
+    key = f"{st.session_state.session_key}-{st.session_state.alert_first:.3f}"
+    where = T["alert_where"].format(scenario=scenario, step=step) if scenario else ""
+    body = T["alert_body"].format(where=where, time=f"{datetime.now():%H:%M}")
+    for msg_id in get_alerts().enqueue(body, key):
+        if msg_id not in st.session_state.alert_ids:
+            st.session_state.alert_ids.append(msg_id)
+
+
+def _show(T, status: dict) -> None:
+    for msg_id, s in status.items():
+        extra = T["alert_attempt"].format(n=s["attempts"], error=s["error"]) if s["error"] else ""
+        st.caption(f"{s['channel']}: {T.get('alert_' + s['status'], s['status'])}{extra}")
+
+
+def _finished(status: dict) -> bool:
+    from conrumbo.alerts import DONE
+
+    return all(s["status"] in DONE for s in status.values())
+
+
+def alert_status(T):
+    """Estado de entrega de los avisos de esta sesión.
+
+    Mientras alguno está pendiente o reintentando se refresca solo (fragmento, sin rerun
+    completo); cuando todos han terminado se pinta una vez, sin temporizador.
+    """
+    st.session_state.alert_status = get_alerts().status(st.session_state.alert_ids)
+    if _finished(st.session_state.alert_status):
+        _show(T, st.session_state.alert_status)
+    else:
+        live_status(T)
+
+
+@st.fragment(run_every=2)
+def live_status(T):
+    st.session_state.alert_status = get_alerts().status(st.session_state.alert_ids)
+    _show(T, st.session_state.alert_status)
+    if _finished(st.session_state.alert_status):
+        # Rerun completo: la página ya no incluye el fragmento y el temporizador se detiene
+        st.rerun(scope="app")
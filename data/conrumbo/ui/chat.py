@@ -0,0 +1,124 @@
+# chat.py
+"""Pestaña del chat: historial por ventanas, respuesta memoizada con pasos citados y entrada por voz o texto."""
+import streamlit as st
+
+from conrumbo.chat import USER, WINDOW as CHAT_WINDOW
+from conrumbo import profiling
+from conrumbo.progress import Module
+from conrumbo.router import FALLBACK_ID
+from conrumbo.ui.layout import mostrar_boton_sos, panel
+from conrumbo.ui.resources import get_reply_cache, get_retrievers, get_routers, get_tts
+from conrumbo.ui.session import mark_done
+from conrumbo.ui.voice import dictation_update, stt_widget, tts_button
+
+
+def send_message(page, text: str = None) -> None:
+    """Callback de «Enviar»: responde y guarda el turno antes de redibujar, sin st.rerun()."""
+    msg = text if text is not None else st.session_state.get("chat_input", "")
+    if not msg:
+        return
+    if "dictation" in st.session_state:
+        st.session_state.dictation.reset()
+    answer = get_reply_cache().resolve(get_routers()(page.lang), msg, page.lang, page.content.revision,
+                                       get_retrievers()(page.lang))
+    history = st.session_state.chat_history
+    history.add_user(msg)
+    history.add_bot(answer.reply_id, answer.sources)
+    st.session_state.pop("chat_window", None)
+    st.session_state.chat_input = ""
+
+
+def _goto(title: str, idx: int) -> None:
+    st.session_state.emergency_mode = True
+    st.session_state.scenario = title
+    st.session_state.step_idx = idx
+    mark_done(Module.EMERGENCIAS)
+
+
+def bot_text(page, router, turn) -> str:
+    """Sin intención reconocida pero con pasos citados, la respuesta son esos pasos."""
+    if turn.reply_id == FALLBACK_ID and turn.sources:
+        return page.T["chat_found"]
+    return router.reply(turn.reply_id)
+
+
+def citations(page, turn, jump: bool) -> None:
+    """Pasos de las guías que respaldan la respuesta; los de emergencias abren el reproductor en ese paso."""
+    T = page.T
+    for gid, idx in turn.sources:
+        doc, text = page.content.entry(page.lang, gid), page.content.step(page.lang, gid, idx)
+        if text is None:
+            continue  # la guía cambió desde la pregunta
+        st.markdown(T["chat_cite"].format(title=doc["title"], step=idx + 1, text=text))
+        if jump and doc.get("section") == "emergencias":
+            # El reproductor está fuera de este fragmento: hay que redibujar la página entera
+            if st.button(T["chat_goto"].format(step=idx + 1), key=f"chat_goto_{gid}_{idx}",
+                         on_click=_goto, args=(doc["title"], idx)):
+                st.rerun(scope="app")
+
+
+@panel
+@profiling.timed("panel.chat")
+def chat_tab(page) -> None:
+    """Como fragmento, enviar un mensaje solo redibuja el chat."""
+    T, lang = page.T, page.lang
+    router, reply_cache = get_routers()(lang), get_reply_cache()
+    mostrar_boton_sos(T)
+    st.subheader(T["chat_header"])
+    st.caption(T["chat_caption"])
+
+    # Historial: solo los últimos turnos; el resto bajo demanda
+    history = st.session_state.chat_history
+    shown = st.session_state.get("chat_window", CHAT_WINDOW)
+    if len(history) > shown and st.button(T["chat_load_more"].format(n=len(history) - shown), key="chat_more"):
+        st.session_state.chat_window = shown = shown + CHAT_WINDOW
+    turns = history.last(shown)
+    for i, turn in enumerate(turns):
+        if turn.role == USER:
+            st.markdown(f"**{T['chat_you']}:** {turn.text}")
+        else:
+            st.markdown(f"**{T['chat_bot']}:** {bot_text(page, router, turn)}")
+            citations(page, turn, jump=i == len(turns) - 1)
+    last = turns[-1:]
+    if last and last[0].role != USER:
+        reply_id = last[0].reply_id
+        if reply_id == FALLBACK_ID and last[0].sources:
+            # Se lee el primer paso citado; la caché de disco del TTS ya lo guarda por texto
+            gid, idx = last[0].sources[0]
+            step = page.content.step(lang, gid, idx)
+            text = f"{page.content.entry(lang, gid)['title']}. {step}" if step else router.reply(reply_id)
+            audio = get_tts().audio(text, lang)
+        else:
+            # Audio memoizado por respuesta: las repetidas no vuelven a tocar la caché de disco
+            text = router.reply(reply_id)
+            audio = reply_cache.audio(lang, reply_id, page.content.revision)
+            if audio is None:
+                audio = get_tts().audio(text, lang)
+                if audio:
+                    reply_cache.set_audio(lang, reply_id, audio, page.content.revision)
+        with st.expander(T["chat_read_last"]):
+            tts_button(T["chat_play"], text, audio)
+
+    (live_input if st.session_state.get("dictating") else chat_input)(page)
+
+
+def chat_input(page) -> None:
+    """Dictado, campo de texto y botones de envío."""
+    T = page.T
+    voice_text = stt_widget(T)
+    text = dictation_update()
+    if text is not None:
+        st.session_state.chat_input = text
+    st.text_input(T["chat_input"], key="chat_input", placeholder=T["chat_placeholder"])
+
+    csend1, csend2 = st.columns([0.55, 0.45])
+    with csend1:
+        st.button(T["chat_send"], use_container_width=True, on_click=send_message, args=(page,))
+    with csend2:
+        if voice_text:
+            st.button(T["chat_use_voice"], use_container_width=True, on_click=send_message, args=(page, voice_text))
+
+
+# Mientras se dicta en el servidor, solo esta parte se redibuja cada 0,5 s para llevar el texto
+# reconocido al campo: ni la app ni el historial del chat se vuelven a ejecutar.
+live_input = st.fragment(run_every=0.5)(chat_input)
@@ -0,0 +1,29 @@
+# downloads.py
+"""Descargas de guías: Markdown al momento, PDF y tarjeta PNG con QR bajo demanda."""
+import streamlit as st
+
+from conrumbo.exports import FORMATS as EXPORT_MIME, build as build_export, cached as cached_export
+from conrumbo.ui.resources import export_bytes, guide_table
+
+
+def guide_for(page, title: str):
+    return guide_table(page.lang, page.content.revision).get(page.content.guide_id(page.lang, title))
+
+
+def guide_downloads(page, guide, label: str):
+    """Markdown al momento; PDF y tarjeta PNG se generan la primera vez que alguien los pide."""
+    if guide is None:
+        return
+    T, version = page.T, page.content.version
+    md, _ = build_export(guide, "md", version)
+    st.download_button(f"{label} (.md)", export_bytes(str(md)), file_name=guide.filename("md"),
+                       mime=EXPORT_MIME["md"], key=f"dl_md_{guide.lang}_{guide.id}")
+    ready = {fmt: cached_export(guide, fmt, version) for fmt in ("pdf", "png")}
+    if not all(ready.values()) and st.button(T["export_prepare"], key=f"export_{guide.lang}_{guide.id}"):
+        with st.spinner(T["export_generating"]):
+            ready = {fmt: build_export(guide, fmt, version)[0] for fmt in ready}
+    if all(ready.values()):
+        st.download_button(f"{label} (.pdf)", export_bytes(str(ready["pdf"])), file_name=guide.filename("pdf"),
+                           mime=EXPORT_MIME["pdf"], key=f"dl_pdf_{guide.lang}_{guide.id}")
+        st.download_button(T["export_card"], export_bytes(str(ready["png"])), file_name=guide.filename("png"),
+                           mime=EXPORT_MIME["png"], key=f"dl_png_{guide.lang}_{guide.id}")
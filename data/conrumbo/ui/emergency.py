@@ -0,0 +1,84 @@
+# emergency.py
+"""Pestaña de emergencias inmediatas: modo emergencia, selector de escenario, reproductor de pasos y descargas."""
+from functools import partial
+
+import streamlit as st
+
+from conrumbo.bundles import bundle_url
+from conrumbo.progress import Module
+from conrumbo.ui import alerts
+from conrumbo.ui.downloads import guide_downloads, guide_for
+from conrumbo.ui.layout import mostrar_boton_sos
+from conrumbo.ui.media import CONTENT_PX, media_block, zip_scenario_assets
+from conrumbo.ui.player import scenario_picker, step_player
+from conrumbo.ui.resources import get_alerts
+from conrumbo.ui.session import mark_done
+from conrumbo.video import MEDIA_URL
+
+COLUMNS = (0.58, 0.42)  # pasos y medios | descargas
+
+
+def toggle_emergency(T) -> None:
+    if st.button(T["emergency_toggle"], use_container_width=True):
+        st.session_state.emergency_mode = not st.session_state.emergency_mode
+        if not st.session_state.emergency_mode:
+            st.session_state.scenario = None
+            st.session_state.step_idx = 0
+
+
+def emergency_tab(page) -> None:
+    T = page.T
+    scenarios = page.content.section(page.lang, "emergencias")
+    mostrar_boton_sos(T)
+    st.subheader(T["emergency_header"])
+    left, right = st.columns(COLUMNS)
+    with left:
+        toggle_emergency(T)
+
+        if get_alerts() is not None:
+            if st.button(T["alert_button"], use_container_width=True):
+                alerts.send_alert(T, st.session_state.scenario, st.session_state.step_idx + 1)
+            if st.session_state.alert_ids:
+                alerts.alert_status(T)
+
+        scenario_picker(T, scenarios, on_select=partial(mark_done, Module.EMERGENCIAS))
+
+        if st.session_state.emergency_mode and st.session_state.scenario in scenarios:
+            step_player(T, scenarios[st.session_state.scenario])
+            st.info(T["call_if_serious"])
+            st.markdown("---")
+            media_block(page, st.session_state.scenario, width_px=round(CONTENT_PX * COLUMNS[0]))
+        else:
+            st.info(T["activate_hint"])
+
+    with right:
+        st.markdown(T["scenario_downloads"])
+
+
+def scenario_downloads(page) -> None:
+    """Guía y ZIP de material del escenario elegido."""
+    T = page.T
+    scenario = st.session_state.scenario
+    with st.expander(T["scenario_expander"], expanded=False):
+        if scenario in page.content.section(page.lang, "emergencias"):
+            guide_downloads(page, guide_for(page, scenario), T["download_guide"])
+
+            # ZIP de material (si hay ficheros locales disponibles)
+            if st.button(T["prepare_zip"]):
+                bundle = zip_scenario_assets(page, scenario)
+                if bundle and MEDIA_URL:
+                    # Lo sirve media_server.py desde disco (sendfile, Range): Streamlit no lee el ZIP
+                    # y cada descarga no deja una copia en la memoria del proceso.
+                    st.link_button(T["download_zip"], bundle_url(bundle), use_container_width=True)
+                elif bundle:
+                    # Sin servidor de medios, como con los vídeos: Streamlit lee el fichero abierto
+                    # en este rerun (el de «Preparar») y lo suelta en el siguiente.
+                    with open(bundle, "rb") as f:
+                        st.download_button(
+                            T["download_zip"],
+                            data=f,
+                            file_name=f"ConRumbo_{scenario.replace(' ','_')}_media.zip",
+                            mime="application/zip",
+                        )
+                else:
+                    st.warning(T["no_local_media"])
@@ -0,0 +1,150 @@
+# layout.py
+"""Piezas comunes de la página: estilos, botón SOS, icono de descargas, cabecera y pie."""
+import os
+
+import streamlit as st
+
+from conrumbo import profiling
+from conrumbo.ui.resources import get_static_files
+
+EMERGENCY_NUMBER = "112"
+
+# Paneles con estado propio (st.fragment): sus botones solo redibujan el panel, no la página entera.
+# CONRUMBO_FRAGMENTS=0 vuelve al rerun completo (para comparar con bench_fragments.py).
+FRAGMENTS = os.environ.get("CONRUMBO_FRAGMENTS", "1") != "0"
+
+
+def panel(fn):
+    return st.fragment(fn) if FRAGMENTS else fn
+
+# Estilo y botón SOS adaptado
+STYLE = """
+<style>
+:root {
+  --brand:#D90429; --brand-dark:#a1031e;
+}
+.sos-wrap {
+  display: flex;
+  flex-wrap: wrap;
+  align-items: center;
+  gap: 12px;
+  border-bottom: 1px solid #e9e9ee;
+  padding-bottom: 14px;
+  margin-bottom: 16px;
+}
+.sos-btn {
+  appearance: none;
+  border: 0;
+  background: var(--brand);
+  color: #fff;
+  font-weight: bold;
+  font-size: 22px;
+  padding: 18px 30px;
+  border-radius: 12px;
+  box-shadow: 0 6px 0 var(--brand-dark), 0 10px 24px rgba(217, 4, 41, .25);
+  cursor: pointer;
+  text-decoration: none;
+  display: inline-flex;
+  align-items: center;
+  gap: 10px;
+}
+.sos-btn:active {
+  transform: translateY(2px);
+  box-shadow: 0 4px 0 var(--brand-dark), 0 8px 18px rgba(217, 4, 41, .25);
+}
+.sos-badge {
+  background: #fff;
+  color: var(--brand);
+  font-weight: bold;
+  border-radius: 999px;
+  padding: 6px 10px;
+  font-size: 14px;
+  box-shadow: inset 0 0 0 2px var(--brand);
+}
+@media (max-width: 600px) {
+  .sos-btn {
+    font-size: 18px;
+    padding: 14px 20px;
+  }
+  .sos-wrap {
+    flex-direction: column;
+    align-items: flex-start;
+  }
+}
+</style>
+"""
+
+
+def style() -> None:
+    st.markdown(STYLE, unsafe_allow_html=True)
+
+
+def sos_html(T) -> str:
+    """HTML del botón SOS embebido en todas las secciones."""
+    return f'''
+<div style="position:fixed;top:20px;right:20px;z-index:9999;">
+  <a href="tel:{EMERGENCY_NUMBER}" target="_self"
+     style="background:#D90429;color:#fff;font-weight:bold;font-size:18px;padding:16px 24px;
+            border-radius:12px;box-shadow:0 6px 0 #a1031e;text-decoration:none;display:inline-block;">
+    🚨 {T["sos_button"]}
+  </a>
+</div>
+'''
+
+
+def mostrar_boton_sos(T) -> None:
+    st.markdown(sos_html(T), unsafe_allow_html=True)
+
+
+# Icono de descargas técnicas flotante
+@profiling.timed()
+def descarga_icono():
+    icon_uri = get_static_files().data_uri("assets/icono_descarga.png", "image/png")  # Usa el PNG que tú quieras
+    if icon_uri:
+        img_tag = f'<img src="{icon_uri}" width="32" title="Descargar app.py y requirements.txt" style="cursor:pointer;">'
+    else:
+        img_tag = '<span style="font-size:22px;" title="Descargar app.py y requirements.txt">⬇️</span>'
+
+    html_code = f"""
+    <div style='position:fixed;top:22px;right:22px;z-index:9999;'>
+        <a href="#descargas-tecnicas" title="Descargar código">{img_tag}</a>
+    </div>
+    """
+    st.markdown(html_code, unsafe_allow_html=True)
+
+
+def header(T) -> None:
+    with profiling.section("header"):
+        col_logo, col_title = st.columns([0.15, 0.85])
+        with col_logo:
+            # Coloca tu logo en assets/evolve_logo.png
+            logo = get_static_files().get("assets/evolve_logo.png")
+            if logo:
+                st.image(logo.data, width=96)
+        with col_title:
+            st.title(T["title"])
+            st.markdown(T["header_tagline"])
+        st.caption(T["header_disclaimer"])
+
+
+def tech_downloads(T, app_file: str) -> None:
+    """Ancla flotante y descargas de app.py y requirements.txt."""
+    st.markdown("----")
+    st.markdown('<a name="descargas-tecnicas"></a>', unsafe_allow_html=True)
+    st.subheader(T["tech_downloads_anchor"])
+
+    with profiling.section("tech_downloads"):
+        st.markdown("### " + T["tech_downloads"])
+        app_source = get_static_files().get(app_file)
+        if app_source:
+            st.download_button(T["download_app"], app_source.data, file_name="app.py", mime="text/x-python")
+        requirements = get_static_files().get("requirements.txt")
+        if requirements:
+            st.download_button(T["download_req"], requirements.data, file_name="requirements.txt", mime="text/plain")
+
+
+def footer(T) -> None:
+    st.markdown("---")
+    st.caption(T["footer"])
+    st.divider()
+    st.caption(T["mvp_disclaimer"])
@@ -0,0 +1,45 @@
+# lite.py
+"""Modo emergencia ligero: botón SOS, selector de escenario y pasos con voz, nada más.
+
+Sin pestañas, progreso, chat, medios ni descargas: no toca pandas, zipfile ni Pillow y no lee
+fotos ni vídeos. Se abre con `streamlit run data/lite.py` o con `?lite=1` en la app completa.
+"""
+import streamlit as st
+
+from conrumbo.exports import PUBLIC_URL
+from conrumbo.ui.layout import mostrar_boton_sos
+from conrumbo.ui.player import scenario_picker, step_player
+from conrumbo.ui.resources import get_content
+from conrumbo.ui.session import Page, init_state, open_guide_link
+
+
+def start() -> Page:
+    """Idioma del enlace (?lang=) o de la sesión, estado mínimo y guía del QR (?guide=)."""
+    content = get_content()
+    lang = st.query_params.get("lang")
+    if lang not in content.languages:
+        lang = st.session_state.get("lang") if st.session_state.get("lang") in content.languages \
+            else content.default_lang
+    st.session_state["lang"] = lang
+    page = Page(lang, content.texts(lang), content)
+    init_state()
+    open_guide_link(page)
+    st.session_state.emergency_mode = True
+    return page
+
+
+def render(page: Page) -> None:
+    T = page.T
+    scenarios = page.content.section(page.lang, "emergencias")
+    mostrar_boton_sos(T)
+    st.subheader(T["lite_title"])
+    st.caption(T["emergency_caption"])
+
+    scenario_picker(T, scenarios)
+    if st.session_state.scenario in scenarios:
+        step_player(T, scenarios[st.session_state.scenario])
+        st.info(T["call_if_serious"])
+    else:
+        st.info(T["lite_pick"])
+
+    st.caption(f"[{T['lite_full_app']}]({PUBLIC_URL.rstrip('/')}/?lang={page.lang})")
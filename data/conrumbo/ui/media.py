@@ -0,0 +1,169 @@
+# media.py
+"""Fotos y vídeos de las guías: bloque reutilizable, ZIP de material y centro de medios."""
+import os
+
+import streamlit as st
+
+from conrumbo import profiling
+from conrumbo.bundles import build_bundle
+from conrumbo.images import derivative, pick_width
+from conrumbo.ui.resources import get_media_index, get_uploads
+from conrumbo.uploads import UploadRejected
+from conrumbo.video import MEDIA_URL, media_url, renditions
+
+
+def lazy_media() -> bool:
+    """Con carga diferida, los bloques que el usuario no ha abierto no tocan disco ni envían medios.
+
+    Se lee en cada llamada: bench_rerun.py cambia CONRUMBO_LAZY_MEDIA entre pasadas del mismo proceso.
+    """
+    return os.environ.get("CONRUMBO_LAZY_MEDIA", "1") != "0"
+
+
+# El servidor no conoce la pantalla: ancho útil de la página (layout="wide" en un portátil, px CSS)
+# y densidad de píxeles a medio camino entre 1x y 2x. Con eso se elige la variante de cada foto.
+CONTENT_PX = 1100
+PIXEL_RATIO = 1.5
+
+
+@profiling.timed()
+def media_block(page, title_key: str, lazy: bool = False, width_px: int = CONTENT_PX):
+    """Fotos, vídeos y subidas de una guía; `width_px` es el ancho del contenedor en px CSS."""
+    T = page.T
+    st.markdown(T["media_header"])
+    entry = get_media_index().entry(page.lang, title_key)
+    imgs, vids = entry.images, entry.videos
+
+    if lazy and lazy_media() and not st.toggle(T["media_show"].format(images=len(imgs), videos=len(vids)), key=f"media_{title_key}"):
+        return
+
+    # Imágenes
+    if imgs:
+        cols = st.columns(min(3, len(imgs)))
+        width = pick_width(round(width_px / len(cols) * PIXEL_RATIO))
+        for i, rec in enumerate(imgs):
+            with cols[i % len(cols)]:
+                if rec.source == "remote":
+                    st.image(rec.url, caption=rec.title, use_container_width=True)
+                elif rec.source == "local":
+                    # Miniatura ligera; el original solo si se pide
+                    thumb = derivative(rec.path, width, digest=rec.sha256)
+                    st.image(str(thumb or rec.path), caption=rec.title, use_container_width=True)
+                    if thumb and st.toggle(T["media_original"], key=f"full_{title_key}_{i}"):
+                        st.image(rec.path, use_container_width=True)
+                else:
+                    st.info(T["media_placeholder"].format(title=rec.title))
+    else:
+        st.info(T["media_no_images"])
+
+    # Vídeos
+    if vids:
+        for i, rec in enumerate(vids):
+            st.markdown(f"**{rec.title or T['media_video']}**")
+            if rec.source == "remote":
+                st.video(rec.url)
+            elif rec.source == "local" and MEDIA_URL:
+                # Lo sirve media_server.py por tramos: Streamlit no lee ni guarda el vídeo.
+                # Por defecto la versión más ligera; el original solo si se pide
+                names = renditions(rec.sha256)
+                hd = names and st.toggle(T["media_hd"], key=f"hd_{title_key}_{i}")
+                st.video(media_url(rec.sha256, names[0] if names and not hd else "orig"))
+            elif rec.source == "local":
+                st.video(rec.path)
+            else:
+                st.info(T["media_video_placeholder"])
+    else:
+        st.info(T["media_no_videos"])
+
+    with st.expander(T["media_upload"]):
+        upload_panel(page, title_key)
+
+
+# Subidas: al almacén de disco por contenido; la sesión solo guarda sus hashes por guía
+PROMOTE = os.environ.get("CONRUMBO_UPLOAD_PROMOTE") == "1"
+
+
+def _ingest(files) -> list:
+    """Pasa las subidas al almacén; devuelve los hashes aceptados y anota los rechazos."""
+    store, digests = get_uploads(), []
+    for f in files:
+        try:
+            digests.append(store.put(f, f.name).digest)
+        except UploadRejected as exc:
+            st.session_state.upload_notes.append(f"{f.name}: {exc}")
+    return digests
+
+
+def upload_panel(page, title_key: str):
+    T = page.T
+    store = get_uploads()
+    gid = page.content.guide_id(page.lang, title_key) or title_key
+    # La clave cambia tras cada ingesta: el uploader vuelve vacío y Streamlit suelta los bytes.
+    # Un contador por guía: subir en una no vacía ni recrea los uploaders de las demás.
+    n = st.session_state.upload_round.get(gid, 0)
+    up_imgs = st.file_uploader(T["upload_images"], type=["png", "jpg", "jpeg", "webp"], accept_multiple_files=True,
+                               key=f"upimg_{gid}_{n}")
+    up_vids = st.file_uploader(T["upload_videos"], type=["mp4", "mov", "webm"], accept_multiple_files=True,
+                               key=f"upvid_{gid}_{n}")
+    if up_imgs or up_vids:
+        mine = st.session_state.uploads.setdefault(gid, [])
+        mine.extend(d for d in _ingest([*up_imgs, *up_vids]) if d not in mine)
+        st.session_state.upload_round[gid] = n + 1
+        st.rerun()
+
+    for note in st.session_state.upload_notes:
+        st.warning(T["upload_rejected"].format(reason=note))
+    st.session_state.upload_notes.clear()
+
+    uploads = [u for u in map(store.get, st.session_state.uploads.get(gid, [])) if u is not None]
+    images = [u for u in uploads if u.kind == "image"]
+    videos = [u for u in uploads if u.kind == "video"]
+    if images:
+        st.success(T["uploaded_images"].format(n=len(images)))
+        cols = st.columns(min(3, len(images)))
+        for i, u in enumerate(images):
+            with cols[i % len(cols)]:
+                # Miniatura del hilo de fondo; mientras no está, el original
+                st.image(str(store.thumbnail(u.digest) or u.path), caption=u.name, use_container_width=True)
+                promote_button(page, gid, u)
+    if videos:
+        st.success(T["uploaded_videos"].format(n=len(videos)))
+        for u in videos:
+            st.video(media_url(u.digest) if MEDIA_URL else u.path)
+            promote_button(page, gid, u)
+
+
+def promote_button(page, gid: str, upload):
+    """Con CONRUMBO_UPLOAD_PROMOTE=1, añade la subida a media.json de la guía."""
+    if PROMOTE and st.button(page.T["upload_promote"], key=f"promote_{gid}_{upload.digest[:16]}"):
+        get_uploads().promote(page.content, upload.digest, gid)
+        st.success(page.T["upload_promoted"])
+
+
+@profiling.timed()
+def zip_scenario_assets(page, scenario: str):
+    """Ruta del ZIP con los ficheros locales del escenario (construido una vez por versión) o None."""
+    files = get_media_index().entry(page.lang, scenario).local_files()
+    return build_bundle(scenario, page.content.section(page.lang, "emergencias").get(scenario, []), files)
+
+
+def media_center(page):
+    """Estado de los medios de todas las guías: asignados, disponibles y con problemas."""
+    T = page.T
+    media_index = get_media_index()
+    st.subheader(T["media_center_header"])
+    faltantes = []
+    for k, entry in media_index.entries(page.lang).items():
+        st.markdown(f"### {k}")
+        st.write(T["media_images_ok"].format(ok=entry.images_ok, total=len(entry.images)))
+        st.write(T["media_videos_ok"].format(ok=entry.videos_ok, total=len(entry.videos)))
+        if not entry.complete:
+            faltantes.append(k)
+        st.markdown("---")
+    problemas = [r for r in media_index.problems() if r.source == "local"]
+    if problemas:
+        st.error(T["media_review"] + "\n" + "\n".join(f"- {r.title}: {r.problem}" for r in problemas))
+    if faltantes:
+        st.warning(T["media_missing"].format(titles=", ".join(faltantes)))
+    else:
+        st.success(T["media_all_assigned"])
@@ -0,0 +1,35 @@
+# perf.py
+"""Panel de rendimiento en la barra lateral (solo administración: CONRUMBO_PROFILE=1 y ?perf=<token>)."""
+import hmac
+import json
+import os
+
+import streamlit as st
+
+from conrumbo import profiling
+from conrumbo.ui.resources import get_reply_cache
+
+
+def requested() -> bool:
+    """Solo con un CONRUMBO_PROFILE_TOKEN explícito: sin él no hay valor de ?perf que abra el panel."""
+    token = os.environ.get("CONRUMBO_PROFILE_TOKEN", "")
+    if not (profiling.ENABLED and token):
+        return False
+    return hmac.compare_digest(st.query_params.get("perf", "").encode("utf-8"), token.encode("utf-8"))
+
+
+def perf_panel() -> None:
+    if not requested():
+        return
+    import pandas as pd  # solo aquí: pandas añade cientos de ms al arranque en frío
+
+    with st.sidebar.expander("⏱️ Rendimiento", expanded=False):
+        perf = profiling.report(st.session_state)
+        for scope in ("session", "process"):
+            st.markdown(f"**{'Esta sesión' if scope == 'session' else 'Proceso'}** (ms)")
+            st.dataframe(pd.DataFrame.from_dict(perf.get(scope, {}).get("sections", {}), orient="index"))
+            st.json(perf.get(scope, {}).get("counters", {}), expanded=False)
+        st.markdown("**Caché de respuestas del chat**")
+        perf["chat_cache"] = get_reply_cache().stats()
+        st.json(perf["chat_cache"], expanded=False)
+        st.download_button("⬇️ JSON", json.dumps(perf, indent=2), file_name="conrumbo_perf.json", mime="application/json")
@@ -0,0 +1,56 @@
+# player.py
+"""Selector de escenario y reproductor de pasos con voz: lo comparten la pestaña de emergencias y el modo ligero."""
+import streamlit as st
+
+from conrumbo import profiling
+from conrumbo.ui.layout import panel
+from conrumbo.ui.voice import tts_button
+
+
+PICK_KEY = "scenario_pick"
+
+
+def _picked(on_select) -> None:
+    choice = st.session_state[PICK_KEY]
+    st.session_state.scenario = choice
+    if on_select is not None and choice != "—":
+        on_select()
+
+
+def scenario_picker(T, scenarios: dict, on_select=None) -> None:
+    """Selector de escenario; `on_select` se llama en el callback cuando el usuario elige uno."""
+    options = ["—", *scenarios.keys()]
+    # El escenario también lo cambian el botón de modo emergencia, los QR y el chat: el selector lo sigue
+    current = st.session_state.scenario if st.session_state.scenario in scenarios else "—"
+    if st.session_state.get(PICK_KEY) != current:
+        st.session_state[PICK_KEY] = current
+    st.selectbox(T["scenario_select"], options, key=PICK_KEY, on_change=_picked, args=(on_select,))
+
+
+def _set_step(idx: int) -> None:
+    st.session_state.step_idx = idx
+
+
+@panel
+@profiling.timed("panel.step_player")
+def step_player(T, steps: list) -> None:
+    """Paso actual con lectura en voz alta y navegación.
+
+    Los botones cambian el paso en su callback, antes de redibujar: el contador nunca va un
+    paso por detrás y, como fragmento, avanzar no vuelve a ejecutar el resto de la página.
+    """
+    idx = min(st.session_state.step_idx, len(steps) - 1)
+    st.session_state.step_idx = idx
+    st.success(T["step_counter"].format(scenario=st.session_state.scenario, step=idx+1, total=len(steps)))
+    current_text = steps[idx]
+    st.markdown(T["instruction"].format(text=current_text))
+    tts_button(T["read_aloud"], f"{st.session_state.scenario}. {current_text}")
+
+    b1, b2, b3 = st.columns(3)
+    with b1:
+        st.button(T["step_prev"], disabled=idx == 0, use_container_width=True, on_click=_set_step, args=(idx - 1,))
+    with b2:
+        st.button(T["step_restart"], use_container_width=True, on_click=_set_step, args=(0,))
+    with b3:
+        st.button(T["step_next"], disabled=idx == len(steps)-1, use_container_width=True,
+                  on_click=_set_step, args=(idx + 1,))
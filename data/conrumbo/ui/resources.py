@@ -0,0 +1,122 @@
+# resources.py
+"""Servicios compartidos por todas las sesiones: se crean la primera vez que se piden, una vez por proceso."""
+from pathlib import Path
+
+import streamlit as st
+
+from conrumbo import profiling
+
+# Cada getter importa su subsistema: importar este módulo (lo hacen todas las páginas) no carga
+# sqlite3, los avisos, el índice de medios ni la voz hasta que algo los pide de verdad.
+DATA_DIR = Path(__file__).resolve().parents[2]
+CONTENT_DIR = DATA_DIR / "content"
+
+
+# Ficheros estáticos de la interfaz: se leen y codifican una vez por proceso
+@st.cache_resource
+def get_static_files():
+    from conrumbo.static_files import StaticFiles
+
+    files = StaticFiles()
+    files.watch()
+    return files
+
+
+# Contenidos (data/content), cargados una vez por proceso y recargados en caliente
+@st.cache_resource
+def get_content():
+    from conrumbo.content import ContentStore
+
+    store = ContentStore(CONTENT_DIR)
+    store.watch()
+    return store
+
+
+@st.cache_resource
+def get_routers():
+    from conrumbo.i18n import Routers
+
+    return Routers(get_content())
+
+
+@st.cache_resource
+def get_reply_cache():
+    from conrumbo.router import ReplyCache
+
+    return ReplyCache()
+
+
+# Índice de pasos para citar en el chat: se abre (mmap) con la primera pregunta de cada idioma
+@st.cache_resource
+def get_retrievers():
+    from conrumbo.retrieval import Retrievers
+
+    return Retrievers(get_content())
+
+
+# Progreso persistente de todos los usuarios
+@st.cache_resource
+def get_progress_store():
+    from conrumbo.progress import ProgressStore
+
+    return ProgressStore()
+
+
+@st.cache_resource
+def get_media_index():
+    from conrumbo.media import MediaIndex
+
+    index = MediaIndex(get_content())
+    index.watch()
+    return index
+
+
+# Material subido: un almacén por contenido para todas las sesiones
+@st.cache_resource
+def get_uploads():
+    from conrumbo.uploads import UploadStore
+
+    return UploadStore()
+
+
+# Voz: MP3 en servidor con gTTS; Web Speech API en el navegador como respaldo
+@st.cache_resource
+def get_tts():
+    from conrumbo.tts import TTSService, iter_speech_texts
+
+    content = get_content()
+    service = TTSService()
+    # Pre-render en segundo plano: el arranque no espera a la síntesis.
+    for code in content.languages:
+        service.schedule(iter_speech_texts(content, code), code)
+    return service
+
+
+# Avisos de emergencia (Twilio / SMTP) en segundo plano
+@st.cache_resource
+def get_alerts():
+    from conrumbo.alerts import AlertDispatcher, channels_from_env
+
+    channels = channels_from_env()
+    return AlertDispatcher(channels) if channels else None
+
+
+@st.cache_resource(max_entries=8)
+def guide_table(lang: str, revision: int) -> dict:
+    """Guías exportables por id; una tabla por idioma y versión del paquete, no por sesión."""
+    from conrumbo.exports import guides
+
+    return {g.id: g for g in guides(get_content(), lang)}
+
+
+def _read(path: str) -> bytes:
+    data = Path(path).read_bytes()
+    profiling.count("file_reads")
+    profiling.count("file_read_bytes", len(data))
+    return data
+
+
+@st.cache_resource(max_entries=64)
+def export_bytes(path: str) -> bytes:
+    """Un buffer por fichero exportado y proceso; la ruta cambia cuando cambia el contenido."""
+    return _read(path)
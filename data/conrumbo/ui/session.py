@@ -0,0 +1,114 @@
+# session.py
+"""Estado de sesión: idioma, valores por defecto, progreso persistente, historial del chat y enlaces de QR."""
+import os
+import uuid
+from typing import Mapping, NamedTuple
+
+import streamlit as st
+
+from conrumbo.cache import cache_dir
+from conrumbo.chat import ChatHistory
+from conrumbo.content import ContentStore
+from conrumbo.progress import Module, new_user_id, valid_user_id
+from conrumbo.ui.resources import get_content, get_progress_store
+
+DEFAULTS = {
+    "emergency_mode": False,
+    "scenario": None,
+    "step_idx": 0,
+    "alert_ids": [],
+    "alert_first": 0.0,   # primera pulsación de la ventana de avisos en curso
+    "uploads": {},        # id de guía -> sha256 de lo subido (los ficheros están en el almacén)
+    "upload_round": {},   # id de guía -> ronda del uploader (parte de su clave)
+    "upload_notes": [],
+}
+
+
+class Page(NamedTuple):
+    """Lo que cada parte de la página necesita en este rerun."""
+    lang: str
+    T: Mapping           # textos de la interfaz del idioma (compartidos, solo lectura)
+    content: ContentStore
+
+
+def select_language(content: ContentStore) -> str:
+    """Selector de idioma en la barra lateral.
+
+    Los catálogos y routers son por proceso: cambiar de idioma solo cambia el código guardado en la sesión.
+    """
+    if st.session_state.get("lang") not in content.languages:
+        # Primera visita: el idioma del enlace (?lang=, p. ej. el de un QR) o el del paquete
+        st.session_state["lang"] = st.query_params.get("lang") if st.query_params.get("lang") in content.languages \
+            else content.default_lang
+    lang = st.sidebar.selectbox("🌐 Idioma / Language", content.languages,
+                                index=content.languages.index(st.session_state["lang"]),
+                                format_func=lambda code: content.texts(code).get("language_name", code))
+    if st.session_state["lang"] != lang and st.session_state.get("scenario"):
+        # El escenario abierto sigue abierto, con su título en el nuevo idioma
+        gid = content.guide_id(st.session_state["lang"], st.session_state.scenario)
+        doc = content.entry(lang, gid) if gid else None
+        st.session_state.scenario = doc["title"] if doc else None
+    st.session_state["lang"] = lang
+    return lang
+
+
+def init_state() -> None:
+    for k, v in DEFAULTS.items():
+        if k not in st.session_state:
+            st.session_state[k] = v if not isinstance(v, (dict, list)) else v.copy()
+    if "session_key" not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+
+
+def init_progress() -> None:
+    """Progreso persistente: id anónimo en la URL (?u=...) para recuperarlo al recargar."""
+    if "user_id" not in st.session_state:
+        uid = st.query_params.get("u")
+        if not valid_user_id(uid):
+            uid = new_user_id()
+            st.query_params["u"] = uid
+        st.session_state.user_id = uid
+        st.session_state.progress = get_progress_store().bits(uid)  # bits de conrumbo.progress.Module
+
+
+def set_progress(bits: int) -> None:
+    """Actualiza la sesión y encola en el almacén solo los módulos que cambian."""
+    if bits != st.session_state.progress:
+        get_progress_store().update(st.session_state.user_id, st.session_state.progress, bits)
+        st.session_state.progress = bits
+
+
+def mark_done(module: int) -> None:
+    """Marca un módulo como completado; solo desde una acción del usuario, nunca al dibujar una pestaña."""
+    set_progress(st.session_state.progress | module)
+
+
+def init_chat() -> None:
+    if "chat_history" not in st.session_state:
+        # Con CONRUMBO_CHAT_SPILL=1 los turnos que salen del buffer se guardan en disco y se pueden recuperar
+        spill = cache_dir("chat") / f"{st.session_state.session_key}.jsonl" if os.environ.get("CONRUMBO_CHAT_SPILL") == "1" else None
+        st.session_state.chat_history = ChatHistory(spill_path=spill)
+
+
+def open_guide_link(page: Page) -> None:
+    """Enlace de los QR (?guide=<id>): abre esa guía de emergencia directamente en el paso 1."""
+    if "guide_link" not in st.session_state:
+        st.session_state.guide_link = st.query_params.get("guide", "")
+        doc = page.content.entry(page.lang, st.session_state.guide_link)
+        if doc and doc.get("section") == "emergencias":
+            st.session_state.emergency_mode = True
+            st.session_state.scenario = doc["title"]
+            st.session_state.step_idx = 0
+            mark_done(Module.EMERGENCIAS)  # abrir el QR de una guía cuenta como elegirla
+
+
+def start() -> Page:
+    """Prepara la sesión para este rerun y devuelve idioma, textos y contenidos."""
+    content = get_content()
+    lang = select_language(content)
+    page = Page(lang, content.texts(lang), content)
+    init_state()
+    init_progress()
+    init_chat()
+    open_guide_link(page)
+    return page
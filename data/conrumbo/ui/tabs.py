@@ -0,0 +1,96 @@
+# tabs.py
+"""Pestañas de contenido: primeros auxilios, kits, progreso y rutina APA."""
+import streamlit as st
+
+from conrumbo import profiling
+from conrumbo.exports import APA_ID
+from conrumbo.progress import ALL as PROGRESS_MODULES, Module, done, labels as progress_labels
+from conrumbo.ui.downloads import guide_downloads, guide_for
+from conrumbo.ui.layout import mostrar_boton_sos, panel
+from conrumbo.ui.media import media_block
+from conrumbo.ui.resources import get_progress_store, guide_table
+from conrumbo.ui.session import mark_done, set_progress
+from conrumbo.ui.voice import tts_button
+
+
+def done_button(T, module: Module) -> None:
+    """El módulo cuenta (y guarda su fecha) al pulsar aquí: todas las pestañas se dibujan en cada rerun."""
+    finished = bool(st.session_state.progress & module)
+    st.button(T["marked_done"] if finished else T["mark_done"], key=f"done_{module.name.lower()}",
+              disabled=finished, on_click=mark_done, args=(module,))
+
+
+def first_aid_tab(page) -> None:
+    T = page.T
+    mostrar_boton_sos(T)
+    st.subheader(T["first_aid_header"])
+    for titulo, pasos in page.content.section(page.lang, "primeros_aux").items():
+        with st.expander(f"📄 {titulo}", expanded=False):
+            st.markdown("\n".join([f"- {p}" for p in pasos]))
+            guide_downloads(page, guide_for(page, titulo), T["download_named"].format(title=titulo))
+            st.markdown("---")
+            media_block(page, titulo, lazy=True)
+    done_button(T, Module.PRIMEROS_AUX)
+
+
+def kits_tab(page) -> None:
+    T = page.T
+    mostrar_boton_sos(T)
+    st.subheader(T["kits_header"])
+    cols = st.columns(3)
+    for i, (kit, items) in enumerate(page.content.section(page.lang, "kits").items()):
+        with cols[i % len(cols)]:
+            st.markdown(f"### {kit}")
+            st.markdown("\n".join([f"- {it}" for it in items]))
+            guide_downloads(page, guide_for(page, kit), T["download_named"].format(title=kit))
+    done_button(T, Module.KITS)
+
+
+@panel
+@profiling.timed("panel.progress")
+def progress_tab(page) -> None:
+    """Checklist de módulos y exportación; como fragmento, marcar una casilla solo redibuja esta pestaña."""
+    T = page.T
+    mostrar_boton_sos(T)
+    st.subheader(T["progress_header"])
+    bits = 0
+    labels = progress_labels(T)
+    for module in PROGRESS_MODULES:
+        if st.checkbox(labels[module], value=bool(st.session_state.progress & module)):
+            bits |= module
+    set_progress(bits)
+    done_count = len(done(bits))
+    total = len(PROGRESS_MODULES)
+
+    pct = int(100 * done_count / total)
+    st.progress(pct / 100)
+    st.write(T["progress_done"].format(pct=pct))
+
+    # La exportación (con la fecha real de cada módulo) solo se genera cuando se pide
+    if st.button(T["prepare_export"]):
+        with profiling.section("progress.export"):
+            uid, store = st.session_state.user_id, get_progress_store()
+            st.session_state.progress_export = (b"".join(store.iter_csv(uid, labels=labels)),
+                                                b"".join(store.iter_json(uid, labels=labels)))
+    if "progress_export" in st.session_state:
+        csv_data, json_data = st.session_state.pop("progress_export")
+        e1, e2 = st.columns(2)
+        e1.download_button(T["export_csv"], data=csv_data, file_name="ConRumbo_progreso.csv", mime="text/csv")
+        e2.download_button(T["export_json"], data=json_data, file_name="ConRumbo_progreso.json", mime="application/json")
+
+
+def apa_tab(page) -> None:
+    T = page.T
+    apa = page.content.apa(page.lang)
+    mostrar_boton_sos(T)
+    st.subheader(T["apa_header"])
+    st.markdown(
+        T["apa_intro"] + "\n\n" +
+        apa.get("text", "").replace("\n", "<br>"),
+        unsafe_allow_html=True
+    )
+
+    st.markdown(T["apa_breathing"])
+    tts_button(T["apa_listen"], apa.get("routine", ""))
+    guide_downloads(page, guide_table(page.lang, page.content.revision).get(APA_ID), T["apa_download"])
+    done_button(T, Module.APA)
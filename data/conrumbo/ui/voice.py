@@ -0,0 +1,117 @@
+# voice.py
+"""Voz en la interfaz: lectura de textos (MP3 en servidor o Web Speech) y dictado (Vosk o navegador)."""
+import json
+from string import Template
+
+import streamlit as st
+from streamlit.components.v1 import html
+
+from conrumbo import stt
+from conrumbo.i18n import locale
+from conrumbo.tts import speech_text
+from conrumbo.ui.resources import get_tts
+
+
+def tts_button(label, text, audio=None):
+    lang_code = st.session_state["lang"]
+    audio = audio or get_tts().audio(text, lang_code)
+    if audio:
+        st.caption(label)
+        st.audio(audio, format="audio/mpeg")
+        return
+    # Aún sin MP3 en caché: lectura en el navegador (Web Speech API)
+    html(f"""
+    <button id="speakBtn" style="padding:8px 12px;border:1px solid #ccc;border-radius:8px;cursor:pointer">{label}</button>
+    <script>
+      const text = {speech_text(text)!r};
+      const btn = document.getElementById("speakBtn");
+      if (btn) {{
+        btn.onclick = () => {{
+          const u = new SpeechSynthesisUtterance(text);
+          u.lang = {locale(lang_code).bcp47!r};
+          window.speechSynthesis.cancel();
+          window.speechSynthesis.speak(u);
+        }};
+      }}
+    </script>
+    """, height=40)
+
+
+def dictation_update():
+    """Texto dictado si cambió desde la última vez que se llevó al campo del chat; si no, None."""
+    d = st.session_state.get("dictation")
+    if not st.session_state.get("dictating") or d is None or d.revision == st.session_state.get("dictation_seen"):
+        return None
+    st.session_state.dictation_seen = d.revision
+    return d.text()
+
+
+def server_stt_widget(T):
+    st.caption(T["stt_server_caption"])
+    d = st.session_state.get("dictation")
+    if d is None or d.lang != st.session_state["lang"]:
+        st.session_state.dictation = stt.Dictation(lang=st.session_state["lang"])
+    ctx = stt.webrtc_dictation("dictado", st.session_state.dictation)
+    playing = bool(ctx.state.playing)
+    if playing != st.session_state.get("dictating", False):
+        # Al empezar o acabar el dictado el chat cambia a su entrada que se refresca sola (o vuelve
+        # de ella): un único rerun de la app en cada cambio, ninguno mientras se dicta.
+        st.session_state.dictating = playing
+        st.rerun(scope="app")
+    return st.session_state.dictation.text()
+
+
+def stt_widget(T):
+    if stt.available(st.session_state["lang"]):
+        return server_stt_widget(T)
+    st.session_state.pop("dictating", None)  # p. ej. cambio a un idioma sin modelo a mitad de dictado
+    st.caption(T["stt_browser_caption"])
+    stt_code = Template("""
+    <div>
+      <button id="startRec" style="padding:8px 12px;border:1px solid #ccc;border-radius:8px;margin-right:8px;cursor:pointer">$listen</button>
+      <button id="stopRec" style="padding:8px 12px;border:1px solid #ccc;border-radius:8px;cursor:pointer">$stop</button>
+      <p id="sttStatus" style="font-family:system-ui, sans-serif; font-size:14px; color:#444;margin-top:8px;"></p>
+      <textarea id="sttOut" rows="2" style="width:100%;margin-top:6px;" placeholder="$placeholder"></textarea>
+    </div>
+    <script>
+      const status = document.getElementById('sttStatus');
+      const out = document.getElementById('sttOut');
+      let rec, finalText = "";
+      function supported() { return ('webkitSpeechRecognition' in window) || ('SpeechRecognition' in window); }
+      function getRec() {
+        const Ctor = window.SpeechRecognition || window.webkitSpeechRecognition;
+        const r = new Ctor();
+        r.lang = $lang;
+        r.continuous = true;
+        r.interimResults = true;
+        r.onresult = (e) => {
+          let interim = "";
+          for (let i = e.resultIndex; i < e.results.length; i++) {
+            const t = e.results[i][0].transcript;
+            if (e.results[i].isFinal) finalText += t;
+            else interim += t;
+          }
+          out.value = (finalText + " " + interim).trim();
+        };
+        r.onerror = (e)=>{ status.innerText = "Error: " + e.error; };
+        r.onend = ()=>{ status.innerText = $ended; };
+        return r;
+      }
+      if (!supported()) { status.innerText = $unsupported; }
+      document.getElementById('startRec').onclick = () => {
+        if (!supported()) return;
+        finalText = "";
+        rec = getRec(); rec.start();
+        status.innerText = $listening;
+      };
+      document.getElementById('stopRec').onclick = () => {
+        if (rec) rec.stop(); status.innerText = $stopped;
+      };
+    </script>
+    """).substitute(
+        listen=T["stt_listen"], stop=T["stt_stop"], placeholder=T["stt_placeholder"],
+        lang=json.dumps(locale(st.session_state["lang"]).bcp47),
+        **{k: json.dumps(T[f"stt_{k}"], ensure_ascii=False) for k in ("ended", "unsupported", "listening", "stopped")},
+    )
+    html(stt_code, height=200)
+    return st.text_input(T["stt_paste"], key="stt_input")
@@ -0,0 +1,167 @@
+# uploads.py
+"""Material subido por los usuarios: spool en disco, almacén por contenido y miniaturas en segundo plano.
+
+Cada subida se copia por trozos a un temporal del spool mientras se calcula su sha256 y se
+comprueban tamaño y tipo real (python-magic); si pasa, se renombra a objects/<sha256>.<ext>.
+Si ese objeto ya existe se descarta la copia: diez usuarios que suben el mismo vídeo ocupan
+un único fichero. La sesión guarda solo los hashes.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from conrumbo.cache import atomic_write, cache_dir
+from conrumbo.images import DEFAULT_WIDTH, derivative, variant_path
+
+CHUNK = 1024 * 1024
+SNIFF = 8192  # bytes que mira python-magic
+
+# Tipos aceptados por contenido (no por extensión) y su extensión canónica
+ALLOWED = {
+    "image/png": ("image", ".png"),
+    "image/jpeg": ("image", ".jpg"),
+    "image/webp": ("image", ".webp"),
+    "video/mp4": ("video", ".mp4"),
+    "video/quicktime": ("video", ".mov"),
+    "video/webm": ("video", ".webm"),
+}
+MAX_MB = {
+    "image": float(os.environ.get("CONRUMBO_UPLOAD_IMAGE_MB", "15")),
+    "video": float(os.environ.get("CONRUMBO_UPLOAD_VIDEO_MB", "200")),
+}
+# Carpeta (relativa, como el resto de rutas de media.json) a la que se copia lo que se promociona
+LIBRARY = Path(os.environ.get("CONRUMBO_UPLOAD_LIBRARY", "assets/uploads"))
+
+
+class UploadRejected(ValueError):
+    """La subida no cumple los límites de tamaño o tipo; el mensaje es legible."""
+
+
+class Upload(NamedTuple):
+    digest: str
+    kind: str    # "image" | "video"
+    mime: str
+    size: int
+    name: str    # nombre original de la primera subida
+    path: str
+
+
+def sniff_buffer(head: bytes, name: str) -> str:
+    """Tipo MIME de los primeros bytes (python-magic); si no está disponible, por el nombre."""
+    try:
+        import magic
+        return magic.from_buffer(head, mime=True)
+    except Exception:
+        return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+class UploadStore:
+    """Almacén direccionado por contenido compartido por todas las sesiones del proceso."""
+
+    def __init__(self, root: Path = None, workers: int = 1):
+        self.root = Path(root or cache_dir("uploads"))
+        self.spool = self.root / "spool"
+        self.objects = self.root / "objects"
+        self.spool.mkdir(parents=True, exist_ok=True)
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self._lock = threading.Lock()
+        self._meta = {}  # sha256 -> Upload
+        self._stats = {"stored": 0, "deduplicated": 0, "rejected": 0, "bytes": 0}  # con _lock: varias sesiones a la vez
+
+    # ---------- entrada ----------
+    def put(self, fileobj, name: str) -> Upload:
+        """Copia `fileobj` al almacén (o lo descarta si ya estaba) y devuelve su registro."""
+        fd, tmp = tempfile.mkstemp(dir=self.spool, prefix=".up-")
+        try:
+            h, size, mime, limit = hashlib.sha256(), 0, None, None
+            with os.fdopen(fd, "wb") as out:
+                while chunk := fileobj.read(CHUNK):
+                    if mime is None:
+                        mime = sniff_buffer(chunk[:SNIFF], name)
+                        if mime not in ALLOWED:
+                            raise UploadRejected(f"tipo {mime} no admitido")
+                        kind = ALLOWED[mime][0]
+                        limit = MAX_MB[kind] * 2**20
+                    size += len(chunk)
+                    if size > limit:
+                        raise UploadRejected(f"supera {MAX_MB[kind]:g} MB")
+                    h.update(chunk)
+                    out.write(chunk)
+            if mime is None:
+                raise UploadRejected("fichero vacío")
+            digest = h.hexdigest()
+            target = self.objects / digest[:2] / f"{digest}{ALLOWED[mime][1]}"
+            target.parent.mkdir(exist_ok=True)
+            with self._lock:
+                if target.exists():
+                    self._stats["deduplicated"] += 1
+                else:
+                    # Primero los metadatos: un objeto visible siempre tiene los suyos
+                    atomic_write(target.with_suffix(".json"), json.dumps({"mime": mime, "name": name}).encode())
+                    os.replace(tmp, target)
+                    self._stats["stored"] += 1
+                    self._stats["bytes"] += size
+        except UploadRejected:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        upload = self.get(digest)
+        if upload.kind == "image":
+            self._pool.submit(self._thumbnail, upload)
+        return upload
+
+    # ---------- consultas ----------
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def get(self, digest: str):
+        """Registro del objeto o None; los metadatos se leen de disco una vez por proceso."""
+        upload = self._meta.get(digest)
+        if upload is not None:
+            return upload
+        meta = self.objects / digest[:2] / f"{digest}.json"
+        try:
+            info = json.loads(meta.read_text(encoding="utf-8"))
+            kind, ext = ALLOWED[info["mime"]]
+            path = meta.with_suffix(ext)
+            upload = Upload(digest, kind, info["mime"], path.stat().st_size, info["name"], str(path))
+        except (OSError, ValueError, KeyError):
+            return None
+        self._meta[digest] = upload
+        return upload
+
+    def thumbnail(self, digest: str):
+        """Miniatura ya generada o None (todavía en cola, o no es una imagen)."""
+        path = variant_path(digest, DEFAULT_WIDTH)
+        return path if path.exists() else None
+
+    def _thumbnail(self, upload: Upload) -> None:
+        derivative(upload.path, digest=upload.digest)  # sin Pillow o si falla: se muestra el original
+
+    # ---------- promoción al manifiesto ----------
+    def promote(self, store, digest: str, guide_id: str, title: str = "") -> str:
+        """Copia el objeto a la biblioteca de medios y lo añade a media.json de esa guía."""
+        upload = self.get(digest)
+        if upload is None:
+            raise KeyError(digest)
+        path = LIBRARY / f"{digest}{Path(upload.path).suffix}"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(upload.path, path)  # mismo disco: sin copiar bytes
+            except OSError:
+                shutil.copyfile(upload.path, path)
+        store.add_media(guide_id, upload.kind + "s", {"title": title or upload.name, "url": "", "path": path.as_posix()})
+        return path.as_posix()
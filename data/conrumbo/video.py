@@ -0,0 +1,59 @@
+# video.py
+"""Vídeos de las guías: versiones de menor bitrate (ffmpeg) y URL del servidor de medios."""
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from conrumbo.cache import cache_dir, file_hash
+
+# nombre -> (alto máximo en px, bitrate de vídeo, bitrate de audio); de menor a mayor
+RENDITIONS = {
+    "360p": (360, "600k", "64k"),
+    "720p": (720, "1800k", "96k"),
+}
+
+# Dirección pública de media_server.py (p. ej. http://localhost:8502). Sin ella los vídeos
+# locales siguen yendo por st.video(ruta).
+MEDIA_URL = os.environ.get("CONRUMBO_MEDIA_URL", "").rstrip("/")
+
+
+def media_url(digest: str, name: str = "orig") -> str:
+    return f"{MEDIA_URL}/media/{digest}/{name}.mp4"
+
+
+def rendition_path(digest: str, name: str) -> Path:
+    return cache_dir("video") / digest[:2] / f"{digest}-{name}.mp4"
+
+
+def renditions(digest: str) -> list:
+    """Versiones ya generadas de un vídeo, de menor a mayor calidad."""
+    return [name for name in RENDITIONS if rendition_path(digest, name).exists()]
+
+
+def build_rendition(path, name: str, digest: str = None) -> bool:
+    """Genera una versión con ffmpeg (H.264 + AAC, faststart); True si ya estaba en caché."""
+    target = rendition_path(digest or file_hash(path), name)
+    if target.exists():
+        return True
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg no está instalado")
+    height, video_rate, audio_rate = RENDITIONS[name]
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".tmp-{os.getpid()}-{target.name}")
+    try:
+        subprocess.run(
+            [ffmpeg, "-v", "error", "-y", "-i", str(path),
+             # Sin ampliar; el ancho par que pide H.264
+             "-vf", f"scale=-2:'min({height},ih)'",
+             "-c:v", "libx264", "-preset", "veryfast", "-b:v", video_rate,
+             "-maxrate", video_rate, "-bufsize", f"{int(video_rate[:-1]) * 2}k",
+             "-c:a", "aac", "-b:a", audio_rate,
+             # moov al principio: el navegador empieza a reproducir y saltar sin bajar el final
+             "-movflags", "+faststart", str(tmp)],
+            check=True, capture_output=True)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return False
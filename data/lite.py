@@ -0,0 +1,11 @@
+# lite.py
+# Modo emergencia ligero: `streamlit run data/lite.py`. Solo SOS, escenario y pasos con voz.
+import streamlit as st
+from conrumbo import profiling
+from conrumbo.ui import lite
+st.set_page_config(page_title="ConRumbo – Emergencia", page_icon="🆘", layout="centered")
+profiling.begin_rerun(st.session_state)
+
+lite.render(lite.start())
+
+profiling.end_rerun()
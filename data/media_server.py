@@ -0,0 +1,58 @@
+# media_server.py
+"""Servidor de los vídeos locales de las guías (Range, ETag/Last-Modified, sendfile).
+
+Se arranca junto a la app, desde la misma carpeta (las rutas del manifiesto son relativas),
+y la app lo enlaza con CONRUMBO_MEDIA_URL:
+
+    python data/media_server.py --port 8502 &
+    CONRUMBO_MEDIA_URL=http://localhost:8502 streamlit run data/app.py
+
+También entrega los ZIP de material por escenario que la app construye en la caché
+(/bundles/<nombre>.zip), para que la descarga no pase por la memoria de Streamlit.
+Las versiones de menor bitrate se generan antes con `python data/prewarm.py --kinds video`.
+/stats (conexiones, bytes, códigos de estado) pide `Authorization: Bearer <token>`, con el
+mismo CONRUMBO_PROFILE_TOKEN que el panel de rendimiento; sin token no se sirve.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from conrumbo.cache import cache_dir  # noqa: E402
+from conrumbo.content import ContentStore  # noqa: E402
+from conrumbo.media import MediaIndex  # noqa: E402
+from conrumbo.media_server import MediaServer, index_resolver  # noqa: E402
+from conrumbo.uploads import UploadStore  # noqa: E402
+
+CONTENT_DIR = HERE / "content"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--no-sendfile", action="store_true", help="lee y escribe en Python (para comparar)")
+    parser.add_argument("--stats-token", default=os.environ.get("CONRUMBO_PROFILE_TOKEN", ""),
+                        help="token de /stats (por defecto CONRUMBO_PROFILE_TOKEN; vacío = /stats desactivado)")
+    args = parser.parse_args(argv)
+
+    store = ContentStore(CONTENT_DIR)
+    store.watch()
+    index = MediaIndex(store)
+    index.watch()
+    server = MediaServer(index_resolver(index, UploadStore()), sendfile=not args.no_sendfile,
+                         stats_token=args.stats_token, bundles=cache_dir("bundles"))
+    print(f"sirviendo medios en http://{args.host}:{args.port}/media/<sha256>/<orig|360p|720p>.mp4")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
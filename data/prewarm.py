@@ -0,0 +1,178 @@
+# prewarm.py
+"""Pre-calienta las cachés de artefactos derivados antes de arrancar la app.
+
+Recorre las guías (emergencias, primeros auxilios, kits) y el manifiesto de medios
+en todos los idiomas del paquete de contenidos y construye en paralelo lo que falte.
+Es idempotente: lo que ya está en caché se cuenta como acierto y no se rehace.
+
+Uso:
+    python data/prewarm.py                 # todo, todos los idiomas
+    python data/prewarm.py --kinds tts --lang es --jobs 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from conrumbo.content import ContentStore  # noqa: E402
+
+CONTENT_DIR = HERE / "content"
+
+# Estado por proceso de trabajo (se crea al primer uso dentro de cada worker)
+_services = {}
+
+
+def _tts():
+    if "tts" not in _services:
+        from conrumbo.tts import TTSService
+        _services["tts"] = TTSService(workers=1)
+    return _services["tts"]
+
+
+def _media_index(store: ContentStore):
+    if "media" not in _services:
+        from conrumbo.media import MediaIndex
+        _services["media"] = MediaIndex(store)
+    return _services["media"]
+
+
+# =========================
+# Constructores (funciones de módulo para poder enviarlas al pool de procesos)
+# =========================
+def build_tts(text: str, lang: str) -> bool:
+    service = _tts()
+    hit = service.cached(text, lang)
+    if not hit:
+        service.render(text, lang)
+    return hit
+
+
+def tts_tasks(store: ContentStore, lang: str, seen: set):
+    from conrumbo.tts import iter_speech_texts
+    for text in dict.fromkeys(iter_speech_texts(store, lang)):
+        yield text[:48], build_tts, (text, lang)
+
+
+def build_zip(scenario: str, steps: list, files: list) -> bool:
+    from conrumbo.bundles import build_bundle, bundle_path
+    hit = bundle_path(scenario, steps, files).exists()
+    build_bundle(scenario, steps, files)
+    return hit
+
+
+def zip_tasks(store: ContentStore, lang: str, seen: set):
+    index = _media_index(store)
+    for scenario, steps in store.section(lang, "emergencias").items():
+        files = index.entry(lang, scenario).local_files()
+        if files:
+            yield scenario, build_zip, (scenario, steps, files)
+
+
+def build_thumbs(path: str) -> bool:
+    from conrumbo.images import build_variants
+    return build_variants(path)
+
+
+def thumb_tasks(store: ContentStore, lang: str, seen: set):
+    # Las imágenes no dependen del idioma: una foto compartida por varios idiomas va una sola vez.
+    index = _media_index(store)
+    paths = {r.path for e in index.entries(lang).values() for r in e.images if r.source == "local"}
+    for path in sorted(paths - seen):
+        seen.add(path)
+        yield path, build_thumbs, (path,)
+
+
+def build_video(path: str, name: str, digest: str) -> bool:
+    from conrumbo.video import build_rendition
+    return build_rendition(path, name, digest)
+
+
+def video_tasks(store: ContentStore, lang: str, seen: set):
+    # Como las imágenes: cada vídeo una vez, aunque lo usen varios idiomas
+    from conrumbo.video import RENDITIONS
+    index = _media_index(store)
+    videos = {r.path: r.sha256 for e in index.entries(lang).values() for r in e.videos if r.source == "local"}
+    for path, digest in sorted(videos.items()):
+        if path in seen:
+            continue
+        seen.add(path)
+        for name in RENDITIONS:
+            yield f"{path} ({name})", build_video, (path, name, digest)
+
+
+def build_export(guide, fmt: str, version: str) -> bool:
+    from conrumbo.exports import build
+    return build(guide, fmt, version)[1]
+
+
+def export_tasks(store: ContentStore, lang: str, seen: set):
+    from conrumbo.exports import FORMATS, guides
+    for guide in guides(store, lang):
+        for fmt in FORMATS:
+            yield f"{guide.title}.{fmt}", build_export, (guide, fmt, store.version)
+
+
+# tipo de artefacto -> generador de tareas (etiqueta, función, argumentos); `seen` es un conjunto
+# por tipo compartido por todos los idiomas, para lo que no depende del idioma
+TASKS = {
+    "tts": tts_tasks,
+    "zip": zip_tasks,
+    "thumb": thumb_tasks,
+    "video": video_tasks,
+    "export": export_tasks,
+}
+
+
+def _run(kind: str, label: str, func, args) -> tuple:
+    t0 = time.perf_counter()
+    try:
+        hit, error = func(*args), None
+    except Exception as exc:  # se informa y se sigue con el resto
+        hit, error = False, f"{type(exc).__name__}: {exc}"
+    return kind, label, hit, time.perf_counter() - t0, error
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kinds", default=",".join(TASKS), help=f"tipos separados por comas ({', '.join(TASKS)})")
+    parser.add_argument("--lang", action="append", help="idioma a pre-calentar (repetible; por defecto todos)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2, help="procesos en paralelo")
+    parser.add_argument("--quiet", action="store_true", help="solo el resumen final")
+    args = parser.parse_args(argv)
+
+    store = ContentStore(CONTENT_DIR)
+    langs = args.lang or store.languages
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in TASKS]
+    if unknown:
+        parser.error(f"tipos desconocidos: {', '.join(unknown)}")
+
+    seen = {kind: set() for kind in kinds}
+    jobs = [(kind, f"[{lang}] {label}", func, fargs)
+            for kind in kinds for lang in langs for label, func, fargs in TASKS[kind](store, lang, seen[kind])]
+
+    t0 = time.perf_counter()
+    stats = {kind: {"hit": 0, "miss": 0, "error": 0, "secs": 0.0} for kind in kinds}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(_run, *job) for job in jobs]
+        for fut in as_completed(futures):
+            kind, label, hit, secs, error = fut.result()
+            outcome = "error" if error else ("hit" if hit else "miss")
+            stats[kind][outcome] += 1
+            stats[kind]["secs"] += secs
+            if not args.quiet or error:
+                print(f"{kind:>6} {outcome:>5} {secs * 1000:8.1f} ms  {label}" + (f"  ({error})" if error else ""))
+
+    print(f"\n{len(jobs)} artefactos en {time.perf_counter() - t0:.1f} s")
+    for kind, s in stats.items():
+        print(f"{kind:>6}: {s['hit']} en caché, {s['miss']} construidos, {s['error']} errores, {s['secs']:.1f} s de trabajo")
+    return 1 if any(s["error"] for s in stats.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# progress_report.py
+"""Analítica y exportación del progreso de todos los usuarios, directamente desde SQLite.
+
+Los agregados se calculan en la base de datos y la exportación se escribe por
+bloques, así que la memoria no crece con el número de usuarios.
+
+Uso:
+    python data/progress_report.py                       # resumen en JSON
+    python data/progress_report.py --export csv -o progreso.csv
+    python data/progress_report.py --export json --db otra.sqlite3
+    python data/progress_report.py --lang en             # módulos con los nombres en inglés
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from conrumbo.content import ContentStore  # noqa: E402
+from conrumbo.progress import DB_PATH, ProgressStore, labels  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=str(DB_PATH), help="base de datos de progreso")
+    parser.add_argument("--export", choices=("csv", "json"), help="volcar todas las filas en este formato")
+    parser.add_argument("-o", "--output", help="fichero de salida (por defecto, la salida estándar)")
+    parser.add_argument("--lang", help="idioma de los nombres de módulo (por defecto, el del paquete)")
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        parser.error(f"no existe {args.db}")
+    content = ContentStore(HERE / "content")
+    names = labels(content.texts(args.lang or content.default_lang))
+    store = ProgressStore(args.db)
+    try:
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            if args.export:
+                chunks = (store.iter_csv if args.export == "csv" else store.iter_json)(labels=names)
+                for chunk in chunks:
+                    out.write(chunk)
+            else:
+                out.write(json.dumps(store.summary(names), ensure_ascii=False, indent=2).encode("utf-8") + b"\n")
+        finally:
+            if args.output:
+                out.close()
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
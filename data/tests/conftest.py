@@ -0,0 +1,17 @@
+# conftest.py
+"""Los tests importan conrumbo (data/) y las utilidades de AppTest de data/benchmarks/journeys.py.
+
+La caché de artefactos y la base de progreso van a un directorio temporal: conrumbo lee
+CONRUMBO_CACHE_DIR y CONRUMBO_PROGRESS_DB al importarse, así que se fijan antes.
+"""
+import os
+import sys
+import tempfile
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DATA_DIR)
+sys.path.insert(0, os.path.join(DATA_DIR, "benchmarks"))
+
+_STATE = tempfile.mkdtemp(prefix="conrumbo-tests-")
+os.environ.setdefault("CONRUMBO_CACHE_DIR", os.path.join(_STATE, "cache"))
+os.environ.setdefault("CONRUMBO_PROGRESS_DB", os.path.join(_STATE, "progress.sqlite3"))
@@ -0,0 +1,126 @@
+# test_alerts.py
+"""AlertDispatcher: reintentos, errores permanentes, envíos sin confirmar y diario tras reiniciar."""
+import threading
+import time
+
+import pytest
+
+from bench_alerts import FakeSmtp, wait
+from conrumbo.alerts import AlertDispatcher, DeliveryUnknown, PermanentError, SmtpChannel
+
+
+class ScriptedChannel:
+    """Canal falso: lanza las excepciones de `script` en orden y después entrega."""
+
+    name = "whatsapp"
+
+    def __init__(self, *script):
+        self.script, self.calls = list(script), 0
+        self._lock = threading.Lock()
+
+    def send(self, body, subject, key):
+        with self._lock:
+            self.calls += 1
+            if self.script:
+                raise self.script.pop(0)
+
+
+@pytest.fixture
+def start(tmp_path):
+    started = []
+
+    def start(channels, spool="spool", **kwargs):
+        d = AlertDispatcher(channels, spool_dir=tmp_path / spool, base_delay=0.01, max_delay=0.05, **kwargs)
+        started.append(d)
+        return d
+
+    (tmp_path / "spool").mkdir()
+    yield start
+    for d in started:
+        if not d._closed:
+            d.close()
+
+
+def test_transient_errors_are_retried(start):
+    channel = ScriptedChannel(RuntimeError("HTTP 503"), OSError("reset"))
+    d = start([channel])
+    s = wait(d, d.enqueue("aviso", "k"))["k:whatsapp"]
+    assert (s["status"], s["attempts"], channel.calls) == ("sent", 3, 3)
+
+
+def test_gives_up_after_max_attempts(start):
+    channel = ScriptedChannel(*[RuntimeError("HTTP 503")] * 5)
+    d = start([channel], max_attempts=3)
+    s = wait(d, d.enqueue("aviso", "k"))["k:whatsapp"]
+    assert (s["status"], channel.calls) == ("failed", 3)
+
+
+@pytest.mark.parametrize("exc, status", [(PermanentError("HTTP 400"), "failed"),
+                                         (DeliveryUnknown("sin respuesta"), "unconfirmed")])
+def test_no_retry_after_permanent_or_unknown(start, exc, status):
+    channel = ScriptedChannel(exc)
+    d = start([channel])
+    s = wait(d, d.enqueue("aviso", "k"))["k:whatsapp"]
+    time.sleep(0.1)
+    assert (s["status"], channel.calls) == (status, 1)
+
+
+def test_same_key_is_not_resent_after_restart(start):
+    channel = ScriptedChannel()
+    d = start([channel])
+    ids = wait(d, d.enqueue("aviso", "k"))
+    d.close()
+    d = start([channel])
+    assert d.enqueue("aviso", "k") == list(ids)
+    time.sleep(0.1)
+    assert channel.calls == 1 and d.status(ids)["k:whatsapp"]["status"] == "sent"
+
+
+def test_send_interrupted_by_crash_is_unconfirmed(start, tmp_path):
+    channel = ScriptedChannel()
+    d = start([channel])
+    ids = d.enqueue("aviso", "k")
+    d.close()
+    # El proceso cayó justo después de anotar "sending"
+    with open(tmp_path / "spool" / "queue.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"op": "sending", "id": "k:whatsapp"}\n')
+    d = start([channel])
+    time.sleep(0.1)
+    assert d.status(ids)["k:whatsapp"]["status"] == "unconfirmed"
+
+
+@pytest.fixture(scope="module")
+def smtp():
+    return FakeSmtp()
+
+
+def mail(smtp):
+    return SmtpChannel("127.0.0.1", smtp.server_address[1], "", "", "app@local", "contacto@local",
+                       starttls=False, timeout=2)
+
+
+@pytest.mark.parametrize("verb", [b"MAIL", b"RCPT", b"DATA"])
+def test_smtp_5xx_is_permanent(smtp, verb):
+    smtp.reject, smtp.reject_code = verb, 550
+    try:
+        with pytest.raises(PermanentError):
+            mail(smtp).send("aviso", "asunto", "k")
+    finally:
+        smtp.reject = None
+
+
+def test_smtp_4xx_is_retryable(smtp):
+    import smtplib
+
+    smtp.reject, smtp.reject_code = b"RCPT", 451
+    try:
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            mail(smtp).send("aviso", "asunto", "k")
+    finally:
+        smtp.reject = None
+
+
+def test_smtp_drop_after_data_is_unknown(smtp):
+    smtp.mute = True
+    with pytest.raises(DeliveryUnknown):
+        mail(smtp).send("aviso", "asunto", "k")
@@ -0,0 +1,95 @@
+# test_content.py
+"""ContentStore: revisión nueva solo con un paquete válido; lo inválido deja la anterior."""
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from conrumbo.content import ContentStore
+from journeys import DATA_DIR
+
+
+def write(path, doc) -> None:
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+    ns = time.time_ns() + 10 ** 6  # dos escrituras seguidas nunca comparten mtime
+    os.utime(path, ns=(ns, ns))
+
+
+@pytest.fixture
+def root(tmp_path):
+    shutil.copytree(DATA_DIR / "content", tmp_path / "content")
+    return tmp_path / "content"
+
+
+@pytest.fixture
+def store(root):
+    return ContentStore(root)
+
+
+def test_valid_change_bumps_revision(root, store):
+    guide = root / "es" / "kits" / "sin_id.json"
+    write(guide, {"section": "kits", "order": 99, "title": "Kit sin id", "steps": ["Agua."]})
+    revision = store.revision
+    assert store.reload([guide])
+    assert store.revision == revision + 1
+    assert store.guide_id("es", "Kit sin id") == "sin_id"
+    # El id por defecto va en el índice, no en el documento leído
+    assert "id" not in store._docs["es/kits/sin_id.json"][1]
+
+
+def test_unchanged_files_do_not_bump_revision(store):
+    revision = store.revision
+    assert not store.reload()
+    assert store.revision == revision
+
+
+def _chat_without(store, field):
+    chat = json.loads(json.dumps(store.chat("es")))
+    intent = next(iter(chat["intents"]))
+    del chat["intents"][intent][field]
+    return chat
+
+
+@pytest.mark.parametrize("rel, doc", [
+    ("es/kits/roto.json", {"section": "kits", "title": "Roto", "steps": []}),
+    ("es/kits/roto.json", {"id": 7, "section": "kits", "title": "Roto", "steps": ["Agua."]}),
+    ("es/kits/roto.json", {"section": "otra", "title": "Roto", "steps": ["Agua."]}),
+    ("es/texts.json", ["no", "es", "un", "objeto"]),
+    ("pack.json", {"default_lang": "es", "languages": ["en"]}),
+    ("es/chat.json", "priority"),
+    ("es/chat.json", "keywords"),
+])
+def test_invalid_change_keeps_previous_revision(root, store, caplog, rel, doc):
+    if isinstance(doc, str):
+        doc = _chat_without(store, doc)
+    revision, chat, sections = store.revision, store.chat("es"), store.section("es", "kits")
+    write(root / rel, doc)
+    assert not store.reload([root / rel])
+    assert store.revision == revision
+    assert store.chat("es") == chat and store.section("es", "kits") == sections
+    assert any(r.levelname == "ERROR" for r in caplog.records)
+
+
+def test_duplicate_guide_id_is_rejected(root, store):
+    existing = next((root / "es" / "kits").glob("*.json"))
+    doc = json.loads(existing.read_text(encoding="utf-8"))
+    copy = root / "es" / "kits" / "copia.json"
+    write(copy, {**doc, "id": doc.get("id", existing.stem), "title": "Otra"})
+    revision = store.revision
+    assert not store.reload([copy])
+    assert store.revision == revision
+
+
+def test_empty_keyword_is_rejected(root, store):
+    chat = json.loads(json.dumps(store.chat("es")))
+    next(iter(chat["intents"].values()))["keywords"] = ["¿?"]
+    write(root / "es" / "chat.json", chat)
+    assert not store.reload([root / "es" / "chat.json"])
+
+
+def test_invalid_initial_load_raises(root):
+    write(root / "es" / "kits" / "roto.json", {"section": "kits", "title": "Roto", "steps": []})
+    with pytest.raises(ValueError):
+        ContentStore(root)
@@ -0,0 +1,73 @@
+# test_media_server.py
+"""MediaServer.respond: tramos (Range), validación (ETag, If-Range) y rutas que no se sirven."""
+import pytest
+
+from conrumbo.media_server import MediaServer
+
+DIGEST = "ab" * 32
+SIZE = 1000
+
+
+@pytest.fixture
+def server(tmp_path):
+    video = tmp_path / "demo.mp4"
+    video.write_bytes(bytes(range(256)) * 3 + bytes(SIZE - 768))
+    bundles = tmp_path / "bundles"
+    bundles.mkdir()
+    (bundles / "quemaduras-0123456789abcdef.zip").write_bytes(b"PK" * 10)
+    files = {(DIGEST, "orig"): video}
+    return MediaServer(lambda digest, name: files.get((digest, name)), bundles=bundles)
+
+
+def get(server, path=f"/media/{DIGEST}/orig.mp4", **headers):
+    return server.respond("GET", path, {k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_full_file(server):
+    status, headers, body = get(server)
+    assert status == 200 and body[1:] == (0, SIZE)
+    assert headers["Accept-Ranges"] == "bytes" and headers["Content-Type"] == "video/mp4"
+
+
+@pytest.mark.parametrize("value, span, content_range", [
+    ("bytes=0-99", (0, 100), "bytes 0-99/1000"),
+    ("bytes=900-", (900, 100), "bytes 900-999/1000"),
+    ("bytes=-10", (990, 10), "bytes 990-999/1000"),
+    ("bytes=990-5000", (990, 10), "bytes 990-999/1000"),
+])
+def test_single_range(server, value, span, content_range):
+    status, headers, body = get(server, range=value)
+    assert status == 206 and body[1:] == span and headers["Content-Range"] == content_range
+
+
+def test_range_outside_file(server):
+    status, headers, _ = get(server, range="bytes=1000-")
+    assert status == 416 and headers["Content-Range"] == "bytes */1000"
+
+
+@pytest.mark.parametrize("value", ["bytes=0-1,5-6", "items=0-5", "bytes=50-10"])
+def test_unsupported_range_serves_whole_file(server, value):
+    assert get(server, range=value)[0] == 200
+
+
+def test_etag_revalidation(server):
+    etag = get(server)[1]["ETag"]
+    assert get(server, if_none_match=etag)[0] == 304
+    assert get(server, if_none_match='"otro"')[0] == 200
+    assert get(server, range="bytes=0-9", if_range=etag)[0] == 206
+    assert get(server, range="bytes=0-9", if_range='"otro"')[0] == 200
+
+
+def test_only_manifest_and_bundle_names_are_served(server):
+    assert get(server, f"/media/{'cd' * 32}/orig.mp4")[0] == 404
+    assert get(server, "/media/../../etc/passwd")[0] == 404
+    assert get(server, "/bundles/../demo.mp4")[0] == 404
+    status, headers, _ = get(server, "/bundles/quemaduras-0123456789abcdef.zip")
+    assert status == 200 and headers["Content-Disposition"].startswith("attachment")
+    assert server.respond("POST", f"/media/{DIGEST}/orig.mp4", {})[0] == 405
+
+
+def test_stats_need_token(tmp_path):
+    server = MediaServer(lambda *a: None, stats_token="secreto")
+    assert server.respond("GET", "/stats", {})[0] == 404
+    assert server.respond("GET", "/stats", {"authorization": "Bearer secreto"})[0] == 200
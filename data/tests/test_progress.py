@@ -0,0 +1,88 @@
+# test_progress.py
+"""ProgressStore: escritura diferida, lecturas que ven lo pendiente y lotes que fallan."""
+import sqlite3
+
+import pytest
+
+from conrumbo.progress import Module, ProgressStore, new_user_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(tmp_path / "progress.sqlite3", flush_seconds=3600)  # solo flush() explícitos
+    yield store
+    store.close()
+
+
+def on_disk(store, user_id) -> dict:
+    return {m: d for m, d in store._reader.execute(
+        "SELECT module, done FROM progress WHERE user_id = ?", (user_id,))}
+
+
+def test_pending_changes_are_visible_before_flush(store):
+    uid = new_user_id()
+    store.update(uid, 0, Module.KITS | Module.APA)
+    assert on_disk(store, uid) == {}
+    assert store.bits(uid) == Module.KITS | Module.APA
+    assert store.flush() == 2
+    assert on_disk(store, uid) == {Module.KITS: 1, Module.APA: 1}
+
+
+def test_only_changed_modules_are_written(store):
+    uid = new_user_id()
+    store.update(uid, 0, Module.KITS)
+    store.flush()
+    store.update(uid, Module.KITS, Module.KITS | Module.APA)
+    assert store.flush() == 1
+    store.update(uid, Module.KITS | Module.APA, Module.APA)
+    assert store.flush() == 1
+    assert store.bits(uid) == Module.APA
+    assert on_disk(store, uid) == {Module.KITS: 0, Module.APA: 1}
+
+
+class FailingConnection:
+    """Conexión que falla en executemany; antes de fallar deja pasar `during` (un update concurrente)."""
+
+    def __init__(self, conn, during=None):
+        self.conn, self.during = conn, during
+
+    def execute(self, *args):
+        return self.conn.execute(*args)
+
+    def executemany(self, *args):
+        if self.during is not None:
+            self.during()
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_flush_requeues_batch(store):
+    uid = new_user_id()
+    store.update(uid, 0, Module.KITS)
+    real, store._conn = store._conn, FailingConnection(store._conn)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.bits(uid) == Module.KITS  # sigue pendiente y visible
+    store._conn = real
+    assert store.flush() == 1
+    assert on_disk(store, uid) == {Module.KITS: 1}
+
+
+def test_failed_flush_keeps_newer_changes(store):
+    uid = new_user_id()
+    store.update(uid, 0, Module.KITS)
+    # Mientras el lote está en vuelo, la sesión desmarca el módulo: eso es lo que debe quedar
+    real, store._conn = store._conn, FailingConnection(store._conn, lambda: store.update(uid, Module.KITS, 0))
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    store._conn = real
+    assert store.bits(uid) == 0
+    store.flush()
+    assert on_disk(store, uid) == {Module.KITS: 0}
+
+
+def test_user_export_lists_every_module(store):
+    uid = new_user_id()
+    store.update(uid, 0, Module.SIMULACRO)
+    csv_text = b"".join(store.iter_csv(uid)).decode("utf-8").splitlines()
+    assert len(csv_text) == 1 + len(Module)
+    assert "simulacro,True," in "\n".join(csv_text)
@@ -0,0 +1,44 @@
+# test_rerun_io.py
+"""Un rerun en caliente no hace E/S de ficheros (lo que mide a mano benchmarks/bench_rerun.py).
+
+Cuenta con el hook de auditoría de journeys.count_opens: cualquier fichero abierto o tocado
+durante los reruns, salvo el propio app.py que relee Streamlit, hace fallar el test.
+"""
+import time
+
+import pytest
+
+from conrumbo.static_files import StaticFiles
+from journeys import APP, REPO_ROOT, activate_emergency, count_opens, new_app
+
+
+def test_static_files_read_once(tmp_path):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"\x89PNG" + bytes(64))
+    files = StaticFiles()
+    files.get(logo)
+    files.data_uri(logo, "image/png")
+    with count_opens() as io:
+        for _ in range(5):
+            assert files.get(logo).data.startswith(b"\x89PNG")
+            files.data_uri(logo, "image/png")
+    assert io["opens"] == 0 and io["touches"] == 0
+    assert files.stats["reads"] == 1
+
+
+def test_warm_rerun_opens_no_files(monkeypatch):
+    pytest.importorskip("streamlit.testing.v1")
+    monkeypatch.setenv("CONRUMBO_TTS_ENGINE", "stub")  # el audio de los pasos existe sin red
+    monkeypatch.chdir(REPO_ROOT)
+    at = new_app()
+    activate_emergency(at, "Parada cardiorrespiratoria")
+    # En caliente: el audio pedido en segundo plano ya está sintetizado y en memoria
+    at.run()
+    time.sleep(1)
+    at.run()
+    with count_opens() as io:
+        for _ in range(3):
+            at.run()
+    assert not at.exception
+    assert [p for p in io["paths"] if p != str(APP)] == []
+    assert io["touches"] == 0
@@ -0,0 +1,68 @@
+# test_router.py
+"""IntentRouter: prioridades, palabras clave de palabra entera, FAQ y respaldo difuso."""
+import pytest
+
+from conrumbo.content import ContentStore
+from conrumbo.i18n import Routers
+from conrumbo.router import FALLBACK_ID, IntentRouter, ReplyCache
+from journeys import DATA_DIR
+
+INTENTS = {
+    "parada": {"keywords": ["no respira"], "terms": ["reanimacion"], "priority": 100, "reply": "RCP"},
+    "hemorragia": {"keywords": ["sangr", "cut "], "terms": ["sangrado"], "priority": 80, "reply": "presión"},
+    "quemadura": {"keywords": ["quem"], "terms": ["quemadura"], "priority": 40, "reply": "agua"},
+}
+FAQ = {"dea": "el DEA guía por voz"}
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(INTENTS, FAQ, fallback="llama al 112")
+
+
+def test_highest_priority_wins(router):
+    assert router.route_id("se quemó y no respira") == "parada"
+    assert [m.intent for m in router.matches("se quemó y sangra")] == ["hemorragia", "quemadura"]
+
+
+def test_keywords_match_at_word_start_only(router):
+    assert router.route_id("¿Dónde está el DEA?") == "faq:dea"
+    assert router.route_id("tengo una idea") == FALLBACK_ID
+
+
+def test_trailing_space_keyword_is_whole_word(router):
+    assert router.route_id("a deep cut") == "hemorragia"
+    assert router.route_id("I cut my hand") == "hemorragia"
+    assert router.route_id("my friend is cute") == FALLBACK_ID
+
+
+def test_faq_loses_to_intent(router):
+    assert router.route_id("el dea y no respira") == "parada"
+
+
+def test_fuzzy_fallback_only_without_exact_match(router):
+    best = router.best("kemadura en el brazo")
+    assert best.intent == "quemadura" and best.distance > 0
+    assert router.best("se quemó").distance == 0
+    assert router.route("buenos días") == "llama al 112"
+
+
+def test_reply_cache_hits_and_invalidates(router):
+    cache = ReplyCache(maxsize=2)
+    first = cache.resolve(router, "No respira", "es", version=1)
+    assert cache.resolve(router, "no respira!", "es", version=1) is first
+    cache.resolve(router, "no respira", "es", version=2)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+
+@pytest.mark.parametrize("msg, expected", [
+    ("my friend is cute", FALLBACK_ID),
+    ("he is fit and healthy", FALLBACK_ID),
+    ("he is having a fit", "convulsion"),
+    ("he fell down the stairs", "traumatismo"),
+    ("fallen leaves", FALLBACK_ID),
+])
+def test_english_catalogue(msg, expected):
+    routers = Routers(ContentStore(DATA_DIR / "content"))
+    assert routers("en").route_id(msg) == expected
@@ -0,0 +1,62 @@
+# test_uploads.py
+"""UploadStore: tipo por contenido, límites de tamaño y un solo objeto por contenido."""
+import io
+
+import pytest
+
+from conrumbo import uploads
+from conrumbo.uploads import UploadRejected, UploadStore
+
+
+def png(color=(200, 30, 30)) -> bytes:
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(tmp_path / "uploads")
+
+
+def spooled(store) -> list:
+    return list(store.spool.iterdir())
+
+
+def test_same_content_is_stored_once(store):
+    first = store.put(io.BytesIO(png()), "foto.png")
+    second = store.put(io.BytesIO(png()), "otra.png")
+    assert first.digest == second.digest and first.path == second.path
+    assert second.name == "foto.png"  # el registro es el de la primera subida
+    assert store.stats()["stored"] == 1 and store.stats()["deduplicated"] == 1
+    assert spooled(store) == []
+
+
+def test_type_comes_from_content_not_name(store):
+    with pytest.raises(UploadRejected):
+        store.put(io.BytesIO(b"#!/bin/sh\necho hola\n"), "foto.png")
+    assert store.stats()["rejected"] == 1
+    assert spooled(store) == []
+
+
+def test_empty_upload_is_rejected(store):
+    with pytest.raises(UploadRejected):
+        store.put(io.BytesIO(b""), "vacio.png")
+
+
+def test_size_limit(store, monkeypatch):
+    data = png()
+    monkeypatch.setitem(uploads.MAX_MB, "image", (len(data) - 1) / 2**20)
+    with pytest.raises(UploadRejected, match="supera"):
+        store.put(io.BytesIO(data), "grande.png")
+    assert store.stats()["stored"] == 0
+    assert spooled(store) == []
+
+
+def test_get_reads_metadata_from_disk(store, tmp_path):
+    upload = store.put(io.BytesIO(png((0, 90, 200))), "azul.png")
+    fresh = UploadStore(tmp_path / "uploads")  # otro proceso: sin metadatos en memoria
+    assert fresh.get(upload.digest) == upload
+    assert fresh.get("0" * 64) is None